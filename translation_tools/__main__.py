@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Ponto de entrada único das ferramentas de tradução.
+
+Uso (a partir da raiz do repositório):
+
+    python -m translation_tools translate docs docs-pt --memory .tm.json
+    python -m translation_tools plan docs --memory .tm.json
+    python -m translation_tools check docs docs-pt
+    python -m translation_tools align docs.bak docs-pt --memory .tm.json
+    python -m translation_tools install-locale
+    python -m translation_tools compile-catalog
+    python -m translation_tools catalog --locales pt_BR es
+    python -m translation_tools migrate
+    python -m translation_tools memory export|import memoria.tmx --memory .tm.json
+    python -m translation_tools queue init|work|assemble|status --queue fila.db
+
+Os subcomandos importam apenas o que usam, e as bibliotecas dos backends só
+são importadas quando uma chamada remota é realmente necessária, para que
+execuções sem nada a traduzir (ajuda, plano, memória completa) iniciem rápido.
+"""
+
+import time
+
+_STARTED_AT = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import run_report
+
+# Orçamento de inicialização (ms) até o subcomando começar a executar
+STARTUP_BUDGET_MS = float(os.environ.get('TRANSLATION_TOOLS_STARTUP_BUDGET_MS', 150))
+
+
+def command_translate(args):
+    from deep_translator_script import run_translation
+
+    return run_translation(args)
+
+
+def command_plan(args):
+    import prefilter
+    from planning import plan_paths, print_plan
+    from translation_memory import open_memory
+
+    if not os.path.exists(args.input):
+        print(f"Erro: {args.input} não existe.")
+        return 1
+    memory = open_memory(args, source_lang='en', target_lang='pt')
+    prefilter.configure(args)
+    print_plan(plan_paths(args.input, memory))
+    return 0
+
+
+def command_check(args):
+    import prefilter
+    from staleness import run_check
+    from translation_memory import open_memory
+
+    memory = open_memory(args, source_lang='en', target_lang='pt')
+    prefilter.configure(args)
+    return run_check(args, memory)
+
+
+def command_align(args):
+    from alignment import align_directories, align_file
+    from translation_memory import open_memory
+
+    if not args.memory:
+        print("Erro: informe o arquivo da memória com --memory.")
+        return 1
+    for path in (args.source, args.target):
+        if not os.path.exists(path):
+            print(f"Erro: {path} não existe.")
+            return 1
+    memory = open_memory(args, source_lang='en', target_lang='pt')
+    if os.path.isdir(args.source):
+        stored = align_directories(args.source, args.target, memory)
+    else:
+        stored = align_file(args.source, args.target, memory)
+    memory.save()
+    print(f"✅ {stored} pares gravados em {args.memory} ({len(memory)} segmentos na memória)")
+    run_report.print_report()
+    return 0
+
+
+def command_install_locale(args):
+    from translator import create_translations
+
+    return 0 if create_translations() else 1
+
+
+def command_compile_catalog(args):
+    from add_pt_br_translations import add_pt_br_translations
+
+    return 0 if add_pt_br_translations() else 1
+
+
+def command_catalog(args):
+    from catalogs import run_catalogs
+
+    return run_catalogs(args)
+
+
+def command_memory_export(args):
+    from memory_exchange import export_memory
+    from translation_memory import TranslationMemory
+
+    if not args.memory or not os.path.exists(args.memory):
+        print(f"Erro: memória {args.memory} não encontrada (informe --memory).")
+        return 1
+    memory = TranslationMemory(args.memory, source_lang=args.source_lang, target_lang=args.target_lang)
+    count = export_memory(memory, args.path, fmt=args.format)
+    print(f"✅ {count} segmentos exportados para {args.path}")
+    return 0
+
+
+def command_memory_import(args):
+    from memory_exchange import import_memory
+    from translation_memory import TranslationMemory
+
+    if not os.path.exists(args.path):
+        print(f"Erro: {args.path} não existe.")
+        return 1
+    if not args.memory:
+        print("Erro: informe o arquivo da memória com --memory.")
+        return 1
+    memory = TranslationMemory(args.memory, source_lang=args.source_lang, target_lang=args.target_lang)
+    counts = import_memory(memory, args.path, policy=args.merge, fmt=args.format)
+    memory.save()
+    print(f"✅ {counts['added']} novos, {counts['replaced']} substituídos, {counts['kept']} mantidos, "
+          f"{counts['unchanged']} iguais, {counts['skipped']} ignorados ({len(memory)} segmentos na memória)")
+    return 0
+
+
+def command_migrate(args):
+    from migrate_to_portuguese import migrate_pt_content
+
+    return 0 if migrate_pt_content() else 1
+
+
+def command_queue_init(args):
+    from deep_translator_script import count_segments, find_markdown_files
+    from scheduler import read_nav_order, schedule_files
+    from work_queue import WorkQueue
+
+    if not os.path.isdir(args.input):
+        print(f"Erro: {args.input} não é um diretório.")
+        return 1
+    files = schedule_files(
+        find_markdown_files(args.input, args.output),
+        nav_order=read_nav_order(args.mkdocs_config),
+        estimate=count_segments,
+    )
+    queue = WorkQueue(args.queue, lease_seconds=args.lease)
+    added = queue.enqueue(files)
+    print(f"{added} jobs adicionados à fila {args.queue} ({len(files) - added} já existiam)")
+    return 0
+
+
+def _queue_worker(args):
+    import payload
+    import prefilter
+    from backends import build_translator
+    from translation_memory import open_memory
+    from work_queue import WorkQueue, run_worker
+
+    queue = WorkQueue(args.queue, lease_seconds=args.lease)
+    memory = open_memory(args, source_lang='en', target_lang='pt')
+    prefilter.configure(args)
+    payload.configure(args)
+    try:
+        translator = build_translator(args, source='en', target='pt')
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 1
+    try:
+        _, failed = run_worker(queue, translator, args.delay, memory)
+    finally:
+        translator.close()
+        if memory is not None:
+            memory.save()
+    run_report.print_report()
+    return 1 if failed else 0
+
+
+def _queue_worker_process(args):
+    sys.exit(_queue_worker(args))
+
+
+def command_queue_work(args):
+    if args.processes <= 1:
+        return _queue_worker(args)
+
+    import multiprocessing
+
+    processes = [multiprocessing.Process(target=_queue_worker_process, args=(args,))
+                 for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+def command_queue_assemble(args):
+    from work_queue import WorkQueue, assemble
+
+    return 0 if assemble(WorkQueue(args.queue), wait=args.wait) else 1
+
+
+def command_queue_status(args):
+    from work_queue import WorkQueue
+
+    counts = WorkQueue(args.queue).counts()
+    print(', '.join(f"{status}: {count}" for status, count in counts.items()))
+    return 0
+
+
+def build_parser():
+    """
+    Cria o parser com todos os subcomandos.
+
+    Os argumentos de translate e plan vêm dos próprios módulos, que são leves
+    de importar (não importam as bibliotecas dos backends).
+    """
+    from backends import add_backend_arguments
+    from catalogs import add_catalog_arguments
+    from deep_translator_script import add_translate_arguments
+    from memory_exchange import FORMATS
+    from payload import add_payload_arguments
+    from prefilter import add_prefilter_arguments
+    from staleness import add_check_arguments
+    from translation_memory import MERGE_POLICIES, add_memory_arguments
+
+    parser = argparse.ArgumentParser(
+        prog='translation_tools',
+        description='Ferramentas de tradução da documentação do workshop.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    translate = subparsers.add_parser('translate', help='Traduz arquivos Markdown do inglês para o português')
+    add_translate_arguments(translate)
+    translate.set_defaults(handler=command_translate)
+
+    plan = subparsers.add_parser('plan', help='Mostra o que seria traduzido, sem chamadas remotas')
+    plan.add_argument('input', help='Arquivo ou diretório de entrada')
+    add_memory_arguments(plan)
+    add_prefilter_arguments(plan)
+    plan.set_defaults(handler=command_plan)
+
+    check = subparsers.add_parser('check',
+                                  help='Verifica, sem chamadas remotas, se a tradução está desatualizada')
+    add_check_arguments(check)
+    add_memory_arguments(check)
+    add_prefilter_arguments(check)
+    check.set_defaults(handler=command_check)
+
+    align = subparsers.add_parser('align',
+                                  help='Alimenta a memória com páginas já traduzidas, alinhadas pela estrutura')
+    align.add_argument('source', help='Arquivo ou diretório com os originais em inglês (ex.: docs.bak)')
+    align.add_argument('target', help='Arquivo ou diretório com a tradução revisada (ex.: docs-pt)')
+    add_memory_arguments(align)
+    align.set_defaults(handler=command_align)
+
+    install_locale = subparsers.add_parser('install-locale',
+                                           help='Instala as traduções pt_BR no pacote mkdocs-material')
+    install_locale.set_defaults(handler=command_install_locale)
+
+    compile_catalog = subparsers.add_parser('compile-catalog',
+                                            help='Gera e compila o catálogo locales/pt_BR (.po/.mo)')
+    compile_catalog.set_defaults(handler=command_compile_catalog)
+
+    catalog = subparsers.add_parser('catalog',
+                                    help='Traduz em lote as mensagens da interface e gera .po/.mo e JSON por locale')
+    add_catalog_arguments(catalog)
+    add_backend_arguments(catalog)
+    catalog.set_defaults(handler=command_catalog)
+
+    queue = subparsers.add_parser('queue', help='Divide a tradução entre workers com uma fila em SQLite')
+    queue_commands = queue.add_subparsers(dest='queue_command', required=True)
+
+    queue_init = queue_commands.add_parser('init', help='Cria os jobs de um diretório')
+    queue_init.add_argument('input', help='Diretório de entrada')
+    queue_init.add_argument('output', help='Diretório de saída')
+    queue_init.add_argument('--mkdocs-config', default='mkdocs.yml',
+                            help='mkdocs.yml cujo nav define a prioridade das páginas')
+    queue_init.set_defaults(handler=command_queue_init)
+
+    queue_work = queue_commands.add_parser('work', help='Processa jobs até a fila esvaziar')
+    queue_work.add_argument('--processes', type=int, default=1, help='Processos worker locais')
+    queue_work.add_argument('--delay', type=float, default=1.0, help='Tempo de espera (segundos) entre traduções')
+    add_backend_arguments(queue_work)
+    add_memory_arguments(queue_work)
+    add_prefilter_arguments(queue_work)
+    add_payload_arguments(queue_work)
+    queue_work.set_defaults(handler=command_queue_work)
+
+    queue_assemble = queue_commands.add_parser('assemble', help='Grava as saídas quando todos os jobs terminarem')
+    queue_assemble.add_argument('--wait', action='store_true', help='Aguardar os jobs em andamento')
+    queue_assemble.set_defaults(handler=command_queue_assemble)
+
+    queue_status = queue_commands.add_parser('status', help='Mostra a quantidade de jobs por status')
+    queue_status.set_defaults(handler=command_queue_status)
+
+    for command in (queue_init, queue_work, queue_assemble, queue_status):
+        command.add_argument('--queue', required=True, help='Arquivo SQLite da fila')
+        command.add_argument('--lease', type=float, default=120.0,
+                             help='Duração (segundos) do lease de um job reservado')
+
+    memory = subparsers.add_parser('memory', help='Exporta ou importa a memória de tradução em TMX/XLIFF')
+    memory_commands = memory.add_subparsers(dest='memory_command', required=True)
+
+    memory_export = memory_commands.add_parser('export', help='Grava a memória em TMX ou XLIFF')
+    memory_export.set_defaults(handler=command_memory_export)
+
+    memory_import = memory_commands.add_parser('import', help='Incorpora um arquivo TMX ou XLIFF à memória')
+    memory_import.add_argument('--merge', choices=MERGE_POLICIES, default='reviewed',
+                               help='Como resolver traduções importadas diferentes das já guardadas')
+    memory_import.set_defaults(handler=command_memory_import)
+
+    for command in (memory_export, memory_import):
+        command.add_argument('path', help='Arquivo .tmx, .xlf ou .xliff (opcionalmente .gz)')
+        command.add_argument('--memory', metavar='ARQUIVO', help='Arquivo JSON da memória de tradução')
+        command.add_argument('--format', choices=FORMATS, default=None,
+                             help='Formato do arquivo (padrão: pela extensão)')
+        command.add_argument('--source-lang', default='en', help='Idioma de origem da memória')
+        command.add_argument('--target-lang', default='pt', help='Idioma de destino da memória')
+
+    migrate = subparsers.add_parser('migrate', help='Copia docs-pt para docs, guardando backup em docs.bak')
+    migrate.set_defaults(handler=command_migrate)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    startup_ms = (time.perf_counter() - _STARTED_AT) * 1000
+    run_report.set_value('startup.ms', startup_ms)
+    if startup_ms > STARTUP_BUDGET_MS:
+        print(f"⚠️ Inicialização levou {startup_ms:.0f} ms (orçamento: {STARTUP_BUDGET_MS:.0f} ms)")
+
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
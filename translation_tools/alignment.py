@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Alinhamento de documentos já traduzidos para alimentar a memória de tradução.
+
+Percorre pares de arquivos inglês/português (por exemplo docs.bak e docs-pt),
+segmenta os dois com a mesma lógica da tradução (process_file_content,
+line_segment e mask_text) e alinha as linhas pela estrutura: cabeçalhos,
+itens de lista, linhas de tabela, parágrafos e blocos extraídos (código,
+admonitions, HTML). Os pares alinhados cujos placeholders correspondem são
+gravados em lote na memória, para que a primeira tradução de uma branch nova
+já comece com as traduções revisadas.
+
+Uso (a partir da raiz do repositório):
+
+    python -m translation_tools align docs.bak docs-pt --memory .tm.json
+"""
+
+import os
+import re
+from difflib import SequenceMatcher
+
+import prefilter
+import run_report
+from deep_translator_script import (
+    extracted_placeholders,
+    find_markdown_files,
+    line_segment,
+    mask_text,
+    process_file_content,
+)
+
+# Nome gravado como "backend" das entradas vindas de traduções revisadas
+ALIGNMENT_SOURCE = 'alignment'
+
+_BLOCK_RE = re.compile(r'<<<([A-Z]+)(?:_\d+)?>>>')
+_HEADER_RE = re.compile(r'^(#+)\s')
+_LIST_RE = re.compile(r'^(\s*)([-*+]|\d+\.)\s')
+_TABLE_RE = re.compile(r'^\s*\|')
+
+# Padrões de mask_text cujo conteúdo não muda com a tradução (código inline,
+# tags, URLs, emojis, macros); links e formatação podem ter texto traduzido
+_INVARIANT_RE = re.compile(r'^(?:`|<|https?://|:[\w-]+:$|\{)')
+# Fim de frase, contado no texto mascarado (sem os pontos de URLs e código)
+_SENTENCE_END_RE = re.compile(r'[.!?](?:\s|$)')
+
+
+def structure(line, placeholders):
+    """
+    Assinatura estrutural de uma linha do conteúdo processado.
+
+    Além do papel da linha (cabeçalho, item, tabela, parágrafo), a assinatura
+    inclui a quantidade de partes preservadas por mask_text (links, código
+    inline, formatação), que a tradução mantém e servem de âncora entre
+    parágrafos vizinhos.
+
+    Returns:
+        Tupla que identifica o papel da linha no documento, ou None para linhas vazias
+    """
+    if not line.strip():
+        return None
+    if any(placeholder in line for placeholder in placeholders):
+        return ('block',) + tuple(_BLOCK_RE.findall(line))
+    preserved = len(mask_text(line)[1])
+    header = _HEADER_RE.match(line)
+    if header:
+        return ('header', len(header.group(1)), preserved)
+    item = _LIST_RE.match(line)
+    if item:
+        marker = item.group(2) if item.group(2)[0].isdigit() else '-'
+        return ('item', len(item.group(1)), marker, preserved)
+    if _TABLE_RE.match(line):
+        return ('table', line.count('|'), preserved)
+    return ('text', len(line) - len(line.lstrip()), preserved)
+
+
+def segments(content):
+    """
+    Segmenta um documento como a tradução faz.
+
+    Returns:
+        Lista de tuplas (assinatura, texto traduzível ou None)
+    """
+    patterns, processed_content = process_file_content(content)
+    placeholders = extracted_placeholders(patterns)
+
+    result = []
+    for line in processed_content.split('\n'):
+        signature = structure(line, placeholders)
+        if signature is None:
+            continue
+        segment = line_segment(line, placeholders)
+        result.append((signature, segment[1] if segment is not None else None))
+    return result
+
+
+def pair_rejection(source, target):
+    """
+    Verifica se um par alinhado pode ir para a memória.
+
+    Args:
+        source: Segmento em inglês (não mascarado)
+        target: Segmento traduzido (não mascarado)
+
+    Returns:
+        Tupla (motivo da rejeição ou None, segmento mascarado, tradução mascarada)
+    """
+    masked_source, source_placeholders = mask_text(source)
+    masked_target, target_placeholders = mask_text(target)
+
+    if prefilter.skip_reason(masked_source, target_lang='pt') is not None:
+        return 'not_translatable', None, None
+    if masked_source == masked_target or prefilter.detect_language(masked_target) == 'en':
+        return 'untranslated', None, None
+    # Parágrafos unidos ou divididos na tradução alinham com o vizinho errado
+    if len(_SENTENCE_END_RE.findall(masked_source)) != len(_SENTENCE_END_RE.findall(masked_target)):
+        return 'sentences', None, None
+
+    # mask_text numera os placeholders por padrão e ocorrência: pares
+    # equivalentes têm os mesmos nomes, cada um usado uma vez na tradução
+    if source_placeholders.keys() != target_placeholders.keys():
+        return 'placeholders', None, None
+    for placeholder, original in source_placeholders.items():
+        if masked_target.count(placeholder) != masked_source.count(placeholder):
+            return 'placeholders', None, None
+        if _INVARIANT_RE.match(original) and target_placeholders[placeholder] != original:
+            return 'placeholders', None, None
+
+    return None, masked_source, masked_target
+
+
+def align_contents(source_content, target_content):
+    """
+    Alinha dois documentos pela estrutura.
+
+    Returns:
+        Tupla (lista de pares (segmento, tradução), linhas sem correspondência)
+    """
+    source_segments = segments(source_content)
+    target_segments = segments(target_content)
+
+    matcher = SequenceMatcher(None, [s for s, _ in source_segments],
+                              [s for s, _ in target_segments], autojunk=False)
+    pairs = []
+    unmatched = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            unmatched += max(i2 - i1, j2 - j1)
+            continue
+        for (_, source), (_, target) in zip(source_segments[i1:i2], target_segments[j1:j2]):
+            if source is not None and target is not None and source.strip() and target.strip():
+                pairs.append((source, target))
+    return pairs, unmatched
+
+
+def align_file(source_file, target_file, memory):
+    """
+    Alinha um par de arquivos e grava os pares aceitos na memória.
+
+    Returns:
+        Quantidade de pares gravados
+    """
+    with open(source_file, 'r', encoding='utf-8') as f:
+        source_content = f.read()
+    with open(target_file, 'r', encoding='utf-8') as f:
+        target_content = f.read()
+
+    pairs, unmatched = align_contents(source_content, target_content)
+    run_report.increment('alignment.unmatched', unmatched)
+
+    stored = 0
+    for source, target in pairs:
+        reason, masked_source, masked_target = pair_rejection(source, target)
+        if reason is not None:
+            run_report.increment(f'alignment.rejected.{reason}')
+            continue
+        memory.store(masked_source, masked_target, ALIGNMENT_SOURCE)
+        stored += 1
+    run_report.increment('alignment.stored', stored)
+    return stored
+
+
+def align_directories(source_dir, target_dir, memory):
+    """
+    Alinha todos os arquivos Markdown presentes nos dois diretórios.
+
+    Args:
+        source_dir: Diretório com os originais em inglês
+        target_dir: Diretório com as páginas traduzidas
+        memory: Instância de TranslationMemory que recebe os pares
+
+    Returns:
+        Quantidade de pares gravados
+    """
+    stored = 0
+    for rel_path, source_file, target_file in find_markdown_files(source_dir, target_dir):
+        if not os.path.exists(target_file):
+            run_report.increment('alignment.missing_files')
+            continue
+        count = align_file(source_file, target_file, memory)
+        print(f"{rel_path}: {count} pares alinhados")
+        run_report.increment('alignment.files')
+        stored += count
+    return stored
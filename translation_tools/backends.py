@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Criação dos backends de tradução usados pelos scripts.
+
+Todos os backends expõem translate(text) retornando o texto traduzido, no
+mesmo formato do GoogleTranslator do deep-translator. As bibliotecas de cada
+backend só são importadas quando o backend é criado.
+"""
+
+import os
+import threading
+
+from cassette import add_cassette_arguments
+from chunking import AIMDChunkSizer
+from dispatch import BackendSlot, CircuitBreaker, HedgedTranslator, LoadBalancer, RateLimiter
+
+SUPPORTED_BACKENDS = ('deep_translator', 'googletrans', 'local')
+
+# Backends que traduzem vários segmentos por chamada (translate_batch)
+BATCH_BACKENDS = ('local',)
+
+
+class GoogletransBackend:
+    """
+    Adapta o Translator do googletrans para a interface translate(text) -> str.
+
+    Args:
+        source: Idioma de origem
+        target: Idioma de destino
+    """
+
+    def __init__(self, source='en', target='pt'):
+        from googletrans import Translator
+
+        self.translator = Translator()
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        return self.translator.translate(text, src=self.source, dest=self.target).text
+
+
+def create_backend(name, source='en', target='pt', **options):
+    """
+    Cria o tradutor de um backend pelo nome.
+
+    Args:
+        name: Nome do backend (ver SUPPORTED_BACKENDS)
+        source: Idioma de origem
+        target: Idioma de destino
+        **options: Opções específicas do backend (ex.: model_dir do backend local)
+
+    Returns:
+        Instância com o método translate(text)
+    """
+    if name == 'deep_translator':
+        from deep_translator import GoogleTranslator
+
+        return GoogleTranslator(source=source, target=target)
+    if name == 'googletrans':
+        return GoogletransBackend(source, target)
+    if name == 'local':
+        from local_backend import LocalBackend
+
+        return LocalBackend(source=source, target=target, **options)
+    raise ValueError(f"Backend desconhecido: {name} (disponíveis: {', '.join(SUPPORTED_BACKENDS)})")
+
+
+class LazyBackend:
+    """
+    Adia a criação do backend (e a importação da sua biblioteca) até a
+    primeira chamada remota, para que execuções totalmente atendidas pela
+    memória de tradução ou sem nada a traduzir iniciem rapidamente.
+
+    Args:
+        name: Nome do backend (ver SUPPORTED_BACKENDS)
+        source: Idioma de origem
+        target: Idioma de destino
+        **options: Opções repassadas a create_backend
+    """
+
+    def __init__(self, name, source='en', target='pt', **options):
+        if name not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Backend desconhecido: {name} (disponíveis: {', '.join(SUPPORTED_BACKENDS)})")
+        self.name = name
+        self.source = source
+        self.target = target
+        self.options = options
+        self.backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def batched(self):
+        """
+        True quando o backend traduz vários segmentos por chamada.
+        """
+        return self.name in BATCH_BACKENDS
+
+    @property
+    def paced(self):
+        """
+        True quando o backend não precisa de pausas entre chamadas (backend local).
+        """
+        return self.name == 'local'
+
+    def _backend(self):
+        if self.backend is None:
+            with self._lock:
+                if self.backend is None:
+                    self.backend = create_backend(self.name, self.source, self.target, **self.options)
+        return self.backend
+
+    def translate(self, text):
+        return self._backend().translate(text)
+
+    def translate_batch(self, texts):
+        return self._backend().translate_batch(texts)
+
+    def close(self):
+        close = getattr(self.backend, 'close', None)
+        if close is not None:
+            close()
+
+
+def parse_backend_spec(spec):
+    """
+    Interpreta a especificação de um backend no formato NOME[:PESO[:TAXA]].
+
+    Args:
+        spec: Texto como 'googletrans:2:1.5' (peso 2, 1,5 requisições/s)
+
+    Returns:
+        Tupla (nome, peso, taxa), com taxa None quando não informada
+    """
+    parts = spec.split(':')
+    name = parts[0]
+    if name not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name} (disponíveis: {', '.join(SUPPORTED_BACKENDS)})")
+    weight = float(parts[1]) if len(parts) > 1 and parts[1] else 1.0
+    rate = float(parts[2]) if len(parts) > 2 and parts[2] else None
+    return name, weight, rate
+
+
+def add_backend_arguments(parser):
+    """
+    Adiciona ao parser os argumentos de escolha e controle dos backends.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--backend', action='append', dest='backends', metavar='NOME[:PESO[:TAXA]]',
+                        help='Backend a usar; repita para balancear entre vários '
+                             f"({', '.join(SUPPORTED_BACKENDS)}). TAXA em requisições por segundo")
+    parser.add_argument('--no-adaptive-chunks', dest='adaptive_chunks', action='store_false',
+                        help='Usar pedaços de tamanho fixo em vez do ajuste AIMD por backend')
+    parser.add_argument('--local-model', metavar='DIR', default=os.environ.get('TRANSLATION_TOOLS_LOCAL_MODEL'),
+                        help='Diretório do modelo usado pelo backend local')
+    parser.add_argument('--local-workers', type=int, default=None,
+                        help='Processos worker do backend local (padrão: um por núcleo)')
+    parser.add_argument('--local-batch-size', type=int, default=16,
+                        help='Segmentos por inferência do backend local')
+    add_cassette_arguments(parser)
+    add_dispatch_arguments(parser)
+
+
+def add_dispatch_arguments(parser):
+    """
+    Adiciona ao parser os argumentos de requisições duplicadas e disjuntor.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--hedge-percentile', type=float, default=95.0,
+                        help='Percentil da latência observada que dispara uma requisição duplicada (0 desativa)')
+    parser.add_argument('--breaker-threshold', type=int, default=5,
+                        help='Falhas consecutivas que abrem o disjuntor do backend (0 desativa)')
+    parser.add_argument('--breaker-reset', type=float, default=30.0,
+                        help='Tempo (segundos) com o disjuntor aberto antes de sondar o backend')
+
+
+def build_translator(args, source='en', target='pt', default_backend='deep_translator'):
+    """
+    Cria o tradutor a partir dos argumentos de linha de comando.
+
+    Com um único backend sem taxa definida, retorna o HedgedTranslator do
+    backend; caso contrário, um LoadBalancer entre os backends informados.
+
+    Args:
+        args: Argumentos definidos por add_backend_arguments
+        source: Idioma de origem
+        target: Idioma de destino
+        default_backend: Backend usado quando nenhum --backend é informado
+
+    Returns:
+        Tradutor com os métodos translate(text) e close()
+
+    Raises:
+        ValueError: Se a combinação de argumentos for inválida, o modelo
+            local não existir ou o cassete de --replay-cassette não puder
+            ser lido
+    """
+    if args.replay_cassette:
+        return _build_replay_translator(args)
+
+    specs = [parse_backend_spec(spec) for spec in (args.backends or [default_backend])]
+    writer = None
+    if args.record_cassette:
+        if args.adaptive_chunks:
+            # Os limites dos pedaços AIMD dependem da latência medida, então a
+            # reprodução não enviaria os mesmos textos gravados
+            raise ValueError("--record-cassette requer --no-adaptive-chunks")
+        from cassette import CassetteWriter
+
+        writer = CassetteWriter(args.record_cassette, [name for name, _, _ in specs])
+
+    slots = []
+    for name, weight, rate in specs:
+        limiter = RateLimiter(rate)
+        breaker = None
+        if args.breaker_threshold > 0:
+            breaker = CircuitBreaker(args.breaker_threshold, args.breaker_reset, name=name)
+        options = {}
+        hedge_percentile = args.hedge_percentile
+        if name == 'local':
+            if not args.local_model or not os.path.isdir(args.local_model):
+                raise ValueError(f"Diretório do modelo local não encontrado: {args.local_model} (use --local-model)")
+            options = {'model_dir': args.local_model, 'workers': args.local_workers,
+                       'batch_size': args.local_batch_size}
+            # Uma duplicata só dividiria os mesmos núcleos com a chamada original
+            hedge_percentile = 0
+        backend = LazyBackend(name, source, target, **options)
+        if writer is not None:
+            from cassette import RecordingBackend
+
+            backend = RecordingBackend(backend, writer, name)
+        translator = HedgedTranslator(
+            backend,
+            hedge_percentile=hedge_percentile,
+            breaker=breaker,
+            name=name,
+            sizer=AIMDChunkSizer.for_backend(name) if args.adaptive_chunks else None,
+            limiter=limiter,
+        )
+        slots.append(BackendSlot(name, translator, weight, limiter))
+
+    if len(slots) == 1 and slots[0].limiter.rate is None:
+        return slots[0].translator
+    return LoadBalancer(slots)
+
+
+def _build_replay_translator(args):
+    """
+    Cria o tradutor que reproduz um cassete (--replay-cassette), sem rede.
+
+    Sem duplicatas, para que cada texto consuma uma única resposta gravada,
+    e sempre com pedaços de tamanho fixo, como na gravação (ver
+    --no-adaptive-chunks), para que os textos enviados coincidam com os
+    gravados independentemente da latência.
+    """
+    from cassette import ReplayBackend
+
+    backend = ReplayBackend(args.replay_cassette, latency=args.replay_latency)
+    return HedgedTranslator(backend, hedge_percentile=0, name=backend.recorded_backend or 'replay')
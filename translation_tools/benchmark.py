@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Benchmarks das ferramentas de tradução.
+
+Uso (a partir da raiz do repositório):
+
+    python translation_tools/benchmark.py            # todos os casos
+    python translation_tools/benchmark.py startup    # apenas um caso
+    python translation_tools/benchmark.py pathological
+    python translation_tools/benchmark.py segments
+    python translation_tools/benchmark.py replay     # TRANSLATION_TOOLS_CASSETTE=gravado.jsonl.gz
+
+Cada caso imprime suas medições e o script termina com código 1 se algum
+orçamento for ultrapassado.
+"""
+
+import argparse
+import contextlib
+import gc
+import hashlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TOOLS_DIR)
+DOCS_DIR = os.path.join(REPO_DIR, 'docs')
+
+sys.path.insert(0, TOOLS_DIR)
+
+# Orçamento (ms) de uma invocação completa do CLI sem chamadas remotas
+STARTUP_BUDGET_MS = 500
+
+# Orçamento (ms) da extração de uma página patológica
+PATHOLOGICAL_BUDGET_MS = 250
+# Repetições de cada padrão nas páginas patológicas (~100-200 KB)
+PATHOLOGICAL_SIZE = 20000
+
+# Orçamento (bytes) de memória por segmento na SegmentTable, sem o conteúdo
+SEGMENT_BUDGET_BYTES = 64
+# Vezes que os arquivos de docs/ são segmentados na medição de memória
+SEGMENT_COPIES = 50
+
+# Orçamento (ms) da tradução de docs/ pelo CLI reproduzindo um cassete sem latências
+REPLAY_BUDGET_MS = 3000
+REPLAY_RUNS = 3
+
+
+def _run_cli(args, runs=5):
+    """
+    Executa o CLI em processos novos.
+
+    Returns:
+        Tupla (mediana do tempo em ms, saída da última execução)
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-m', 'translation_tools'] + args,
+            cwd=REPO_DIR, capture_output=True, text=True, check=False,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"translation_tools {' '.join(args)} falhou:\n{result.stdout}{result.stderr}")
+    return statistics.median(timings), result.stdout
+
+
+def _warm_memory(path):
+    """
+    Cria uma memória de tradução que cobre todos os segmentos de docs/.
+    """
+    from deep_translator_script import find_markdown_files, mask_text
+    from segment_table import SegmentTable
+    from translation_memory import TranslationMemory
+
+    memory = TranslationMemory(path)
+    for _, input_file, _ in find_markdown_files(DOCS_DIR, DOCS_DIR):
+        with open(input_file, 'r', encoding='utf-8') as f:
+            _, table = SegmentTable.from_content(f.read())
+        for text in table.texts():
+            if text.strip():
+                masked, _ = mask_text(text)
+                memory.store(masked, masked, 'benchmark')
+    memory.save()
+
+
+def bench_startup():
+    """
+    Tempo de inicialização do CLI em invocações sem chamadas remotas.
+    """
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_path = os.path.join(tmp, 'memory.json')
+        _warm_memory(memory_path)
+        cases = [
+            ('--help', ['--help']),
+            ('plan docs', ['plan', 'docs', '--memory', memory_path]),
+            ('translate (memória completa)',
+             ['translate', 'docs', os.path.join(tmp, 'out'), '--memory', memory_path]),
+        ]
+        for label, args in cases:
+            elapsed, output = _run_cli(args)
+            within = elapsed <= STARTUP_BUDGET_MS
+            ok = ok and within
+            print(f"  {label}: {elapsed:.0f} ms {'✅' if within else '❌'} (orçamento {STARTUP_BUDGET_MS} ms)")
+            if 'Chamadas ao backend remoto' in output:
+                print(f"  ❌ {label}: houve chamadas remotas em uma execução que deveria ser local")
+                ok = False
+    return ok
+
+
+def _pathological_pages(size=PATHOLOGICAL_SIZE):
+    """
+    Páginas que faziam as expressões regulares antigas de extração levarem
+    tempo quadrático ou exponencial.
+    """
+    return {
+        'tags sem fechamento': '<div class="x">texto ' * size,
+        'tags desbalanceadas': ('<span>a <em>b</span> </i> ' * size) + '</div>',
+        'elementos dentro de aberturas sem fechamento':
+            '<div>' + '<span><figure>x</figure> fim ' * size + '</div>',
+        'aberturas sem fechamento aninhadas': '<div><span>' * size + '<figure>x</figure>',
+        'comentários sem fechamento': 'texto <!-- comentário\n' * size,
+        'blocos de código sem fechamento': '```python\nprint(1)\n' * size,
+        'admonition com linhas só de espaços': '!!! note\n' + '        \n' * size + 'fim',
+        'marcadores de admonition sem corpo': '!!! note\n' * size,
+    }
+
+
+def bench_pathological():
+    """
+    Tempo de extração (process_file_content e extratores do google_translator)
+    em páginas patológicas.
+    """
+    from deep_translator_script import process_file_content
+    import google_translator
+    from scanners import html_spans
+
+    extractors = [
+        ('process_file_content', process_file_content),
+        ('extract_codeblocks', google_translator.extract_codeblocks),
+        ('extract_html_comments', google_translator.extract_html_comments),
+        ('extract_admonitions', google_translator.extract_admonitions),
+        # Figuras mascaradas pelo safe_translate do google_translator
+        ('html_spans (figure)', lambda page: html_spans(page, names=('figure',))),
+    ]
+    ok = True
+    for label, page in _pathological_pages().items():
+        for name, extract in extractors:
+            start = time.perf_counter()
+            extract(page)
+            elapsed = (time.perf_counter() - start) * 1000
+            within = elapsed <= PATHOLOGICAL_BUDGET_MS
+            ok = ok and within
+            print(f"  {label} / {name}: {elapsed:.1f} ms {'✅' if within else '❌'} "
+                  f"(orçamento {PATHOLOGICAL_BUDGET_MS} ms)")
+    return ok
+
+
+def _retained(build):
+    """
+    Executa build() medindo o que continua alocado ao final.
+
+    Returns:
+        Tupla (resultado, bytes retidos, blocos de memória retidos)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return result, sum(stat.size_diff for stat in stats), sum(stat.count_diff for stat in stats)
+
+
+def bench_segments():
+    """
+    Memória e alocações por segmento ao guardar os segmentos de docs/
+    (repetidos SEGMENT_COPIES vezes): tuplas de line_segment, SegmentTable e
+    as visões Segment criadas a partir dela.
+    """
+    from deep_translator_script import extracted_placeholders, find_markdown_files, line_segment, \
+        process_file_content
+    from segment_table import SegmentTable
+
+    files = []
+    for _, input_file, _ in find_markdown_files(DOCS_DIR, DOCS_DIR):
+        with open(input_file, 'r', encoding='utf-8') as f:
+            patterns, processed_content = process_file_content(f.read())
+        files.append((processed_content, extracted_placeholders(patterns)))
+    files *= SEGMENT_COPIES
+
+    def tuples():
+        return [segment
+                for processed_content, placeholders in files
+                for segment in (line_segment(line, placeholders) for line in processed_content.split('\n'))
+                if segment is not None and segment[1].strip()]
+
+    def tables():
+        return [SegmentTable(processed_content, placeholders) for processed_content, placeholders in files]
+
+    segments, tuple_bytes, tuple_blocks = _retained(tuples)
+    table_list, table_bytes, table_blocks = _retained(tables)
+    _, view_bytes, view_blocks = _retained(lambda: [segment for table in table_list for segment in table])
+    count = len(segments)
+
+    ok = True
+    for label, size, blocks in (('tuplas (line_segment)', tuple_bytes, tuple_blocks),
+                                ('SegmentTable', table_bytes, table_blocks),
+                                ('visões Segment', view_bytes, view_blocks)):
+        line = f"  {label}: {size / count:.1f} bytes e {blocks / count:.2f} alocações por segmento"
+        if label == 'SegmentTable':
+            within = size / count <= SEGMENT_BUDGET_BYTES
+            ok = ok and within
+            line += f" {'✅' if within else '❌'} (orçamento {SEGMENT_BUDGET_BYTES} bytes)"
+        print(line)
+    print(f"  ({count} segmentos em {len(files)} arquivos)")
+    return ok
+
+
+class _EchoBackend:
+    """
+    Backend sintético usado para gravar um cassete quando nenhum é informado.
+    """
+
+    paced = True
+
+    def translate(self, text):
+        return f"PT[{text}]"
+
+
+def _record_synthetic_cassette(path):
+    from cassette import CassetteWriter, RecordingBackend
+    from deep_translator_script import translate_directory
+
+    writer = CassetteWriter(path, ['deep_translator'])
+    translator = RecordingBackend(_EchoBackend(), writer, 'deep_translator')
+    with tempfile.TemporaryDirectory() as out, contextlib.redirect_stdout(io.StringIO()):
+        translate_directory(DOCS_DIR, out, translator, delay=0)
+    writer.close()
+
+
+def _tree_digest(directory):
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, directory).encode('utf-8'))
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def bench_replay():
+    """
+    Tradução de docs/ de ponta a ponta pelo CLI, reproduzindo um cassete sem
+    rede. Usa o cassete de TRANSLATION_TOOLS_CASSETTE (gravado com
+    --record-cassette e --no-adaptive-chunks) ou grava um sintético.
+    """
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = os.environ.get('TRANSLATION_TOOLS_CASSETTE')
+        if not cassette:
+            cassette = os.path.join(tmp, 'cassette.jsonl.gz')
+            _record_synthetic_cassette(cassette)
+
+        timings = []
+        digests = set()
+        for run in range(REPLAY_RUNS):
+            out = os.path.join(tmp, f'out-{run}')
+            elapsed, output = _run_cli(['translate', 'docs', out, '--replay-cassette', cassette,
+                                        '--delay', '0'], runs=1)
+            timings.append(elapsed)
+            digests.add(_tree_digest(out))
+            if 'sem correspondência no cassete' in output:
+                print("  ❌ chamadas sem correspondência no cassete")
+                ok = False
+
+        elapsed = statistics.median(timings)
+        within = elapsed <= REPLAY_BUDGET_MS
+        ok = ok and within and len(digests) == 1
+        print(f"  translate docs (cassete): {elapsed:.0f} ms {'✅' if within else '❌'} "
+              f"(orçamento {REPLAY_BUDGET_MS} ms)")
+        print(f"  saídas idênticas em {REPLAY_RUNS} execuções: {'✅' if len(digests) == 1 else '❌'}")
+    return ok
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'pathological': bench_pathological,
+    'segments': bench_segments,
+    'replay': bench_replay,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Executa os benchmarks das ferramentas de tradução.')
+    parser.add_argument('cases', nargs='*', help=f"Casos a executar: {', '.join(BENCHMARKS)} (padrão: todos)")
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(unknown)}")
+
+    ok = True
+    for name in args.cases or BENCHMARKS:
+        print(f"[{name}]")
+        ok = BENCHMARKS[name]() and ok
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
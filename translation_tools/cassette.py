@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Gravação e reprodução das chamadas aos backends (cassetes).
+
+Com --record-cassette, cada chamada ao backend real é gravada: o texto
+enviado, a resposta (ou o erro) e a latência observada. A gravação exige
+--no-adaptive-chunks e a reprodução sempre usa pedaços de tamanho fixo, para
+que os textos enviados não dependam da latência medida. Com
+--replay-cassette, um backend offline devolve essas respostas para os mesmos
+textos, com as latências gravadas ou o mais rápido possível, e os textos
+sem resposta gravada são contados e listados ao final. Assim a tradução de
+um diretório inteiro pode ser comparada entre versões do pipeline, sem rede
+e com exatamente as mesmas respostas.
+
+O cassete é um arquivo JSON Lines comprimido com gzip: a primeira linha
+identifica o formato e os backends gravados, e cada linha seguinte é uma
+chamada, com as chaves b (backend), q (texto enviado), r (resposta) ou
+e (erro) e t (latência em ms).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import run_report
+
+CASSETTE_FORMAT_VERSION = 1
+LATENCY_MODES = ('recorded', 'none')
+
+
+class ReplayedError(Exception):
+    """
+    Erro gravado no cassete, levantado de novo na reprodução com a mesma mensagem.
+    """
+
+
+class CassetteMissError(LookupError):
+    """
+    Texto sem resposta gravada no cassete.
+    """
+
+
+class CassetteWriter:
+    """
+    Grava as chamadas no cassete à medida que acontecem.
+
+    Args:
+        path: Arquivo do cassete (.jsonl.gz)
+        backends: Nomes dos backends gravados
+    """
+
+    def __init__(self, path, backends=()):
+        import gzip
+
+        self.path = path
+        self.calls = 0
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._write({'cassette': CASSETTE_FORMAT_VERSION, 'backends': list(backends)})
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def record(self, backend, text, latency, response=None, error=None):
+        """
+        Grava uma chamada.
+
+        Args:
+            backend: Nome do backend
+            text: Texto enviado
+            latency: Latência observada (segundos)
+            response: Texto traduzido, se a chamada deu certo
+            error: Exceção levantada, se a chamada falhou
+        """
+        entry = {'b': backend, 'q': text, 't': round(latency * 1000, 1)}
+        if error is not None:
+            entry['e'] = f"{type(error).__name__}: {error}"
+        else:
+            entry['r'] = response
+        with self._lock:
+            if self._file is not None:
+                self._write(entry)
+                self.calls += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                run_report.increment('cassette.recorded', self.calls)
+
+
+class RecordingBackend:
+    """
+    Encapsula um backend gravando no cassete cada chamada feita a ele.
+
+    Args:
+        backend: Backend real (ex.: LazyBackend)
+        writer: CassetteWriter compartilhado entre os backends
+        name: Nome do backend gravado em cada chamada
+    """
+
+    def __init__(self, backend, writer, name):
+        self.backend = backend
+        self.writer = writer
+        self.name = name
+
+    @property
+    def batched(self):
+        return getattr(self.backend, 'batched', False)
+
+    @property
+    def paced(self):
+        return getattr(self.backend, 'paced', False)
+
+    def translate(self, text):
+        start = time.perf_counter()
+        try:
+            result = self.backend.translate(text)
+        except Exception as e:
+            self.writer.record(self.name, text, time.perf_counter() - start, error=e)
+            raise
+        self.writer.record(self.name, text, time.perf_counter() - start, response=result)
+        return result
+
+    def translate_batch(self, texts):
+        # Cada texto do lote vira uma chamada, para que a reprodução sirva
+        # também o caminho de um segmento por vez
+        start = time.perf_counter()
+        results = self.backend.translate_batch(texts)
+        latency = (time.perf_counter() - start) / max(1, len(texts))
+        for text, result in zip(texts, results):
+            self.writer.record(self.name, text, latency, response=result)
+        return results
+
+    def close(self):
+        close = getattr(self.backend, 'close', None)
+        if close is not None:
+            close()
+        self.writer.close()
+
+
+class ReplayBackend:
+    """
+    Backend offline que responde com as chamadas gravadas em um cassete.
+
+    Textos repetidos recebem as respostas na ordem em que foram gravadas; a
+    última se repete quando as gravações acabam.
+
+    Args:
+        path: Arquivo do cassete
+        latency: 'recorded' espera a latência gravada; 'none' responde na hora
+
+    Raises:
+        ValueError: Se o cassete não existir ou não puder ser lido
+    """
+
+    # Sem rede nem limites de taxa: dispensa as pausas entre chamadas
+    paced = True
+
+    def __init__(self, path, latency='none'):
+        self.path = path
+        self.latency = latency
+        self.backends = []
+        self.responses = defaultdict(deque)
+        self.unmatched = []
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        import gzip
+
+        if not os.path.isfile(self.path):
+            raise ValueError(f"Cassete {self.path} não encontrado")
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+                if header.get('cassette') != CASSETTE_FORMAT_VERSION:
+                    raise ValueError(f"Cassete {self.path} em formato desconhecido")
+                self.backends = header.get('backends', [])
+                for line in f:
+                    entry = json.loads(line)
+                    self.responses[entry['q']].append(entry)
+        except (OSError, EOFError, KeyError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Arquivo truncado, sem gzip ou com linhas inválidas
+            raise ValueError(f"Cassete {self.path} ilegível: {e}") from e
+
+    @property
+    def recorded_backend(self):
+        """
+        Backend gravado (o primeiro, se forem vários), usado como nome do
+        tradutor na reprodução.
+        """
+        return self.backends[0] if self.backends else None
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.responses.values())
+
+    def translate(self, text):
+        with self._lock:
+            entries = self.responses.get(text)
+            if not entries:
+                self.unmatched.append(text)
+                run_report.increment('cassette.unmatched')
+                raise CassetteMissError(f"texto sem resposta no cassete: {text[:60]!r}")
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+        run_report.increment('cassette.replayed')
+
+        if self.latency == 'recorded':
+            time.sleep(entry['t'] / 1000)
+        if 'e' in entry:
+            raise ReplayedError(entry['e'])
+        return entry['r']
+
+    def close(self, limit=5):
+        """
+        Lista os textos que não tinham resposta gravada.
+        """
+        if not self.unmatched:
+            return
+        print(f"\n⚠️ {len(self.unmatched)} chamadas sem correspondência no cassete {self.path}:")
+        for text in self.unmatched[:limit]:
+            print(f"   - {text[:80]!r}")
+        if len(self.unmatched) > limit:
+            print(f"   ... e mais {len(self.unmatched) - limit}")
+
+
+def add_cassette_arguments(parser):
+    """
+    Adiciona ao parser os argumentos de gravação e reprodução de cassetes.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record-cassette', metavar='ARQUIVO',
+                       help='Gravar as chamadas aos backends em um cassete (.jsonl.gz); requer --no-adaptive-chunks')
+    group.add_argument('--replay-cassette', metavar='ARQUIVO',
+                       help='Responder com as chamadas gravadas no cassete, sem rede')
+    parser.add_argument('--replay-latency', choices=LATENCY_MODES, default='none',
+                        help='Esperar a latência gravada de cada chamada (recorded) ou responder na hora (none)')
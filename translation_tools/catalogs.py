@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Pipeline em lote dos catálogos de mensagens da interface.
+
+Extrai os msgids dos templates do tema (theme.override), dos pacotes de
+idioma do mkdocs-material (partials/languages/*.html) e dos catálogos
+existentes (locales/*/LC_MESSAGES/messages.po, JSON e o dicionário
+TRANSLATIONS de translator.py), compara com o que cada locale já tem
+traduzido e envia ao backend apenas as mensagens que faltam, agrupadas em
+lotes grandes. Ao final grava, para cada locale, o
+.po, o .mo compilado e o JSON no formato do mkdocs-material.
+
+Uso (a partir da raiz do repositório):
+
+    python -m translation_tools catalog --locales pt_BR es fr
+    python -m translation_tools catalog --locales pt_BR --dry-run
+"""
+
+import array
+import glob
+import importlib.util
+import json
+import os
+import re
+import struct
+
+import run_report
+from deep_translator_script import PRESERVE_PATTERNS, mask_text, unmask_text
+
+# Chamadas de tradução nos templates Jinja: lang.t("..."), _("..."), gettext("...")
+_TEMPLATE_CALL_RE = re.compile(r'''(?:\blang\.t|\b_|\bgettext)\(\s*(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)')\s*\)''')
+_TEMPLATE_TRANS_RE = re.compile(r'\{%-?\s*trans\s*-?%\}([^{]*)\{%-?\s*endtrans\s*-?%\}')
+_PO_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_PO_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+# Entradas do dicionário da macro t() dos pacotes de idioma: "chave": "texto"
+_PACK_ENTRY_RE = re.compile(r'"([\w.-]+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Chaves dos pacotes de idioma que configuram o tema, sem texto da interface
+PACK_SETTINGS = frozenset({'language', 'direction'})
+
+# Placeholders de formatação das mensagens, além dos padrões da tradução de Markdown
+CATALOG_PATTERNS = [r'%\(\w+\)[sd]', r'%[sd]'] + PRESERVE_PATTERNS
+
+# Tamanho máximo de um lote, quando o tradutor não informa chunk_size
+BATCH_CHARS = 4000
+
+
+def _po_unescape(text):
+    return re.sub(r'\\(.)', lambda m: _PO_ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def _po_escape(text):
+    return (text.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n').replace('\t', '\\t').replace('\r', '\\r'))
+
+
+def read_po(path):
+    """
+    Lê um arquivo .po.
+
+    Returns:
+        Dicionário msgid -> msgstr (o cabeçalho fica na chave ''); para
+        mensagens no plural é usada a forma msgstr[0]
+    """
+    messages = {}
+    fields = {}
+    current = None
+
+    def flush():
+        if 'msgid' in fields:
+            messages[fields['msgid']] = fields.get('msgstr', fields.get('msgstr[0]', ''))
+        fields.clear()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            keyword, _, rest = line.partition(' ')
+            if line.startswith('"'):
+                rest = line
+            elif keyword.startswith('msg'):
+                if keyword == 'msgid' and 'msgid' in fields:
+                    flush()
+                current = keyword
+                fields[current] = ''
+            else:
+                continue
+            match = _PO_STRING_RE.match(rest.strip())
+            if match and current is not None:
+                fields[current] += _po_unescape(match.group(1))
+    flush()
+    return messages
+
+
+def write_po(path, messages, locale):
+    """
+    Grava um arquivo .po, gerando um cabeçalho se não houver.
+    """
+    header = messages.get('') or (
+        "Project-Id-Version: mkdocs\n"
+        f"Language: {locale}\n"
+        "MIME-Version: 1.0\n"
+        "Content-Type: text/plain; charset=UTF-8\n"
+        "Content-Transfer-Encoding: 8bit\n"
+    )
+    lines = ['msgid ""', 'msgstr ""']
+    lines += [f'"{_po_escape(line)}"' for line in header.splitlines(keepends=True)]
+    for msgid, msgstr in messages.items():
+        if msgid:
+            lines += ['', f'msgid "{_po_escape(msgid)}"', f'msgstr "{_po_escape(msgstr)}"']
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def write_mo(path, messages):
+    """
+    Compila as mensagens traduzidas no formato .mo do GNU gettext (como o msgfmt).
+    """
+    keys = sorted(msgid for msgid, msgstr in messages.items() if msgstr or not msgid)
+    ids = b''
+    strs = b''
+    offsets = []
+    for msgid in keys:
+        encoded_id = msgid.encode('utf-8')
+        encoded_str = messages[msgid].encode('utf-8')
+        offsets.append((len(ids), len(encoded_id), len(strs), len(encoded_str)))
+        ids += encoded_id + b'\0'
+        strs += encoded_str + b'\0'
+
+    key_start = 7 * 4 + 16 * len(keys)
+    value_start = key_start + len(ids)
+    key_offsets = []
+    value_offsets = []
+    for id_offset, id_length, str_offset, str_length in offsets:
+        key_offsets += [id_length, id_offset + key_start]
+        value_offsets += [str_length, str_offset + value_start]
+
+    output = struct.pack('Iiiiiii', 0x950412de, 0, len(keys), 7 * 4, 7 * 4 + len(keys) * 8, 0, 0)
+    output += array.array('i', key_offsets + value_offsets).tobytes() + ids + strs
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+def read_json_catalog(path):
+    """
+    Lê um catálogo JSON no formato {msgid: tradução}.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {str(key): value for key, value in data.items() if isinstance(value, str)}
+
+
+def extract_template_messages(templates_dir):
+    """
+    Extrai os msgids dos templates HTML/Jinja de um diretório.
+
+    Returns:
+        Lista de msgids, na ordem em que aparecem
+    """
+    found = []
+    for root, _, files in sorted(os.walk(templates_dir)):
+        for file in sorted(files):
+            if not file.endswith(('.html', '.jinja', '.j2')):
+                continue
+            with open(os.path.join(root, file), 'r', encoding='utf-8') as f:
+                content = f.read()
+            for match in _TEMPLATE_CALL_RE.finditer(content):
+                found.append(_po_unescape(match.group(1) if match.group(1) is not None else match.group(2)))
+            for match in _TEMPLATE_TRANS_RE.finditer(content):
+                found.append(' '.join(match.group(1).split()))
+    return found
+
+
+def read_catalog(path):
+    """
+    Lê um catálogo .po ou JSON.
+    """
+    if path.endswith('.json'):
+        return read_json_catalog(path)
+    return read_po(path)
+
+
+def default_source_catalogs(locales_dir):
+    """
+    Catálogos .po já existentes no diretório dos catálogos gettext.
+    """
+    return sorted(glob.glob(os.path.join(locales_dir, '*', 'LC_MESSAGES', 'messages.po')))
+
+
+def language_pack_dirs(templates_dirs):
+    """
+    Diretórios de pacotes de idioma: os sobrescritos nos templates do tema
+    e os do mkdocs-material instalado (localizado sem importá-lo).
+
+    Returns:
+        Lista de diretórios existentes, dos templates do tema primeiro
+    """
+    candidates = [os.path.join(templates_dir, 'partials', 'languages') for templates_dir in templates_dirs]
+    spec = importlib.util.find_spec('material')
+    if spec is not None and spec.submodule_search_locations:
+        package_dir = list(spec.submodule_search_locations)[0]
+        # mkdocs-material 9 guarda os templates em material/templates
+        candidates.append(os.path.join(package_dir, 'templates', 'partials', 'languages'))
+        candidates.append(os.path.join(package_dir, 'partials', 'languages'))
+    return [directory for directory in candidates if os.path.isdir(directory)]
+
+
+def read_language_pack(path):
+    """
+    Lê um pacote de idioma do mkdocs-material (a macro t() de partials/languages).
+
+    Returns:
+        Dicionário chave -> texto, sem as chaves de configuração (PACK_SETTINGS)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return {key: _po_unescape(text) for key, text in _PACK_ENTRY_RE.findall(content)
+            if key not in PACK_SETTINGS}
+
+
+def language_pack(pack_dirs, locale):
+    """
+    Pacote de idioma de um locale (pt_BR -> pt-BR.html, senão pt.html); os
+    diretórios anteriores têm precedência chave a chave.
+
+    Returns:
+        Dicionário chave -> texto (vazio se não houver pacote)
+    """
+    language = locale.replace('_', '-')
+    names = dict.fromkeys((f'{language}.html', f"{language.split('-')[0]}.html"))
+    pack = {}
+    for directory in reversed(pack_dirs):
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                pack.update(read_language_pack(path))
+                break
+    return pack
+
+
+def pack_translations(pack_dirs, locale):
+    """
+    Traduções de um locale nos pacotes de idioma, indexadas pelo texto em inglês.
+    """
+    source = language_pack(pack_dirs, 'en')
+    target = language_pack(pack_dirs, locale)
+    return {source[key]: text for key, text in target.items() if source.get(key)}
+
+
+def collect_msgids(templates_dirs, source_catalogs, pack_dirs=()):
+    """
+    Reúne os msgids dos templates, dos textos em inglês dos pacotes de idioma
+    e dos catálogos de origem, sem repetição.
+    """
+    msgids = {}
+    for templates_dir in templates_dirs:
+        if os.path.isdir(templates_dir):
+            msgids.update(dict.fromkeys(extract_template_messages(templates_dir)))
+    msgids.update(dict.fromkeys(language_pack(pack_dirs, 'en').values()))
+    for path in source_catalogs:
+        if os.path.exists(path):
+            msgids.update(dict.fromkeys(read_catalog(path)))
+    msgids.pop('', None)
+    return list(msgids)
+
+
+def backend_language(locale):
+    """
+    Código de idioma do backend para um locale (pt_BR -> pt, zh_TW -> zh-TW).
+    """
+    language, _, region = locale.replace('-', '_').partition('_')
+    if language.lower() == 'zh' and region:
+        return f"zh-{region.upper()}"
+    return language.lower()
+
+
+def translate_batch(texts, translator, max_chars=None):
+    """
+    Traduz uma lista de mensagens em poucas chamadas.
+
+    As mensagens mascaradas são unidas por quebras de linha em lotes de até
+    max_chars caracteres. Se o backend devolver um lote com outra quantidade
+    de linhas, as mensagens desse lote são traduzidas uma a uma.
+
+    Returns:
+        Lista de traduções (None para as que falharam), na ordem de texts
+    """
+    max_chars = max_chars or getattr(translator, 'chunk_size', None) or BATCH_CHARS
+    masked = [mask_text(' '.join(text.split()), CATALOG_PATTERNS) for text in texts]
+    results = [None] * len(texts)
+
+    batches = []
+    current, size = [], 0
+    for index, (text, _) in enumerate(masked):
+        if current and size + len(text) + 1 > max_chars:
+            batches.append(current)
+            current, size = [], 0
+        current.append(index)
+        size += len(text) + 1
+    if current:
+        batches.append(current)
+
+    def call(text):
+        run_report.increment('remote.calls')
+        return translator.translate(text)
+
+    for batch in batches:
+        run_report.increment('catalog.batches')
+        try:
+            lines = call('\n'.join(masked[index][0] for index in batch)).split('\n')
+        except Exception as e:
+            print(f"Erro ao traduzir lote de {len(batch)} mensagens: {e}")
+            lines = None
+        if lines is None or len(lines) != len(batch):
+            run_report.increment('catalog.fallbacks')
+            lines = []
+            for index in batch:
+                try:
+                    lines.append(call(masked[index][0]))
+                except Exception as e:
+                    print(f"Erro ao traduzir {texts[index]!r}: {e}")
+                    lines.append(None)
+        for index, line in zip(batch, lines):
+            if line is not None:
+                results[index] = unmask_text(line.strip(), masked[index][1])
+    return results
+
+
+def existing_translations(locale, locales_dir, json_dir, pack_dirs=()):
+    """
+    Traduções já conhecidas de um locale (pacote de idioma, .po e JSON de
+    saída; para pt_BR, também o dicionário TRANSLATIONS de translator.py).
+
+    Returns:
+        Tupla (dicionário msgid -> msgstr, cabeçalho do .po ou None)
+    """
+    known = pack_translations(pack_dirs, locale)
+    if locale == 'pt_BR':
+        from translator import TRANSLATIONS
+        known.update(TRANSLATIONS)
+    json_path = os.path.join(json_dir, f'{locale}.json')
+    if os.path.exists(json_path):
+        known.update(read_json_catalog(json_path))
+    po_path = os.path.join(locales_dir, locale, 'LC_MESSAGES', 'messages.po')
+    header = None
+    if os.path.exists(po_path):
+        po = read_po(po_path)
+        header = po.pop('', None)
+        known.update({msgid: msgstr for msgid, msgstr in po.items() if msgstr})
+    return known, header
+
+
+def update_locale(locale, msgids, translator, locales_dir, json_dir, dry_run=False, pack_dirs=()):
+    """
+    Traduz as mensagens que faltam em um locale e grava .po, .mo e JSON.
+
+    Returns:
+        Quantidade de mensagens que continuam sem tradução
+    """
+    known, header = existing_translations(locale, locales_dir, json_dir, pack_dirs)
+    all_msgids = list(dict.fromkeys(list(known) + msgids))
+    missing = [msgid for msgid in all_msgids if not known.get(msgid)]
+    print(f"{locale}: {len(all_msgids)} mensagens, {len(missing)} sem tradução")
+    if dry_run:
+        return len(missing)
+
+    if missing:
+        for msgid, translation in zip(missing, translate_batch(missing, translator)):
+            if translation:
+                known[msgid] = translation
+                run_report.increment('catalog.translated')
+
+    messages = {'': header} if header else {}
+    messages.update((msgid, known.get(msgid, '')) for msgid in all_msgids)
+    messages_dir = os.path.join(locales_dir, locale, 'LC_MESSAGES')
+    write_po(os.path.join(messages_dir, 'messages.po'), messages, locale)
+    write_mo(os.path.join(messages_dir, 'messages.mo'), messages)
+
+    os.makedirs(json_dir, exist_ok=True)
+    with open(os.path.join(json_dir, f'{locale}.json'), 'w', encoding='utf-8') as f:
+        json.dump({msgid: known[msgid] for msgid in all_msgids if known.get(msgid)},
+                  f, ensure_ascii=False, indent=2)
+    print(f"✅ {locale}: catálogos gravados em {messages_dir} e {json_dir}")
+    return sum(1 for msgid in all_msgids if not known.get(msgid))
+
+
+def add_catalog_arguments(parser):
+    """
+    Adiciona ao parser os argumentos do pipeline de catálogos.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--locales', nargs='+', default=['pt_BR'], help='Locales a gerar (ex.: pt_BR es fr)')
+    parser.add_argument('--templates', nargs='*', default=['theme.override'],
+                        help='Diretórios de templates de onde extrair mensagens')
+    parser.add_argument('--source-catalog', action='append', default=[], dest='source_catalogs',
+                        help='Catálogo .po ou JSON cujos msgids também devem ser traduzidos (pode repetir; '
+                             'padrão: locales/*/LC_MESSAGES/messages.po)')
+    parser.add_argument('--language-packs', nargs='*', default=None, metavar='DIRETÓRIO',
+                        help='Diretórios de pacotes de idioma do mkdocs-material (padrão: partials/languages '
+                             'dos templates e do mkdocs-material instalado; vazio desativa)')
+    parser.add_argument('--locales-dir', default='locales', help='Diretório dos catálogos gettext')
+    parser.add_argument('--json-dir', default=os.path.join('locales', 'material'),
+                        help='Diretório dos catálogos JSON do mkdocs-material')
+    parser.add_argument('--dry-run', action='store_true', help='Apenas mostrar o que falta traduzir')
+
+
+def run_catalogs(args):
+    """
+    Executa o pipeline configurado por add_catalog_arguments e add_backend_arguments.
+
+    Returns:
+        Código de saída do processo
+    """
+    from backends import build_translator
+
+    source_catalogs = args.source_catalogs or default_source_catalogs(args.locales_dir)
+    pack_dirs = language_pack_dirs(args.templates) if args.language_packs is None else args.language_packs
+    msgids = collect_msgids(args.templates, source_catalogs, pack_dirs)
+    if not msgids:
+        # Sem origem, cada locale receberia um catálogo vazio
+        print(f"Erro: nenhuma mensagem encontrada nos templates ({', '.join(args.templates)}), "
+              f"pacotes de idioma ({', '.join(pack_dirs) or 'nenhum'}) ou catálogos de origem "
+              f"({', '.join(source_catalogs) or 'nenhum'}).")
+        return 1
+    print(f"{len(msgids)} mensagens extraídas de templates, {len(pack_dirs)} diretórios de pacotes de idioma "
+          f"e {len(source_catalogs)} catálogos de origem")
+
+    remaining = 0
+    for locale in args.locales:
+        try:
+            translator = None if args.dry_run else build_translator(args, source='en', target=backend_language(locale))
+        except ValueError as e:
+            print(f"Erro: {e}")
+            return 1
+        try:
+            remaining += update_locale(locale, msgids, translator, args.locales_dir, args.json_dir, args.dry_run,
+                                       pack_dirs)
+        finally:
+            if translator is not None:
+                translator.close()
+
+    run_report.print_report()
+    return 0 if args.dry_run or not remaining else 1
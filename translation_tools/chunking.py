@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Divisão do texto em pedaços para envio ao backend.
+
+O tamanho máximo de cada pedaço é ajustado por um controlador AIMD
+(aumento aditivo, redução multiplicativa): enquanto as chamadas dão certo o
+tamanho cresce aos poucos até o limite do backend; em erros, payloads
+rejeitados ou lentidão ele cai pela metade.
+"""
+
+import re
+import threading
+
+import run_report
+
+# Limites (mínimo, máximo) de caracteres por requisição de cada backend
+BACKEND_LIMITS = {
+    # O deep_translator rejeita textos com 5000 caracteres ou mais
+    'deep_translator': (500, 4900),
+    'googletrans': (500, 5000),
+    # Modelos locais truncam a entrada em ~512 tokens
+    'local': (250, 1500),
+}
+DEFAULT_LIMITS = (500, 4000)
+
+# Fronteiras candidatas, da preferida para a menos preferida
+_BOUNDARY_RE = re.compile(r'(?P<sentence>[.!?;:](?=\s)|\n)|(?P<clause>,(?=\s))|(?P<space>\s)')
+_PRIORITIES = ('sentence', 'clause', 'space')
+
+
+def split_sentences(text, max_chars):
+    """
+    Divide o texto em pedaços de até max_chars caracteres em tempo linear.
+
+    Cada pedaço termina, de preferência, no fim de uma frase; senão após uma
+    vírgula; senão em um espaço; e, em último caso, exatamente em max_chars.
+    A concatenação dos pedaços é igual ao texto original.
+
+    Args:
+        text: Texto a dividir
+        max_chars: Tamanho máximo de cada pedaço
+
+    Returns:
+        Lista de pedaços
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    start = 0
+    # Última fronteira de cada prioridade vista desde o início do pedaço atual
+    best = dict.fromkeys(_PRIORITIES, -1)
+
+    def cut():
+        for priority in _PRIORITIES:
+            if best[priority] > start:
+                return best[priority]
+        return start + max_chars
+
+    for match in _BOUNDARY_RE.finditer(text):
+        end = match.end()
+        while end - start > max_chars:
+            position = cut()
+            chunks.append(text[start:position])
+            start = position
+        best[match.lastgroup] = end
+
+    while len(text) - start > max_chars:
+        position = cut()
+        chunks.append(text[start:position])
+        start = position
+    chunks.append(text[start:])
+    return chunks
+
+
+def is_rejected_payload(error):
+    """
+    Indica se o erro indica que o backend recusou o tamanho do payload.
+    """
+    text = f"{type(error).__name__} {error}".lower()
+    return any(marker in text for marker in ('notvalidlength', 'too long', '413', 'payload', 'length'))
+
+
+class AIMDChunkSizer:
+    """
+    Controlador AIMD do tamanho dos pedaços enviados a um backend.
+
+    Args:
+        name: Nome do backend, usado no relatório
+        min_chars: Menor tamanho permitido
+        max_chars: Maior tamanho permitido
+        initial: Tamanho inicial (padrão: max_chars)
+        increase: Caracteres somados a cada chamada bem-sucedida
+        decrease: Fator aplicado ao tamanho em erros e lentidão
+        slowdown: Razão entre a latência observada e a média das chamadas
+            recentes de tamanho parecido acima da qual a chamada conta como
+            lentidão
+    """
+
+    def __init__(self, name, min_chars, max_chars, initial=None, increase=250,
+                 decrease=0.5, slowdown=3.0):
+        self.name = name
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.size = initial or max_chars
+        self.increase = increase
+        self.decrease = decrease
+        self.slowdown = slowdown
+        self.ceiling = max_chars
+        # Latência média por faixa de tamanho (potências de 2 em caracteres):
+        # a maior parte da latência é fixa, então só chamadas de tamanho
+        # parecido são comparáveis
+        self.latency_by_size = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_backend(cls, name, **kwargs):
+        """
+        Cria o controlador com os limites conhecidos do backend.
+        """
+        min_chars, max_chars = BACKEND_LIMITS.get(name, DEFAULT_LIMITS)
+        return cls(name, min_chars, max_chars, **kwargs)
+
+    def _shrink(self, reason):
+        self.size = max(self.min_chars, int(self.size * self.decrease))
+        run_report.increment(f'chunking.{reason}')
+        run_report.set_value(f'chunking.{self.name}.size', self.size)
+
+    def record_success(self, chars, latency):
+        """
+        Registra uma chamada bem-sucedida com chars caracteres.
+        """
+        with self._lock:
+            band = max(chars, 1).bit_length()
+            average = self.latency_by_size.get(band)
+            slow = average is not None and latency > self.slowdown * average
+            self.latency_by_size[band] = latency if average is None else 0.2 * latency + 0.8 * average
+            if slow:
+                self._shrink('slowdowns')
+            elif self.size < self.ceiling:
+                self.size = min(self.ceiling, self.size + self.increase)
+                run_report.set_value(f'chunking.{self.name}.size', self.size)
+
+    def record_failure(self, error, chars):
+        """
+        Registra uma chamada com erro; payloads recusados limitam o teto.
+        """
+        with self._lock:
+            if is_rejected_payload(error):
+                self.ceiling = max(self.min_chars, min(self.ceiling, chars - 1))
+                self.size = min(self.size, self.ceiling)
+                self._shrink('rejected')
+            else:
+                self._shrink('errors')
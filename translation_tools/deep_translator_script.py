@@ -9,61 +9,74 @@ import re
 import sys
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from deep_translator import GoogleTranslator
 
-def safe_translate(text, translator, preserve_patterns=None):
+import run_report
+from backends import add_backend_arguments, build_translator
+import payload
+import prefilter
+import profiling
+from chunking import split_sentences
+from failures import FILE, FailureQueue
+from scanners import comment_spans, fence_spans, html_spans, replace_spans, restore_spans
+from scheduler import read_nav_order, schedule_files
+from segment_table import SegmentTable
+from translation_memory import add_memory_arguments, open_memory
+
+# Padrões preservados (não traduzidos) em cada linha
+PRESERVE_PATTERNS = [
+    # Emojis e ícones
+    r':[a-zA-Z0-9_-]+:',
+    # Links Markdown
+    r'\[([^\]]+)\]\(([^)]+)\)',
+    # Código inline
+    r'`[^`]+`',
+    # Tags HTML
+    r'<[^>]+>',
+    # Referências de imagens Markdown
+    r'!\[[^\]]*\]\([^)]+\)',
+    # Formatação Markdown
+    r'\*\*[^*]+\*\*',  # negrito
+    r'\*[^*]+\*',      # itálico
+    r'~~[^~]+~~',      # tachado
+    # Marcadores e listas
+    r'^(\s*[-*+]\s+)',
+    r'^(\s*\d+\.\s+)',
+    # Variáveis e macros
+    r'\{\{[^}]+\}\}',
+    r'\{%[^%]+%\}',
+    # Material MkDocs específico
+    r':[a-zA-Z0-9_-]+:',
+    r'\{[^}]+\}',
+    # URLs
+    r'https?://[^\s)]+',
+    # Admonições MkDocs
+    r'^!!!.*$',
+]
+
+# Versão das regras de mascaramento e extração. Mudanças em PRESERVE_PATTERNS
+# e no código listado em staleness.SEGMENTATION_CODE já invalidam o manifesto;
+# incrementar quando outra mudança alterar a saída, para que o modo check
+# marque como desatualizadas as traduções já gravadas
+PATTERN_SET_VERSION = 1
+
+def mask_text(text, preserve_patterns=None):
     """
-    Traduz o texto preservando padrões específicos.
+    Substitui as partes que não devem ser traduzidas por placeholders.
     
     Args:
-        text: Texto para traduzir
-        translator: Instância do tradutor
+        text: Texto original
         preserve_patterns: Lista de padrões regex para preservar
         
     Returns:
-        Texto traduzido com os padrões preservados
+        Tupla com o texto mascarado e o dicionário placeholder -> original
     """
-    if not text.strip():
-        return text
+    if preserve_patterns is None:
+        preserve_patterns = PRESERVE_PATTERNS
     
-    # Identificadores para substituição temporária
     placeholders = {}
     counter = 0
-    
-    # Padrões a preservar (ampliado)
-    if preserve_patterns is None:
-        preserve_patterns = [
-            # Emojis e ícones
-            r':[a-zA-Z0-9_-]+:',
-            # Links Markdown
-            r'\[([^\]]+)\]\(([^)]+)\)',
-            # Código inline
-            r'`[^`]+`',
-            # Tags HTML
-            r'<[^>]+>',
-            # Referências de imagens Markdown
-            r'!\[[^\]]*\]\([^)]+\)',
-            # Formatação Markdown
-            r'\*\*[^*]+\*\*',  # negrito
-            r'\*[^*]+\*',      # itálico
-            r'~~[^~]+~~',      # tachado
-            # Marcadores e listas
-            r'^(\s*[-*+]\s+)',
-            r'^(\s*\d+\.\s+)',
-            # Variáveis e macros
-            r'\{\{[^}]+\}\}',
-            r'\{%[^%]+%\}',
-            # Material MkDocs específico
-            r':[a-zA-Z0-9_-]+:',
-            r'\{[^}]+\}',
-            # URLs
-            r'https?://[^\s)]+',
-            # Admonições MkDocs
-            r'^!!!.*$',
-        ]
-    
-    # Salvar partes que não devem ser traduzidas
     for pattern in preserve_patterns:
         matches = re.finditer(pattern, text)
         for match in matches:
@@ -72,58 +85,185 @@ def safe_translate(text, translator, preserve_patterns=None):
             text = text.replace(match.group(0), placeholder)
             counter += 1
     
-    # Se depois de remover todos os padrões não tiver conteúdo para traduzir
-    if not ''.join(text.split()).strip():
-        # Restaurar as partes preservadas
-        for placeholder, original in placeholders.items():
-            text = text.replace(placeholder, original)
-        return text
+    return text, placeholders
+
+def unmask_text(text, placeholders):
+    """
+    Restaura as partes preservadas por mask_text.
     
-    # Dividir em pedaços menores para traduzir (limitação da API)
-    max_chars = 4000
-    chunks = []
+    Os placeholders são restaurados na ordem inversa da criação, pois um
+    padrão posterior pode ter capturado um placeholder criado antes.
+    """
+    for placeholder, original in reversed(placeholders.items()):
+        text = text.replace(placeholder, original)
+    return text
+
+def translate_chunks(text, translator, on_error=None, original=None):
+    """
+    Envia o texto ao backend em pedaços, mantendo o original dos que falharem.
     
-    if len(text) <= max_chars:
-        chunks = [text]
-    else:
-        start = 0
-        while start < len(text):
-            end = start + max_chars
-            if end >= len(text):
-                chunks.append(text[start:])
-                break
-            
-            # Tentar terminar em um ponto final, vírgula ou quebra de linha
-            for i in range(min(end, len(text)-1), start, -1):
-                if text[i] in '.,:;\n':
-                    end = i + 1
-                    break
-            
-            chunks.append(text[start:end])
-            start = end
+    Args:
+        text: Texto pronto para envio
+        translator: Instância do tradutor
+        on_error: Chamado com (trecho original, exceção) para cada pedaço que falhou
+        original: Converte um pedaço no trecho original informado a on_error
+        
+    Returns:
+        Tupla (texto traduzido, se algum pedaço falhou)
+    """
+    # Dividir em pedaços menores para traduzir (limitação da API); o tamanho
+    # vem do controlador AIMD do tradutor, quando houver
+    max_chars = getattr(translator, 'chunk_size', None) or 4000
+    chunks = split_sentences(text, max_chars)
     
     # Traduzir cada pedaço
     translated_chunks = []
+    failed = False
     for chunk in chunks:
         try:
             if chunk.strip():
-                translated = translator.translate(chunk)
+                run_report.increment('remote.calls')
+                with profiling.stage('remote'):
+                    translated = translator.translate(chunk)
                 translated_chunks.append(translated)
             else:
                 translated_chunks.append(chunk)
-            time.sleep(0.5)  # Pequena pausa para evitar sobrecarga da API
+            # Pequena pausa para evitar sobrecarga da API, exceto quando o
+            # tradutor já controla o próprio orçamento de requisições
+            if not getattr(translator, 'paced', False):
+                time.sleep(0.5)
         except Exception as e:
             print(f"Erro ao traduzir: {e}")
             translated_chunks.append(chunk)
+            failed = True
+            if on_error is not None:
+                on_error(original(chunk) if original is not None else chunk, e)
     
     # Juntar os pedaços traduzidos
-    translated_text = ''.join(translated_chunks)
+    return ''.join(translated_chunks), failed
+
+def prefetch_translations(texts, translator, memory=None, preserve_patterns=None):
+    """
+    Traduz em uma única chamada translate_batch os segmentos que
+    safe_translate enviaria ao backend um a um.
     
-    # Restaurar as partes preservadas
-    for placeholder, original in placeholders.items():
-        translated_text = translated_text.replace(placeholder, original)
+    Os segmentos passam pelo mesmo mascaramento, pré-filtro e codificação de
+    safe_translate; os que já estão na memória ou excedem o tamanho dos
+    pedaços ficam de fora e seguem o caminho normal.
+    
+    Args:
+        texts: Segmentos de texto, ainda sem máscara
+        translator: Tradutor com o método translate_batch
+        memory: Memória de tradução (opcional)
+        preserve_patterns: Lista de padrões regex para preservar
+        
+    Returns:
+        Dicionário segmento mascarado -> tradução mascarada, para safe_translate
+    """
+    max_chars = getattr(translator, 'chunk_size', None) or 4000
+    pending = {}
+    for text in texts:
+        if not text.strip():
+            continue
+        masked, _ = mask_text(text, preserve_patterns)
+        if masked in pending or not ''.join(masked.split()):
+            continue
+        if prefilter.skip_reason(masked, target_lang='pt') is not None:
+            continue
+        if memory is not None and masked in memory:
+            continue
+        encoded, encoding = payload.encode(masked)
+        if len(encoded) <= max_chars:
+            pending[masked] = (encoded, encoding)
+    if not pending:
+        return {}
+    
+    run_report.increment('batch.calls')
+    try:
+        with profiling.stage('remote'):
+            results = translator.translate_batch([encoded for encoded, _ in pending.values()])
+    except Exception as e:
+        # Os segmentos seguem um a um por safe_translate, que registra as falhas
+        print(f"Erro ao traduzir em lote: {e}")
+        run_report.increment('batch.failed')
+        return {}
+    
+    prefetched = {}
+    for (masked, (_, encoding)), translated in zip(pending.items(), results):
+        decoded = payload.decode(translated, encoding)
+        if decoded is not None:
+            prefetched[masked] = decoded
+    run_report.increment('batch.segments', len(prefetched))
+    return prefetched
+
+def safe_translate(text, translator, preserve_patterns=None, memory=None, on_error=None,
+                   prefetched=None):
+    """
+    Traduz o texto preservando padrões específicos.
+    
+    Args:
+        text: Texto para traduzir
+        translator: Instância do tradutor
+        preserve_patterns: Lista de padrões regex para preservar
+        memory: Memória de tradução consultada antes da chamada remota
+        on_error: Chamado com (trecho original, exceção) para cada pedaço que
+            falhou e foi mantido sem tradução
+        prefetched: Traduções já obtidas por prefetch_translations (opcional)
+        
+    Returns:
+        Texto traduzido com os padrões preservados
+    """
+    if not text.strip():
+        return text
+    
+    # Salvar partes que não devem ser traduzidas
+    text, placeholders = mask_text(text, preserve_patterns)
     
-    return translated_text
+    # Se depois de remover todos os padrões não tiver conteúdo para traduzir
+    if not ''.join(text.split()).strip():
+        return unmask_text(text, placeholders)
+    
+    # Manter sem chamada remota o que não precisa de tradução (identificadores,
+    # texto sem letras ou já no idioma de destino)
+    if prefilter.should_skip(text, target_lang='pt'):
+        return unmask_text(text, placeholders)
+    
+    # Consultar a memória de tradução antes de chamar o backend
+    if memory is not None:
+        with profiling.stage('memory'):
+            cached = memory.lookup(text)
+        if cached is not None:
+            return unmask_text(cached, placeholders)
+    
+    if prefetched is not None and text in prefetched:
+        # Já traduzido no lote do arquivo
+        translated_text, failed = prefetched[text], False
+    else:
+        # Codificar placeholders e espaços de forma compacta para o envio;
+        # as falhas só são repassadas a on_error quando não há reenvio
+        encoded, encoding = payload.encode(text)
+        errors = []
+        translated_text, failed = translate_chunks(
+            encoded, translator, lambda chunk, error: errors.append((chunk, error)),
+            original=lambda chunk: unmask_text(payload.restore(chunk, encoding), placeholders))
+        decoded = payload.decode(translated_text, encoding)
+        if decoded is None:
+            # O backend perdeu ou duplicou algum token: reenviar sem a
+            # codificação; apenas as falhas deste envio são registradas
+            translated_text, failed = translate_chunks(
+                text, translator, on_error, original=lambda chunk: unmask_text(chunk, placeholders))
+        else:
+            translated_text = decoded
+            if on_error is not None:
+                for chunk, error in errors:
+                    on_error(chunk, error)
+    
+    # Guardar na memória apenas traduções completas
+    if memory is not None and not failed:
+        memory.store(text, translated_text, getattr(translator, 'name', None))
+    
+    # Restaurar as partes preservadas
+    return unmask_text(translated_text, placeholders)
 
 def process_file_content(content):
     """
@@ -152,30 +292,12 @@ def process_file_content(content):
         patterns['frontmatter'] = frontmatter_match.group(0)
         content = content.replace(patterns['frontmatter'], "<<<FRONTMATTER>>>")
     
-    # Extrair blocos de código
-    code_block_pattern = r'```[a-zA-Z0-9_]*\n[\s\S]*?```'
-    
-    for i, match in enumerate(re.finditer(code_block_pattern, content)):
-        placeholder = f"<<<CODEBLOCK_{i}>>>"
-        patterns['code_blocks'][placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
-    
-    # Extrair comentários HTML
-    comment_pattern = r'<!--[\s\S]*?-->'
-    
-    for i, match in enumerate(re.finditer(comment_pattern, content)):
-        placeholder = f"<<<COMMENT_{i}>>>"
-        patterns['html_comments'][placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
+    # Extrair blocos de código, comentários HTML e elementos HTML com
+    # varreduras lineares (ver scanners), imunes a tags desbalanceadas
+    content, patterns['code_blocks'] = replace_spans(content, fence_spans(content), "<<<CODEBLOCK_{}>>>")
+    content, patterns['html_comments'] = replace_spans(content, comment_spans(content), "<<<COMMENT_{}>>>")
+    content, patterns['html_tags'] = replace_spans(content, html_spans(content), "<<<HTML_{}>>>")
     
-    # Extrair HTML tags complexos
-    html_pattern = r'<(?!br|hr|img)[a-z]+[^>]*>[\s\S]*?</[a-z]+>'
-    
-    for i, match in enumerate(re.finditer(html_pattern, content, re.IGNORECASE)):
-        placeholder = f"<<<HTML_{i}>>>"
-        patterns['html_tags'][placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
-        
     # Extrair admonitions do MkDocs Material
     admonition_start_pattern = r'^!!! [^\n]+$'
     
@@ -195,7 +317,7 @@ def process_file_content(content):
             else:
                 # Admonition terminou
                 admonition_text = '\n'.join(current_admonition)
-                placeholder = f"<<<ADMONITION_{admonition_count}>>>"
+                placeholder = sys.intern(f"<<<ADMONITION_{admonition_count}>>>")
                 patterns['admonitions'][placeholder] = admonition_text
                 processed_lines.append(placeholder)
                 admonition_count += 1
@@ -207,7 +329,7 @@ def process_file_content(content):
     # Verificar se terminou com um admonition
     if in_admonition:
         admonition_text = '\n'.join(current_admonition)
-        placeholder = f"<<<ADMONITION_{admonition_count}>>>"
+        placeholder = sys.intern(f"<<<ADMONITION_{admonition_count}>>>")
         patterns['admonitions'][placeholder] = admonition_text
         processed_lines.append(placeholder)
     
@@ -232,24 +354,121 @@ def restore_patterns(content, patterns):
         content = content.replace("<<<FRONTMATTER>>>", patterns['frontmatter'])
     
     # Restaurar blocos de código
-    for placeholder, code_block in patterns['code_blocks'].items():
-        content = content.replace(placeholder, code_block)
+    content = restore_spans(content, patterns['code_blocks'])
     
     # Restaurar comentários HTML
-    for placeholder, comment in patterns['html_comments'].items():
-        content = content.replace(placeholder, comment)
+    content = restore_spans(content, patterns['html_comments'])
     
     # Restaurar HTML tags
-    for placeholder, tag in patterns['html_tags'].items():
-        content = content.replace(placeholder, tag)
+    content = restore_spans(content, patterns['html_tags'])
     
     # Restaurar admonitions
-    for placeholder, admonition in patterns['admonitions'].items():
-        content = content.replace(placeholder, admonition)
+    content = restore_spans(content, patterns['admonitions'])
     
     return content
 
-def translate_markdown_file(input_file, output_file, translator, delay=1.0):
+def line_segment(line, placeholders):
+    """
+    Separa a parte traduzível de uma linha do conteúdo processado.
+    
+    Args:
+        line: Linha do conteúdo retornado por process_file_content
+        placeholders: Placeholders extraídos (linhas que os contêm são mantidas)
+        
+    Returns:
+        Tupla (prefixo, texto) ou None se a linha não deve ser traduzida
+    """
+    # Verificar se é uma linha especial que contém um placeholder
+    if any(placeholder in line for placeholder in placeholders):
+        return None
+    
+    # Verificar se é um cabeçalho Markdown
+    header_match = re.match(r'^(#+)\s+(.+)$', line)
+    if header_match:
+        return f"{header_match.group(1)} ", header_match.group(2)
+    
+    # Linha normal
+    return '', line
+
+def extracted_placeholders(patterns):
+    """
+    Lista os placeholders de todos os dicionários de padrões extraídos.
+    """
+    return [placeholder
+            for pattern_dict in patterns.values()
+            if isinstance(pattern_dict, dict)
+            for placeholder in pattern_dict]
+
+def count_segments(input_file):
+    """
+    Conta as linhas traduzíveis de um arquivo, como estimativa do seu tamanho.
+    
+    Args:
+        input_file: Caminho do arquivo de entrada
+        
+    Returns:
+        Quantidade de segmentos com texto
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        _, table = SegmentTable.from_content(f.read())
+    return sum(1 for text in table.texts() if text.strip())
+
+def translate_markdown_content(content, translator, delay=1.0, memory=None, on_error=None):
+    """
+    Traduz o conteúdo de um arquivo Markdown preservando sua estrutura.
+    
+    Args:
+        content: Conteúdo do arquivo
+        translator: Instância do tradutor
+        delay: Tempo de espera entre traduções (segundos)
+        memory: Memória de tradução (opcional)
+        on_error: Chamado com (trecho original, exceção, índice do segmento)
+            para cada pedaço que falhou (opcional)
+        
+    Returns:
+        Conteúdo traduzido
+    """
+    # Extrair e processar partes especiais
+    with profiling.stage('extract'):
+        patterns, table = SegmentTable.from_content(content)
+    
+    # Backends em lote (modelo local) traduzem os segmentos do arquivo de uma vez
+    prefetched = None
+    if getattr(translator, 'batched', False):
+        prefetched = prefetch_translations(list(table.texts()), translator, memory)
+    
+    # Traduzir segmento por segmento (linhas com texto fora das partes extraídas)
+    translations = []
+    calls_at_last_pause = run_report.counters['remote.calls']
+    for i, text in enumerate(table.texts()):
+        # O índice do segmento localiza o trecho no arquivo de saída (ver failures.patch_output)
+        segment_error = None if on_error is None else (
+            lambda chunk, error, segment=i: on_error(chunk, error, segment))
+        translations.append(safe_translate(text, translator, memory=memory, on_error=segment_error,
+                                           prefetched=prefetched))
+        
+        # Adicionar uma pequena pausa a cada 5 segmentos, se houve chamadas remotas
+        if i % 5 == 0 and i > 0 and run_report.counters['remote.calls'] != calls_at_last_pause:
+            time.sleep(delay)
+            calls_at_last_pause = run_report.counters['remote.calls']
+    
+    # Recolocar as traduções nas linhas dos segmentos
+    translated_content = table.rebuild(translations)
+    
+    # Restaurar as partes extraídas
+    with profiling.stage('restore'):
+        return restore_patterns(translated_content, patterns)
+
+def write_output(output_file, content):
+    """
+    Grava o conteúdo traduzido, criando o diretório de saída se necessário.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def translate_markdown_file(input_file, output_file, translator, delay=1.0, memory=None, failures=None):
     """
     Traduz um arquivo Markdown preservando sua estrutura.
     
@@ -258,115 +477,184 @@ def translate_markdown_file(input_file, output_file, translator, delay=1.0):
         output_file: Caminho do arquivo de saída
         translator: Instância do tradutor
         delay: Tempo de espera entre traduções (segundos)
+        memory: Memória de tradução (opcional)
+        failures: FailureQueue que registra as falhas para nova tentativa (opcional)
     """
+    on_error = failures.recorder(input_file, output_file) if failures is not None else None
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Extrair e processar partes especiais
-        patterns, processed_content = process_file_content(content)
-        
-        # Dividir por linhas para tradução
-        lines = processed_content.split('\n')
-        translated_lines = []
-        
-        # Traduzir linha por linha
-        for i, line in enumerate(lines):
-            # Verificar se é uma linha especial que contém um placeholder
-            contains_placeholder = False
-            for pattern_dict in patterns.values():
-                if isinstance(pattern_dict, dict):  # Verifica se é um dicionário
-                    for placeholder in pattern_dict.keys():
-                        if placeholder in line:
-                            contains_placeholder = True
-                            break
-                if contains_placeholder:
-                    break
-            
-            if contains_placeholder:
-                translated_lines.append(line)
-                continue
+        with profiling.profile_file(input_file):
+            with profiling.stage('read'):
+                with open(input_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
             
-            # Verificar se é um cabeçalho Markdown
-            header_match = re.match(r'^(#+)\s+(.+)$', line)
-            if header_match:
-                prefix = header_match.group(1)
-                header_text = header_match.group(2)
-                translated_header = safe_translate(header_text, translator)
-                translated_lines.append(f"{prefix} {translated_header}")
-            # Linha normal
-            else:
-                translated_line = safe_translate(line, translator)
-                translated_lines.append(translated_line)
-            
-            # Adicionar uma pequena pausa a cada 5 linhas
-            if i % 5 == 0 and i > 0:
-                time.sleep(delay)
-        
-        # Juntar as linhas traduzidas
-        translated_content = '\n'.join(translated_lines)
-        
-        # Restaurar as partes extraídas
-        final_content = restore_patterns(translated_content, patterns)
-        
-        # Criar diretório de saída se necessário
-        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(final_content)
+            final_content = translate_markdown_content(content, translator, delay, memory, on_error)
+            with profiling.stage('write'):
+                write_output(output_file, final_content)
         
         print(f"✅ Arquivo traduzido: {output_file}")
         
     except Exception as e:
         print(f"❌ Erro ao traduzir {input_file}: {str(e)}")
+        if failures is not None:
+            failures.record(FILE, input_file, output_file, e)
 
-def translate_directory(input_dir, output_dir, translator, delay=1.0):
+def find_markdown_files(input_dir, output_dir):
     """
-    Traduz todos os arquivos Markdown em um diretório e subdiretórios.
+    Lista os arquivos Markdown de um diretório e seus subdiretórios.
     
     Args:
         input_dir: Caminho do diretório de entrada
         output_dir: Caminho do diretório de saída
-        translator: Instância do tradutor
-        delay: Tempo de espera entre traduções (segundos)
+        
+    Returns:
+        Lista de tuplas (caminho relativo, arquivo de entrada, arquivo de saída)
     """
+    found = []
     for root, _, files in os.walk(input_dir):
         for file in files:
             if file.endswith('.md'):
                 # Construir caminhos de entrada e saída
-                rel_path = os.path.relpath(root, input_dir)
                 input_file = os.path.join(root, file)
-                
-                if rel_path == '.':
-                    output_file = os.path.join(output_dir, file)
-                else:
-                    output_file = os.path.join(output_dir, rel_path, file)
-                
-                # Traduzir o arquivo
-                print(f"Traduzindo {os.path.join(rel_path, file)}...")
-                translate_markdown_file(input_file, output_file, translator, delay)
-                
-                # Pausa entre arquivos
-                time.sleep(delay * 2)
+                rel_path = os.path.relpath(input_file, input_dir)
+                found.append((rel_path, input_file, os.path.join(output_dir, rel_path)))
+    return found
 
-def main():
-    parser = argparse.ArgumentParser(description='Traduz arquivos Markdown do inglês para o português.')
+def translate_directory(input_dir, output_dir, translator, delay=1.0, memory=None,
+                        workers=1, mkdocs_config=None, failures=None):
+    """
+    Traduz todos os arquivos Markdown em um diretório e subdiretórios.
+    
+    As páginas do nav do mkdocs.yml são traduzidas primeiro e as demais da
+    maior para a menor (ver scheduler.schedule_files).
+    
+    Args:
+        input_dir: Caminho do diretório de entrada
+        output_dir: Caminho do diretório de saída
+        translator: Instância do tradutor
+        delay: Tempo de espera entre traduções (segundos)
+        memory: Memória de tradução (opcional)
+        workers: Quantidade de arquivos traduzidos em paralelo
+        mkdocs_config: Caminho do mkdocs.yml cujo nav define a prioridade
+        failures: FailureQueue que registra as falhas para nova tentativa (opcional)
+    """
+    files = schedule_files(
+        find_markdown_files(input_dir, output_dir),
+        nav_order=read_nav_order(mkdocs_config),
+        estimate=count_segments,
+    )
+    
+    def translate_one(item):
+        rel_path, input_file, output_file = item
+        # Traduzir o arquivo
+        print(f"Traduzindo {rel_path}...")
+        calls_before = run_report.counters['remote.calls']
+        translate_markdown_file(input_file, output_file, translator, delay, memory, failures)
+        
+        # Pausa entre arquivos, se o arquivo usou o backend
+        if run_report.counters['remote.calls'] != calls_before:
+            time.sleep(delay * 2)
+    
+    if workers <= 1:
+        for item in files:
+            translate_one(item)
+    else:
+        # A fila do pool entrega os arquivos na ordem planejada ao worker que ficar livre
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(translate_one, files))
+
+def add_translate_arguments(parser):
+    """
+    Adiciona ao parser os argumentos da tradução de arquivos Markdown.
+    
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
     parser.add_argument('input', help='Arquivo ou diretório de entrada para traduzir')
     parser.add_argument('output', help='Arquivo ou diretório de saída para salvar a tradução')
     parser.add_argument('--delay', type=float, default=1.0, help='Tempo de espera (segundos) entre traduções')
+    parser.add_argument('--workers', type=int, default=1, help='Arquivos traduzidos em paralelo')
+    parser.add_argument('--mkdocs-config', default='mkdocs.yml',
+                        help='mkdocs.yml cujo nav define a prioridade das páginas')
+    add_backend_arguments(parser)
+    add_memory_arguments(parser)
+    prefilter.add_prefilter_arguments(parser)
+    payload.add_payload_arguments(parser)
+    profiling.add_profile_arguments(parser)
+    parser.add_argument('--retry-rounds', type=int, default=3,
+                        help='Rodadas de novas tentativas das falhas ao fim da execução (0 desliga)')
+    parser.add_argument('--retry-backoff', type=float, default=5.0,
+                        help='Espera (segundos) antes da primeira rodada; dobra a cada rodada')
+    parser.add_argument('--failure-report', default=None,
+                        help='Arquivo JSON onde gravar as falhas que restarem')
+    parser.add_argument('--manifest', default=None,
+                        help='Manifesto usado pelo modo check (padrão: .translation-manifest.json na saída)')
+
+def run_translation(args):
+    """
+    Executa a tradução configurada pelos argumentos de add_translate_arguments.
     
-    args = parser.parse_args()
+    Returns:
+        Código de saída do processo
+    """
+    memory = open_memory(args, source_lang='en', target_lang='pt')
+    prefilter.configure(args)
+    payload.configure(args)
     
-    # Criar o tradutor
-    translator = GoogleTranslator(source='en', target='pt')
+    # Criar o tradutor (um backend ou balanceamento entre vários); a biblioteca
+    # do backend só é importada na primeira chamada remota
+    try:
+        translator = build_translator(args, source='en', target='pt')
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 1
+    failures = FailureQueue()
+    
+    workers = args.workers
+    if args.profile:
+        profiling.start(args.profile)
+        if workers > 1:
+            # cProfile e tracemalloc medem um arquivo de cada vez
+            print("ℹ️ Com --profile os arquivos são traduzidos um de cada vez.")
+            workers = 1
     
     # Verificar se é um arquivo ou diretório
     if os.path.isdir(args.input):
-        translate_directory(args.input, args.output, translator, args.delay)
+        translate_directory(args.input, args.output, translator, args.delay, memory,
+                            workers=workers, mkdocs_config=args.mkdocs_config, failures=failures)
     else:
-        translate_markdown_file(args.input, args.output, translator, args.delay)
+        translate_markdown_file(args.input, args.output, translator, args.delay, memory, failures)
+    
+    # Tentar novamente, com o backend já recuperado, o que ficou em inglês
+    # (ao reproduzir um cassete não há backend a esperar se recuperar)
+    failures.retry(translator, memory, rounds=args.retry_rounds,
+                   backoff=0 if args.replay_cassette else args.retry_backoff, delay=args.delay)
+    
+    if memory is not None:
+        memory.save()
+    translator.close()
+    profiling.finish()
     
+    # Registrar os arquivos traduzidos sem falhas para o modo check
+    from staleness import default_manifest_path, record_manifest
+    
+    record_manifest(args.manifest or default_manifest_path(args.output), args.input, args.output,
+                    failed_files={entry['input_file'] for entry in failures.entries})
     print("Tradução concluída!")
+    run_report.print_report()
+    
+    if failures:
+        print(f"\n⚠️ {len(failures)} falhas permanecem sem tradução:")
+        failures.print_summary()
+        if args.failure_report:
+            failures.write_report(args.failure_report)
+            print(f"Relatório de falhas gravado em {args.failure_report}")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Traduz arquivos Markdown do inglês para o português.')
+    add_translate_arguments(parser)
+    return run_translation(parser.parse_args())
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
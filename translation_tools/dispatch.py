@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Controle de latência de cauda para chamadas remotas de tradução.
+
+Encapsula um tradutor (deep-translator, googletrans ou compatível) com:
+
+- requisições duplicadas (hedge): quando uma chamada demora mais que um
+  percentil configurável das latências observadas, uma cópia é enviada e a
+  primeira resposta vence;
+- disjuntor (circuit breaker): após falhas consecutivas o backend deixa de
+  ser chamado e é sondado periodicamente até voltar a responder;
+- balanceamento entre vários backends por peso, saúde e latência, cada um
+  com seu próprio orçamento de requisições, com failover transparente.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import run_report
+
+
+class CircuitOpenError(Exception):
+    """
+    O disjuntor do backend está aberto e a chamada não foi enviada.
+    """
+
+
+class CircuitBreaker:
+    """
+    Disjuntor com os estados fechado, aberto e semiaberto.
+
+    Args:
+        failure_threshold: Falhas consecutivas necessárias para abrir
+        reset_timeout: Tempo (segundos) aberto antes de enviar uma sondagem
+        name: Nome do backend, usado nas mensagens
+        probe_timeout: Prazo (segundos) da sondagem; se ela não terminar a
+            tempo o disjuntor volta a abrir, para que uma sondagem travada
+            não bloqueie o backend pelo resto da execução (padrão:
+            reset_timeout)
+    """
+
+    CLOSED = 'fechado'
+    OPEN = 'aberto'
+    HALF_OPEN = 'semiaberto'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, name='backend', probe_timeout=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = reset_timeout if probe_timeout is None else probe_timeout
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def _expire_probe(self, now):
+        # Sondagem sem resposta dentro do prazo conta como falha
+        if self.state == self.HALF_OPEN and now - self.probe_started_at >= self.probe_timeout:
+            self.state = self.OPEN
+            self.opened_at = now
+            run_report.increment('breaker.probe_timeouts')
+
+    def is_open(self):
+        """
+        Indica se o disjuntor está bloqueando chamadas.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire_probe(now)
+            return (self.state == self.HALF_OPEN or (
+                self.state == self.OPEN and now - self.opened_at < self.reset_timeout
+            ))
+
+    def retry_after(self):
+        """
+        Segundos até o disjuntor aceitar uma sondagem (0 se estiver fechado).
+        Com uma sondagem em andamento, o tempo até o prazo dela.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire_probe(now)
+            if self.state == self.HALF_OPEN:
+                return max(0.0, self.probe_timeout - (now - self.probe_started_at))
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (now - self.opened_at))
+
+    def allow(self):
+        """
+        Indica se uma chamada pode ser enviada ao backend agora.
+
+        Returns:
+            True se o disjuntor está fechado ou se esta chamada é a sondagem
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            self._expire_probe(now)
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                # Apenas uma sondagem por vez no estado semiaberto
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                run_report.increment('breaker.probes')
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Registra uma chamada bem-sucedida, fechando o disjuntor.
+        """
+        with self._lock:
+            if self.state != self.CLOSED:
+                print(f"🔌 Backend {self.name} voltou a responder; disjuntor fechado.")
+                run_report.increment('breaker.closed')
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """
+        Registra uma falha, abrindo o disjuntor quando o limite é atingido.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                if self.state == self.CLOSED:
+                    print(f"🔌 Backend {self.name} falhou {self.failures} vezes seguidas; "
+                          f"disjuntor aberto por {self.reset_timeout:g}s.")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                run_report.increment('breaker.opened')
+
+
+class LatencyTracker:
+    """
+    Janela deslizante das latências observadas de um backend.
+
+    Args:
+        window: Quantidade de amostras mantidas
+    """
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency):
+        with self._lock:
+            self.samples.append(latency)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, p):
+        """
+        Calcula o percentil p (0-100) das amostras pelo método nearest-rank.
+
+        Returns:
+            Latência em segundos, ou None se não houver amostras
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+
+class HedgedTranslator:
+    """
+    Tradutor com requisições duplicadas e disjuntor.
+
+    Expõe o mesmo método translate do tradutor encapsulado e repassa os
+    argumentos sem alterá-los, servindo para qualquer backend. O tradutor
+    encapsulado precisa suportar chamadas simultâneas de threads diferentes.
+
+    Args:
+        translator: Instância do tradutor real
+        hedge_percentile: Percentil da latência que dispara a duplicata (0 desativa)
+        min_samples: Amostras necessárias antes de enviar duplicatas
+        breaker: Instância de CircuitBreaker (None desativa o disjuntor)
+        name: Nome do backend, usado no relatório
+        max_workers: Threads disponíveis para chamadas em andamento
+        sizer: Controlador AIMD do tamanho dos pedaços (chunking.AIMDChunkSizer)
+        limiter: Orçamento de requisições do backend (RateLimiter); cada
+            duplicata consome uma requisição dele e não é enviada sem orçamento
+    """
+
+    def __init__(self, translator, hedge_percentile=95.0, min_samples=20,
+                 breaker=None, name=None, max_workers=8, sizer=None, limiter=None):
+        self.translator = translator
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.breaker = breaker
+        self.sizer = sizer
+        self.limiter = limiter
+        self.name = name or type(translator).__name__
+        self.latencies = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=f"hedge-{self.name}")
+
+    def hedge_delay(self):
+        """
+        Tempo de espera antes de enviar a duplicata.
+
+        Returns:
+            Segundos, ou None se as duplicatas estiverem desativadas
+        """
+        if not self.hedge_percentile or len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    @property
+    def chunk_size(self):
+        """
+        Tamanho máximo atual dos pedaços enviados (None sem controlador AIMD).
+        """
+        return self.sizer.size if self.sizer is not None else None
+
+    @property
+    def batched(self):
+        """
+        True quando o tradutor encapsulado aceita translate_batch.
+        """
+        return getattr(self.translator, 'batched', False)
+
+    @property
+    def paced(self):
+        """
+        True quando o tradutor encapsulado dispensa pausas entre chamadas.
+        """
+        return getattr(self.translator, 'paced', False)
+
+    def retry_after(self):
+        """
+        Segundos até o disjuntor aceitar uma chamada (0 sem disjuntor).
+        """
+        return self.breaker.retry_after() if self.breaker is not None else 0.0
+
+    def translate(self, *args, **kwargs):
+        """
+        Traduz repassando os argumentos ao tradutor encapsulado.
+
+        Raises:
+            CircuitOpenError: Se o disjuntor estiver aberto
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            run_report.increment('breaker.rejected')
+            raise CircuitOpenError(f"disjuntor aberto para o backend {self.name}")
+
+        chars = len(args[0]) if args and isinstance(args[0], str) else 0
+        start = time.perf_counter()
+        try:
+            result = self._call_hedged(args, kwargs)
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            if self.sizer is not None:
+                self.sizer.record_failure(e, chars)
+            raise
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+        if self.sizer is not None:
+            self.sizer.record_success(chars, time.perf_counter() - start)
+        return result
+
+    def translate_batch(self, texts):
+        """
+        Traduz vários textos em uma chamada, sem duplicatas.
+
+        Raises:
+            CircuitOpenError: Se o disjuntor estiver aberto
+        """
+        if self.breaker is not None and not self.breaker.allow():
+            run_report.increment('breaker.rejected')
+            raise CircuitOpenError(f"disjuntor aberto para o backend {self.name}")
+        try:
+            result = self.translator.translate_batch(texts)
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success()
+        return result
+
+    def _timed_call(self, args, kwargs):
+        start = time.perf_counter()
+        result = self.translator.translate(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+    def _call_hedged(self, args, kwargs):
+        delay = self.hedge_delay()
+        start = time.perf_counter()
+        primary = self._executor.submit(self._timed_call, args, kwargs)
+        futures = [primary]
+
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            # A chamada passou do percentil observado: enviar duplicata, se
+            # o orçamento do backend permitir
+            if self.limiter is None or self.limiter.try_acquire():
+                futures.append(self._executor.submit(self._timed_call, args, kwargs))
+                run_report.increment('hedge.sent')
+            else:
+                run_report.increment('hedge.skipped')
+
+        pending = set(futures)
+        first_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+                result, latency = future.result()
+                self.latencies.add(latency)
+                if future is not primary:
+                    run_report.increment('hedge.won')
+                    self._record_primary(primary, start)
+                self._report_latency()
+                return result
+
+        raise first_error
+
+    def _record_primary(self, primary, start):
+        # A chamada lenta que disparou a duplicata também é uma amostra; sem
+        # ela o percentil só baixa e as duplicatas ficam cada vez mais cedo.
+        # Ainda em andamento, entra o tempo decorrido (limite inferior).
+        if not primary.done():
+            self.latencies.add(time.perf_counter() - start)
+        elif primary.exception() is None:
+            self.latencies.add(primary.result()[1])
+
+    def _report_latency(self):
+        for p in (50, 95):
+            value = self.latencies.percentile(p)
+            if value is not None:
+                run_report.set_value(f'latency.{self.name}.p{p}', value)
+
+    def close(self):
+        """
+        Libera as threads sem esperar chamadas perdedoras ainda pendentes.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        close = getattr(self.translator, 'close', None)
+        if close is not None:
+            close()
+
+
+def is_throttle_error(error):
+    """
+    Indica se o erro representa limitação de taxa pelo backend.
+
+    Args:
+        error: Exceção levantada pelo tradutor
+
+    Returns:
+        True para erros como HTTP 429 ou TooManyRequests
+    """
+    text = f"{type(error).__name__} {error}".lower()
+    return '429' in text or 'toomanyrequests' in text or 'too many requests' in text
+
+
+class RateLimiter:
+    """
+    Orçamento de requisições de um backend (token bucket).
+
+    Args:
+        rate: Requisições por segundo permitidas (None para ilimitado)
+        burst: Requisições que podem ser feitas de uma vez
+    """
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self):
+        """
+        Segundos até que uma requisição possa ser feita.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            pause = max(0.0, self.paused_until - now)
+            if not self.rate or self.tokens >= 1:
+                return pause
+            return max(pause, (1 - self.tokens) / self.rate)
+
+    def try_acquire(self):
+        """
+        Consome uma requisição do orçamento, se disponível.
+
+        Returns:
+            True se a requisição pode ser feita agora
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.paused_until:
+                return False
+            if not self.rate:
+                return True
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def pause(self, seconds):
+        """
+        Suspende o orçamento após limitação pelo backend.
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class BackendSlot:
+    """
+    Backend registrado no balanceador.
+
+    Args:
+        name: Nome do backend
+        translator: Tradutor (normalmente um HedgedTranslator)
+        weight: Peso relativo na distribuição dos segmentos
+        limiter: Orçamento de requisições do backend
+    """
+
+    def __init__(self, name, translator, weight=1.0, limiter=None):
+        self.name = name
+        self.translator = translator
+        self.weight = weight
+        self.limiter = limiter or RateLimiter()
+        self.latency = None
+        self.throttle_pause = 5.0
+
+    @property
+    def breaker(self):
+        return getattr(self.translator, 'breaker', None)
+
+    def score(self):
+        """
+        Pontuação para a escolha do backend: peso dividido pela latência média.
+        """
+        return self.weight / max(self.latency or 0.0, 0.05)
+
+    def record_latency(self, latency, alpha=0.2):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = alpha * latency + (1 - alpha) * self.latency
+
+
+class LoadBalancer:
+    """
+    Distribui segmentos entre vários backends por peso, saúde e latência.
+
+    Cada chamada escolhe, entre os backends com orçamento disponível e
+    disjuntor fechado, um backend com probabilidade proporcional à sua
+    pontuação. Se o backend limitar a taxa ou falhar, o segmento é repassado
+    ao próximo backend sem que o chamador perceba.
+
+    Args:
+        slots: Lista de BackendSlot
+    """
+
+    def __init__(self, slots):
+        if not slots:
+            raise ValueError("É necessário pelo menos um backend")
+        self.slots = slots
+        self.name = '+'.join(slot.name for slot in slots)
+
+    @property
+    def chunk_size(self):
+        """
+        Menor tamanho de pedaço entre os backends, para que qualquer um deles
+        aceite o pedaço em caso de failover.
+        """
+        sizes = [getattr(slot.translator, 'chunk_size', None) for slot in self.slots]
+        sizes = [size for size in sizes if size]
+        return min(sizes) if sizes else None
+
+    @property
+    def paced(self):
+        """
+        True quando todos os backends têm orçamento próprio, dispensando pausas fixas.
+        """
+        return all(slot.limiter.rate for slot in self.slots)
+
+    @property
+    def batched(self):
+        """
+        True quando todos os backends aceitam translate_batch, para que o
+        failover possa levar o lote a qualquer um deles.
+        """
+        return all(getattr(slot.translator, 'batched', False) for slot in self.slots)
+
+    def retry_after(self):
+        """
+        Segundos até algum dos backends aceitar uma chamada.
+        """
+        return min(getattr(slot.translator, 'retry_after', lambda: 0.0)() for slot in self.slots)
+
+    def _pick(self, tried):
+        while True:
+            # Tentativas por backend registrado, não por nome: o mesmo
+            # backend pode aparecer em mais de um slot
+            candidates = [slot for slot in self.slots
+                          if slot not in tried
+                          and not (slot.breaker is not None and slot.breaker.is_open())]
+            if not candidates:
+                return None
+
+            ready = [slot for slot in candidates if slot.limiter.wait_time() == 0]
+            while ready:
+                slot = random.choices(ready, weights=[s.score() for s in ready])[0]
+                if slot.limiter.try_acquire():
+                    return slot
+                ready.remove(slot)
+
+            # Nenhum backend com orçamento agora: aguardar o primeiro liberar
+            time.sleep(min(slot.limiter.wait_time() for slot in candidates) or 0.01)
+
+    def translate(self, text):
+        """
+        Traduz o texto com o backend escolhido, com failover entre backends.
+
+        Raises:
+            A última exceção recebida, se todos os backends falharem
+        """
+        return self._call(lambda translator: translator.translate(text), 1)
+
+    def translate_batch(self, texts):
+        """
+        Traduz vários textos em uma chamada ao backend escolhido, com
+        failover do lote inteiro entre backends (ver batched).
+
+        Raises:
+            A última exceção recebida, se todos os backends falharem
+        """
+        return self._call(lambda translator: translator.translate_batch(texts), len(texts))
+
+    def _call(self, call, segments):
+        tried = set()
+        last_error = None
+        while True:
+            slot = self._pick(tried)
+            if slot is None:
+                raise last_error or CircuitOpenError("nenhum backend disponível")
+
+            start = time.perf_counter()
+            try:
+                result = call(slot.translator)
+            except Exception as e:
+                last_error = e
+                tried.add(slot)
+                if is_throttle_error(e):
+                    slot.limiter.pause(slot.throttle_pause)
+                    run_report.increment(f'balancer.{slot.name}.throttled')
+                run_report.increment('balancer.failover')
+                continue
+
+            slot.record_latency(time.perf_counter() - start)
+            run_report.increment(f'balancer.{slot.name}.segments', segments)
+            return result
+
+    def close(self):
+        for slot in self.slots:
+            close = getattr(slot.translator, 'close', None)
+            if close is not None:
+                close()
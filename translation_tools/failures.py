@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Fila de falhas adiadas.
+
+Quando um trecho não pode ser traduzido, a tradução segue mantendo o texto
+original e a falha é registrada aqui com a classe do erro. Ao fim da
+execução, as falhas são tentadas novamente com backoff e, quando dão certo,
+o texto traduzido é aplicado no arquivo de saída já gravado, no mesmo
+segmento em que a falha ocorreu. O que continuar falhando é listado em um
+relatório JSON.
+"""
+
+import json
+import os
+import time
+
+import run_report
+
+SEGMENT = 'segment'
+FILE = 'file'
+
+
+class FailureQueue:
+    """
+    Registro das falhas de tradução de uma execução.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, kind, input_file, output_file, error, text=None, segment=None):
+        """
+        Registra uma falha.
+
+        Args:
+            kind: SEGMENT (trecho mantido no idioma original) ou FILE (arquivo inteiro)
+            input_file: Arquivo de entrada
+            output_file: Arquivo de saída
+            error: Exceção recebida
+            text: Trecho original que ficou sem tradução (apenas para SEGMENT)
+            segment: Índice do segmento do arquivo (ver SegmentTable) que
+                contém o trecho (apenas para SEGMENT)
+        """
+        self.entries.append({
+            'kind': kind,
+            'input_file': input_file,
+            'output_file': output_file,
+            'text': text,
+            'segment': segment,
+            'error_class': type(error).__name__,
+            'error': str(error),
+            'attempts': 1,
+        })
+        run_report.increment(f'failures.{kind}')
+
+    def recorder(self, input_file, output_file):
+        """
+        Retorna o callback on_error de translate_markdown_content para um arquivo.
+        """
+        def on_error(text, error, segment=None):
+            self.record(SEGMENT, input_file, output_file, error, text, segment)
+        return on_error
+
+    def retry(self, translator, memory=None, rounds=3, backoff=5.0, delay=1.0):
+        """
+        Tenta novamente as falhas registradas, com backoff exponencial entre rodadas.
+
+        Args:
+            translator: Instância do tradutor
+            memory: Memória de tradução (opcional)
+            rounds: Quantidade de rodadas de novas tentativas
+            backoff: Espera (segundos) antes da primeira rodada; dobra a cada
+                rodada, e nunca é menor que o tempo até o disjuntor do
+                tradutor voltar a aceitar chamadas
+            delay: Tempo de espera entre traduções ao refazer arquivos inteiros
+        """
+        from deep_translator_script import safe_translate, translate_markdown_file
+
+        retry_after = getattr(translator, 'retry_after', None)
+        for round_number in range(rounds):
+            if not self.entries:
+                return
+            wait = backoff * (2 ** round_number)
+            if retry_after is not None:
+                # Com o disjuntor ainda aberto, a rodada seria rejeitada inteira
+                wait = max(wait, retry_after())
+            print(f"🔁 Tentando novamente {len(self.entries)} falhas em {wait:g}s "
+                  f"(rodada {round_number + 1} de {rounds})...")
+            time.sleep(wait)
+
+            pending = []
+            for entry in self.entries:
+                entry['attempts'] += 1
+                errors = []
+
+                if entry['kind'] == FILE:
+                    retry_queue = FailureQueue()
+                    translate_markdown_file(entry['input_file'], entry['output_file'], translator,
+                                            delay, memory, retry_queue)
+                    file_errors = [item for item in retry_queue.entries if item['kind'] == FILE]
+                    if file_errors:
+                        entry['error_class'] = file_errors[-1]['error_class']
+                        entry['error'] = file_errors[-1]['error']
+                        pending.append(entry)
+                        continue
+                    # Trechos que falharam no arquivo refeito entram na próxima rodada
+                    pending.extend(retry_queue.entries)
+                else:
+                    translated = safe_translate(entry['text'], translator, memory=memory,
+                                                on_error=lambda text, error: errors.append(error))
+                    if errors:
+                        entry['error_class'] = type(errors[-1]).__name__
+                        entry['error'] = str(errors[-1])
+                        pending.append(entry)
+                        continue
+                    if not patch_output(entry['output_file'], entry['text'], translated, entry['segment']):
+                        entry['error_class'] = 'PatchError'
+                        entry['error'] = 'trecho original não encontrado no segmento do arquivo de saída'
+                        pending.append(entry)
+                        continue
+
+                run_report.increment('failures.recovered')
+
+            self.entries = pending
+
+    def write_report(self, path):
+        """
+        Grava as falhas restantes em JSON.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'failures': self.entries}, f, ensure_ascii=False, indent=2)
+
+    def print_summary(self):
+        """
+        Imprime uma linha por falha restante.
+        """
+        for entry in self.entries:
+            where = entry['input_file']
+            if entry['kind'] == SEGMENT:
+                where += f": {entry['text'][:60]!r}"
+            print(f"❌ {where} ({entry['error_class']}: {entry['error']})")
+
+
+def patch_output(output_file, original, translated, segment):
+    """
+    Substitui o trecho original pela tradução no segmento em que a falha
+    ocorreu, localizado pelo índice na SegmentTable do arquivo de saída. Os
+    trechos extraídos (código, HTML, comentários, admonitions) nunca são
+    alterados, mesmo que contenham o mesmo texto.
+
+    Args:
+        output_file: Arquivo de saída já gravado
+        original: Trecho que ficou sem tradução
+        translated: Tradução do trecho
+        segment: Índice do segmento registrado na falha
+
+    Returns:
+        True se o trecho foi encontrado no segmento e substituído
+    """
+    from deep_translator_script import restore_patterns
+    from segment_table import SegmentTable
+
+    if segment is None:
+        return False
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    patterns, table = SegmentTable.from_content(content)
+    if segment >= len(table):
+        return False
+    texts = list(table.texts())
+    if original not in texts[segment]:
+        return False
+    # A remontagem precisa reproduzir o arquivo, para que só o segmento mude
+    if restore_patterns(table.rebuild(texts), patterns) != content:
+        return False
+
+    texts[segment] = texts[segment].replace(original, translated, 1)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(restore_patterns(table.rebuild(texts), patterns))
+    return True
@@ -10,7 +10,13 @@ import sys
 import time
 import argparse
 from pathlib import Path
-from googletrans import Translator
+
+import payload
+import profiling
+import run_report
+from scanners import admonition_spans, comment_spans, fence_spans, html_spans, replace_spans
+from backends import add_dispatch_arguments
+from dispatch import CircuitBreaker, HedgedTranslator
 
 def safe_translate(text, translator, preserve_patterns=None):
     """
@@ -60,15 +66,17 @@ def safe_translate(text, translator, preserve_patterns=None):
             r'\$[a-zA-Z0-9_]+',
             # URLs
             r'https?://[^\s)]+',
-            # Figuras Markdown
-            r'<figure.*?</figure>',
             # Estilos inline
             r'\{[^}]*\}',
             # Elementos de classes e sintaxe especial do MkDocs
             r'\{[.=].*?\}',
-            # Comentários HTML
-            r'<!--.*?-->',
         ]
+        
+        # Comentários HTML e figuras são extraídos antes, por varredura linear
+        for find_spans in (comment_spans, lambda t: html_spans(t, names=('figure',))):
+            text, extracted = replace_spans(text, find_spans(text), "__PLACEHOLDER_{}__", first=counter)
+            placeholders.update(extracted)
+            counter += len(extracted)
     
     # Salvar partes que não devem ser traduzidas
     for pattern in preserve_patterns:
@@ -79,11 +87,17 @@ def safe_translate(text, translator, preserve_patterns=None):
             text = text.replace(match.group(0), placeholder)
             counter += 1
     
-    # Traduzir o texto
+    # Traduzir o texto, com placeholders e espaços codificados de forma compacta
     try:
         if text.strip():
-            translated = translator.translate(text, src='en', dest='pt')
-            translated_text = translated.text
+            encoded, encoding = payload.encode(text)
+            with profiling.stage('remote'):
+                translated = translator.translate(encoded, src='en', dest='pt')
+            translated_text = payload.decode(translated.text, encoding)
+            if translated_text is None:
+                # O backend perdeu algum token: reenviar sem a codificação
+                with profiling.stage('remote'):
+                    translated_text = translator.translate(text, src='en', dest='pt').text
         else:
             translated_text = text
     except Exception as e:
@@ -91,7 +105,7 @@ def safe_translate(text, translator, preserve_patterns=None):
         return text
     
     # Restaurar as partes preservadas
-    for placeholder, original in placeholders.items():
+    for placeholder, original in reversed(placeholders.items()):
         translated_text = translated_text.replace(placeholder, original)
     
     return translated_text
@@ -106,20 +120,7 @@ def extract_codeblocks(content):
     Returns:
         Tupla com o conteúdo modificado e dicionário de blocos de código
     """
-    # Regex para blocos de código
-    code_block_pattern = r'```[a-zA-Z0-9_]*\n[\s\S]*?```'
-    
-    # Encontrar todos os blocos de código
-    code_blocks = {}
-    counter = 0
-    
-    for match in re.finditer(code_block_pattern, content):
-        placeholder = f"__CODEBLOCK_{counter}__"
-        code_blocks[placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
-        counter += 1
-    
-    return content, code_blocks
+    return replace_spans(content, fence_spans(content), "__CODEBLOCK_{}__")
 
 def extract_frontmatter(content):
     """
@@ -151,19 +152,7 @@ def extract_html_comments(content):
     Returns:
         Tupla com o conteúdo modificado e dicionário de comentários
     """
-    comment_pattern = r'<!--[\s\S]*?-->'
-    
-    # Encontrar todos os comentários HTML
-    comments = {}
-    counter = 0
-    
-    for match in re.finditer(comment_pattern, content):
-        placeholder = f"__COMMENT_{counter}__"
-        comments[placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
-        counter += 1
-    
-    return content, comments
+    return replace_spans(content, comment_spans(content), "__COMMENT_{}__")
 
 def extract_admonitions(content):
     """
@@ -175,20 +164,8 @@ def extract_admonitions(content):
     Returns:
         Tupla com o conteúdo modificado e dicionário de admonitions
     """
-    # Regex para admonitions do MkDocs Material
-    admonition_pattern = r'!!!.*?\n(?:\s{4}.*?\n)+(?:\n|$)'
-    
-    # Encontrar todos os admonitions
-    admonitions = {}
-    counter = 0
-    
-    for match in re.finditer(admonition_pattern, content, re.MULTILINE):
-        placeholder = f"__ADMONITION_{counter}__"
-        admonitions[placeholder] = match.group(0)
-        content = content.replace(match.group(0), placeholder)
-        counter += 1
-    
-    return content, admonitions
+    # Blocos delimitados pelo recuo (ver scanners.admonition_spans)
+    return replace_spans(content, admonition_spans(content), "__ADMONITION_{}__")
 
 def translate_markdown_file(input_file, output_file, translator, delay=1):
     """
@@ -201,9 +178,23 @@ def translate_markdown_file(input_file, output_file, translator, delay=1):
         delay: Tempo de espera entre traduções para evitar bloqueio (em segundos)
     """
     try:
+        with profiling.profile_file(input_file):
+            _translate_markdown_file(input_file, output_file, translator, delay)
+            
+        print(f"✅ Arquivo traduzido: {output_file}")
+    
+    except Exception as e:
+        print(f"❌ Erro ao traduzir {input_file}: {e}")
+
+def _translate_markdown_file(input_file, output_file, translator, delay):
+    """
+    Corpo de translate_markdown_file, separado para ser perfilado como um todo.
+    """
+    with profiling.stage('read'):
         with open(input_file, 'r', encoding='utf-8') as f:
             content = f.read()
-        
+    
+    with profiling.stage('extract'):
         # Extrair frontmatter
         content, frontmatter = extract_frontmatter(content)
         
@@ -215,41 +206,42 @@ def translate_markdown_file(input_file, output_file, translator, delay=1):
         
         # Extrair admonitions
         content, admonitions = extract_admonitions(content)
-        
-        # Dividir o conteúdo em linhas
-        lines = content.split('\n')
-        
-        translated_lines = []
-        for i, line in enumerate(lines):
-            # Pular linhas vazias
-            if not line.strip():
-                translated_lines.append(line)
-                continue
-                
-            # Verificar se é um cabeçalho
-            header_match = re.match(r'^(#+)\s+(.+)$', line)
-            if header_match:
-                prefix = header_match.group(1)
-                text = header_match.group(2)
-                translated_text = safe_translate(text, translator)
-                translated_lines.append(f"{prefix} {translated_text}")
-            # Verificar se é uma linha especial (HTML, frontmatter etc.)
-            elif any(placeholder in line for placeholder in list(code_blocks.keys()) + 
-                   list(html_comments.keys()) + list(admonitions.keys())):
-                # Não traduzir se contém placeholder
-                translated_lines.append(line)
-            else:
-                # Traduzir a linha normalmente
-                translated_line = safe_translate(line, translator)
-                translated_lines.append(translated_line)
+    
+    # Dividir o conteúdo em linhas
+    lines = content.split('\n')
+    
+    translated_lines = []
+    for i, line in enumerate(lines):
+        # Pular linhas vazias
+        if not line.strip():
+            translated_lines.append(line)
+            continue
             
-            # Adicionar um pequeno atraso para evitar bloqueio da API
-            if i % 5 == 0 and i > 0:
-                time.sleep(delay)
-        
-        # Juntar as linhas traduzidas
-        translated_content = '\n'.join(translated_lines)
+        # Verificar se é um cabeçalho
+        header_match = re.match(r'^(#+)\s+(.+)$', line)
+        if header_match:
+            prefix = header_match.group(1)
+            text = header_match.group(2)
+            translated_text = safe_translate(text, translator)
+            translated_lines.append(f"{prefix} {translated_text}")
+        # Verificar se é uma linha especial (HTML, frontmatter etc.)
+        elif any(placeholder in line for placeholder in list(code_blocks.keys()) + 
+               list(html_comments.keys()) + list(admonitions.keys())):
+            # Não traduzir se contém placeholder
+            translated_lines.append(line)
+        else:
+            # Traduzir a linha normalmente
+            translated_line = safe_translate(line, translator)
+            translated_lines.append(translated_line)
         
+        # Adicionar um pequeno atraso para evitar bloqueio da API
+        if i % 5 == 0 and i > 0:
+            time.sleep(delay)
+    
+    # Juntar as linhas traduzidas
+    translated_content = '\n'.join(translated_lines)
+    
+    with profiling.stage('restore'):
         # Restaurar os blocos de código
         for placeholder, code_block in code_blocks.items():
             translated_content = translated_content.replace(placeholder, code_block)
@@ -265,20 +257,16 @@ def translate_markdown_file(input_file, output_file, translator, delay=1):
         # Restaurar o frontmatter
         if frontmatter:
             translated_content = translated_content.replace("__FRONTMATTER__", frontmatter)
-        
+    
+    with profiling.stage('write'):
         # Criar diretório de saída se não existir
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
         # Salvar o conteúdo traduzido
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(translated_content)
-            
-        print(f"✅ Arquivo traduzido: {output_file}")
-    
-    except Exception as e:
-        print(f"❌ Erro ao traduzir {input_file}: {e}")
 
-def translate_directory(input_dir, output_dir, delay=1):
+def translate_directory(input_dir, output_dir, delay=1, translator=None):
     """
     Traduz todos os arquivos Markdown em um diretório e seus subdiretórios.
     
@@ -286,8 +274,11 @@ def translate_directory(input_dir, output_dir, delay=1):
         input_dir: Diretório de entrada
         output_dir: Diretório de saída
         delay: Tempo de espera entre traduções para evitar bloqueio (em segundos)
+        translator: Instância do tradutor (cria um Translator se não informado)
     """
-    translator = Translator()
+    if translator is None:
+        from googletrans import Translator
+        translator = Translator()
     
     for root, _, files in os.walk(input_dir):
         for file in files:
@@ -308,23 +299,44 @@ def main():
     parser.add_argument('output', help='Arquivo ou diretório de saída')
     parser.add_argument('--delay', type=float, default=1.0, help='Tempo de espera entre traduções (em segundos)')
     parser.add_argument('--retry', action='store_true', help='Tentar novamente arquivos já traduzidos')
+    add_dispatch_arguments(parser)
+    payload.add_payload_arguments(parser)
+    profiling.add_profile_arguments(parser)
     
     args = parser.parse_args()
+    payload.configure(args)
     
     # Verificar se entrada existe
     if not os.path.exists(args.input):
         print(f"Erro: {args.input} não existe.")
         return 1
     
+    # Criar o tradutor com controle de latência de cauda
+    from googletrans import Translator
+    breaker = None
+    if args.breaker_threshold > 0:
+        breaker = CircuitBreaker(args.breaker_threshold, args.breaker_reset, name='googletrans')
+    translator = HedgedTranslator(
+        Translator(),
+        hedge_percentile=args.hedge_percentile,
+        breaker=breaker,
+        name='googletrans',
+    )
+    
+    if args.profile:
+        profiling.start(args.profile)
+    
     # Se for um diretório
     if os.path.isdir(args.input):
-        translate_directory(args.input, args.output, args.delay)
+        translate_directory(args.input, args.output, args.delay, translator)
     else:
         # Criar diretório de saída
         os.makedirs(os.path.dirname(args.output), exist_ok=True)
-        translator = Translator()
         translate_markdown_file(args.input, args.output, translator, args.delay)
     
+    translator.close()
+    profiling.finish()
+    run_report.print_report()
     return 0
 
 if __name__ == "__main__":
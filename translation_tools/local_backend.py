@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Backend de tradução local, com um modelo de tradução automática na CPU.
+
+Dispensa os endpoints gratuitos do Google (limitados por taxa e indisponíveis
+em máquinas sem rede). Os segmentos já mascarados chegam em lotes por
+translate_batch(); cada lote é dividido entre processos worker (um por núcleo
+disponível), e cada worker carrega o modelo uma única vez, na primeira
+inferência que recebe.
+
+O diretório do modelo pode conter:
+
+- um modelo seq2seq no formato do Hugging Face transformers (ex.: uma cópia
+  local de Helsinki-NLP/opus-mt-en-ROMANCE), carregado com
+  AutoTokenizer/AutoModelForSeq2SeqLM; ou
+- um arquivo local_model.py com a função load(model_dir, source, target), que
+  retorna uma função lista de textos -> lista de traduções. Serve para
+  modelos em outros formatos e para modelos mínimos de teste.
+
+transformers e torch só são importados dentro dos workers, e apenas quando o
+diretório não traz o próprio local_model.py.
+"""
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Arquivo do diretório do modelo que substitui o carregamento pelo transformers
+LOADER_FILE = 'local_model.py'
+
+# Estado de cada processo worker: configuração recebida do initializer e
+# função de tradução criada na primeira inferência
+_worker_config = None
+_worker_model = None
+
+
+def available_cores():
+    """
+    Núcleos de CPU que este processo pode usar.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def load_model(model_dir, source='en', target='pt'):
+    """
+    Carrega o modelo do diretório.
+
+    Args:
+        model_dir: Diretório do modelo
+        source: Idioma de origem
+        target: Idioma de destino
+
+    Returns:
+        Função que recebe uma lista de textos e retorna suas traduções
+    """
+    loader_path = os.path.join(model_dir, LOADER_FILE)
+    if os.path.exists(loader_path):
+        spec = importlib.util.spec_from_file_location('local_model', loader_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.load(model_dir, source, target)
+    return _load_transformers_model(model_dir)
+
+
+def _load_transformers_model(model_dir, max_new_tokens=512):
+    try:
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    except ImportError as e:
+        raise RuntimeError(f"O backend local requer transformers e torch ({e}), "
+                           f"ou um {LOADER_FILE} em {model_dir}") from e
+
+    # Os workers já dividem os núcleos entre si
+    torch.set_num_threads(1)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_dir)
+    model.eval()
+
+    def translate(texts):
+        inputs = tokenizer(texts, return_tensors='pt', padding=True, truncation=True)
+        with torch.no_grad():
+            outputs = model.generate(**inputs, max_new_tokens=max_new_tokens)
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    return translate
+
+
+def _init_worker(model_dir, source, target):
+    global _worker_config
+    _worker_config = (model_dir, source, target)
+
+
+def _translate_in_worker(texts):
+    global _worker_model
+    if _worker_model is None:
+        _worker_model = load_model(*_worker_config)
+    translations = list(_worker_model(texts))
+    if len(translations) != len(texts):
+        raise RuntimeError(f"O modelo retornou {len(translations)} traduções para {len(texts)} textos")
+    return translations
+
+
+class LocalBackend:
+    """
+    Traduz com um modelo local, dividindo os lotes entre processos worker.
+
+    Args:
+        model_dir: Diretório do modelo
+        source: Idioma de origem
+        target: Idioma de destino
+        workers: Processos worker (None usa um por núcleo disponível)
+        batch_size: Segmentos por inferência
+    """
+
+    # Sem limite de requisições: as pausas entre chamadas remotas não se aplicam
+    paced = True
+
+    def __init__(self, model_dir, source='en', target='pt', workers=None, batch_size=16):
+        if not model_dir or not os.path.isdir(model_dir):
+            raise ValueError(f"Diretório do modelo local não encontrado: {model_dir} (use --local-model)")
+        self.model_dir = model_dir
+        self.source = source
+        self.target = target
+        self.batch_size = max(1, batch_size)
+        self.workers = workers or available_cores()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(model_dir, source, target),
+        )
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        """
+        Traduz vários textos, em lotes de batch_size distribuídos entre os workers.
+
+        Args:
+            texts: Lista de textos
+
+        Returns:
+            Lista de traduções, na mesma ordem
+        """
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        translations = []
+        for batch in self._executor.map(_translate_in_worker, batches):
+            translations.extend(batch)
+        return translations
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
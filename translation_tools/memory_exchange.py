@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Importação e exportação da memória de tradução em TMX e XLIFF.
+
+Permite guardar a memória como artefato de build e restaurá-la em máquinas
+que começam sem ela (runners de CI efêmeros, máquinas de desenvolvimento).
+Cada unidade leva o segmento de origem, a tradução, o par de idiomas e o
+backend que produziu a tradução.
+
+A leitura usa ElementTree.iterparse e descarta cada unidade depois de
+processada, e a escrita usa XMLGenerator, então memórias de centenas de MB
+são lidas e gravadas sem montar a árvore XML inteira. Arquivos terminados em
+.gz são comprimidos/descomprimidos automaticamente.
+
+Formatos:
+    TMX 1.4: <tu> com um <tuv xml:lang> por idioma e <prop type="x-backend">
+    XLIFF 1.2 (exportação e importação) e 2.0 (importação): <source>,
+        <target> e uma nota com o backend
+"""
+
+import os
+import tempfile
+
+import run_report
+
+FORMATS = ('tmx', 'xliff')
+TOOL_NAME = 'translation_tools'
+
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+_XLIFF_NS = 'urn:oasis:names:tc:xliff:document:1.2'
+
+
+def detect_format(path):
+    """
+    Identifica o formato pela extensão do arquivo.
+
+    Returns:
+        'tmx' ou 'xliff'
+
+    Raises:
+        ValueError: Se a extensão não for reconhecida
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension == '.tmx':
+        return 'tmx'
+    if extension in ('.xlf', '.xliff'):
+        return 'xliff'
+    raise ValueError(f"Formato não reconhecido para {path} (use .tmx, .xlf ou .xliff)")
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        import gzip
+
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def _same_language(code, lang):
+    # 'pt-BR' e 'pt_br' correspondem a 'pt'
+    return bool(code) and code.replace('_', '-').lower().split('-')[0] == lang.lower().split('-')[0]
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+class _Writer:
+    """
+    Escrita incremental de elementos com XMLGenerator.
+    """
+
+    def __init__(self, stream):
+        # Importado aqui, como ElementTree em import_memory: o parser do CLI
+        # importa este módulo, e xml.sax.saxutils importa urllib
+        from xml.sax.saxutils import XMLGenerator
+
+        self.xml = XMLGenerator(stream, encoding='utf-8', short_empty_elements=True)
+        self.xml.startDocument()
+
+    def start(self, name, attrs=None):
+        self.xml.startElement(name, attrs or {})
+
+    def end(self, name):
+        self.xml.endElement(name)
+
+    def element(self, name, text, attrs=None):
+        self.start(name, attrs)
+        self.xml.characters(text)
+        self.end(name)
+
+    def newline(self):
+        self.xml.ignorableWhitespace('\n')
+
+
+def _write_tmx(writer, memory):
+    writer.start('tmx', {'version': '1.4'})
+    writer.newline()
+    writer.element('header', '', {
+        'creationtool': TOOL_NAME, 'creationtoolversion': '1', 'datatype': 'plaintext',
+        'segtype': 'sentence', 'adminlang': 'en', 'srclang': memory.source_lang, 'o-tmf': TOOL_NAME,
+    })
+    writer.newline()
+    writer.start('body')
+    writer.newline()
+    count = 0
+    for source, (target, backend) in memory.entries.items():
+        writer.start('tu')
+        if backend:
+            writer.element('prop', backend, {'type': 'x-backend'})
+        for lang, text in ((memory.source_lang, source), (memory.target_lang, target)):
+            writer.start('tuv', {'xml:lang': lang})
+            writer.element('seg', text)
+            writer.end('tuv')
+        writer.end('tu')
+        writer.newline()
+        count += 1
+    writer.end('body')
+    writer.newline()
+    writer.end('tmx')
+    return count
+
+
+def _write_xliff(writer, memory):
+    writer.start('xliff', {'version': '1.2', 'xmlns': _XLIFF_NS})
+    writer.newline()
+    writer.start('file', {'original': 'translation-memory', 'datatype': 'plaintext', 'tool-id': TOOL_NAME,
+                          'source-language': memory.source_lang, 'target-language': memory.target_lang})
+    writer.newline()
+    writer.start('body')
+    writer.newline()
+    count = 0
+    for source, (target, backend) in memory.entries.items():
+        count += 1
+        writer.start('trans-unit', {'id': str(count)})
+        writer.element('source', source)
+        writer.element('target', target, {'state': 'translated'})
+        if backend:
+            writer.element('note', backend, {'from': 'backend'})
+        writer.end('trans-unit')
+        writer.newline()
+    writer.end('body')
+    writer.newline()
+    writer.end('file')
+    writer.newline()
+    writer.end('xliff')
+    return count
+
+
+def export_memory(memory, path, fmt=None):
+    """
+    Grava todas as entradas da memória em TMX ou XLIFF, de forma atômica.
+
+    Args:
+        memory: Instância de TranslationMemory
+        path: Arquivo de saída (.tmx, .xlf ou .xliff, opcionalmente .gz)
+        fmt: Formato ('tmx' ou 'xliff'); deduzido da extensão se omitido
+
+    Returns:
+        Quantidade de unidades gravadas
+    """
+    fmt = fmt or detect_format(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as tmp:
+        try:
+            stream = tmp
+            if path.endswith('.gz'):
+                import gzip
+
+                stream = gzip.GzipFile(filename='', mode='wb', fileobj=tmp)
+            writer = _Writer(stream)
+            count = _write_tmx(writer, memory) if fmt == 'tmx' else _write_xliff(writer, memory)
+            writer.xml.endDocument()
+            if stream is not tmp:
+                stream.close()
+        except BaseException:
+            tmp.close()
+            os.remove(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+    run_report.increment('exchange.exported', count)
+    return count
+
+
+def _tmx_units(events, source_lang, target_lang):
+    header_lang = None
+    body = None
+    for event, elem in events:
+        name = _local_name(elem.tag)
+        if event == 'start':
+            if name == 'body':
+                body = elem
+            continue
+        if name == 'header':
+            header_lang = elem.get('srclang')
+            if header_lang and header_lang != '*all*' and not _same_language(header_lang, source_lang):
+                print(f"⚠️ TMX com idioma de origem {header_lang}; a memória é de {source_lang}.")
+                return
+        elif name == 'tu':
+            backend = None
+            texts = {}
+            for child in elem:
+                child_name = _local_name(child.tag)
+                if child_name == 'prop' and child.get('type') == 'x-backend':
+                    backend = child.text or None
+                elif child_name == 'tuv':
+                    lang = child.get(_XML_LANG) or child.get('lang')
+                    seg = next((c for c in child if _local_name(c.tag) == 'seg'), None)
+                    if lang and seg is not None:
+                        texts[lang] = ''.join(seg.itertext())
+            source = next((text for lang, text in texts.items() if _same_language(lang, source_lang)), None)
+            target = next((text for lang, text in texts.items() if _same_language(lang, target_lang)), None)
+            yield source, target, backend
+            # Descartar a unidade já processada (memória constante)
+            elem.clear()
+            if body is not None:
+                body.clear()
+
+
+def _xliff_units(events, source_lang, target_lang):
+    languages_match = True
+    container = None
+    for event, elem in events:
+        name = _local_name(elem.tag)
+        if event == 'start':
+            if name == 'xliff' and elem.get('srcLang'):
+                # XLIFF 2.0: idiomas na raiz
+                languages_match = _same_language(elem.get('srcLang'), source_lang) and \
+                    _same_language(elem.get('trgLang'), target_lang)
+            elif name == 'file' and elem.get('source-language'):
+                # XLIFF 1.2: idiomas em cada <file>
+                languages_match = _same_language(elem.get('source-language'), source_lang) and \
+                    _same_language(elem.get('target-language'), target_lang)
+            elif name in ('body', 'file'):
+                container = elem
+            continue
+        if name not in ('trans-unit', 'unit'):
+            continue
+        if languages_match:
+            source = target = backend = None
+            for child in elem.iter():
+                child_name = _local_name(child.tag)
+                if child_name == 'source' and source is None:
+                    source = ''.join(child.itertext())
+                elif child_name == 'target' and target is None:
+                    target = ''.join(child.itertext())
+                elif child_name == 'note' and 'backend' in (child.get('from'), child.get('category')):
+                    backend = child.text or None
+            yield source, target, backend
+        else:
+            yield None, None, None
+        elem.clear()
+        if container is not None:
+            container.clear()
+
+
+def import_memory(memory, path, policy='reviewed', fmt=None):
+    """
+    Incorpora à memória as unidades de um arquivo TMX ou XLIFF.
+
+    Unidades de outro par de idiomas ou sem origem e tradução são ignoradas;
+    conflitos com traduções já guardadas seguem TranslationMemory.merge.
+
+    Args:
+        memory: Instância de TranslationMemory
+        path: Arquivo de entrada (.tmx, .xlf ou .xliff, opcionalmente .gz)
+        policy: Política de conflito (ver MERGE_POLICIES)
+        fmt: Formato ('tmx' ou 'xliff'); deduzido da extensão se omitido
+
+    Returns:
+        Dicionário com as contagens added, unchanged, replaced, kept e skipped
+    """
+    import xml.etree.ElementTree as ET
+
+    fmt = fmt or detect_format(path)
+    counts = dict.fromkeys(('added', 'unchanged', 'replaced', 'kept', 'skipped'), 0)
+    with _open(path) as stream:
+        events = ET.iterparse(stream, events=('start', 'end'))
+        units = _tmx_units if fmt == 'tmx' else _xliff_units
+        for source, target, backend in units(events, memory.source_lang, memory.target_lang):
+            if not source or not target or not source.strip():
+                counts['skipped'] += 1
+                continue
+            counts[memory.merge(source, target, backend, policy)] += 1
+
+    for key, value in counts.items():
+        if value:
+            run_report.increment(f'exchange.{key}', value)
+    return counts
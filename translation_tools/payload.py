@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Codificação compacta do texto mascarado enviado ao backend.
+
+Os placeholders de mascaramento (<<<PLACEHOLDER_12>>>, __PLACEHOLDER_3__,
+<<<FRONTMATTER>>>) são longos e contam no limite de caracteres por requisição.
+Antes do envio:
+
+- sequências de placeholders separados só por espaços viram um único token;
+- cada token é trocado por {n}, o formato curto que os backends do Google
+  devolvem intacto;
+- espaços no início e no fim são removidos e recolocados depois. Espaços
+  internos são enviados como estão, pois sequências deles podem fazer parte
+  do conteúdo (tabelas alinhadas, texto recuado).
+
+Se a tradução voltar sem algum token (ou com tokens repetidos), decode()
+retorna None e o chamador envia o texto original.
+"""
+
+import re
+
+import run_report
+
+# Permite desligar a codificação pela linha de comando (--no-compact-payload)
+enabled = True
+
+_PLACEHOLDER = r'(?:<<<[A-Z]+(?:_\d+)?>>>|__[A-Z]+(?:_\d+)?__)'
+_RUN_RE = re.compile(rf'{_PLACEHOLDER}(?:\s*{_PLACEHOLDER})*')
+_TOKEN_RE = re.compile(r'\{\s*(\d+)\s*\}')
+
+
+class Encoding:
+    """
+    Informações para desfazer encode(): espaços das bordas e trechos de cada token.
+    """
+
+    __slots__ = ('leading', 'trailing', 'runs')
+
+    def __init__(self, leading, trailing, runs):
+        self.leading = leading
+        self.trailing = trailing
+        self.runs = runs
+
+
+def encode(text):
+    """
+    Codifica o texto mascarado para envio.
+
+    Args:
+        text: Texto mascarado
+
+    Returns:
+        Tupla (payload, Encoding), ou (text, None) se a codificação estiver
+        desligada ou o texto já contiver algo no formato dos tokens
+    """
+    if not enabled or _TOKEN_RE.search(text):
+        return text, None
+
+    body = text.strip()
+    start = text.find(body) if body else len(text)
+    leading, trailing = text[:start], text[start + len(body):]
+
+    runs = []
+
+    def compact(match):
+        runs.append(match.group(0))
+        return f"{{{len(runs) - 1}}}"
+
+    payload = _RUN_RE.sub(compact, body)
+
+    before = len(text.encode('utf-8'))
+    after = len(payload.encode('utf-8'))
+    run_report.increment('payload.bytes_before', before)
+    run_report.increment('payload.bytes_saved', before - after)
+    return payload, Encoding(leading, trailing, runs)
+
+
+def restore(text, encoding):
+    """
+    Recoloca os trechos dos tokens presentes, sem verificar se todos voltaram.
+    """
+    if encoding is None:
+        return text
+
+    def expand(match):
+        index = int(match.group(1))
+        return encoding.runs[index] if index < len(encoding.runs) else match.group(0)
+
+    return _TOKEN_RE.sub(expand, text)
+
+
+def decode(text, encoding):
+    """
+    Desfaz encode() na tradução.
+
+    Returns:
+        Texto com os placeholders e espaços originais, ou None se algum token
+        se perdeu ou foi duplicado pelo backend
+    """
+    if encoding is None:
+        return text
+    found = sorted(int(index) for index in _TOKEN_RE.findall(text))
+    if found != list(range(len(encoding.runs))):
+        run_report.increment('payload.fallbacks')
+        return None
+    return encoding.leading + restore(text.strip(), encoding) + encoding.trailing
+
+
+def add_payload_arguments(parser):
+    """
+    Adiciona ao parser o argumento que desliga a codificação compacta.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--no-compact-payload', dest='compact_payload', action='store_false',
+                        help='Enviar os placeholders por extenso, sem a codificação compacta')
+
+
+def configure(args):
+    """
+    Aplica o argumento de add_payload_arguments.
+    """
+    global enabled
+    enabled = getattr(args, 'compact_payload', True)
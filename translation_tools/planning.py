@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Planejamento de uma tradução sem chamadas remotas.
+
+Segmenta os arquivos Markdown da mesma forma que a tradução e conta quantos
+segmentos seriam enviados ao backend, quantos já estão na memória de tradução
+e quantos não precisam de tradução.
+"""
+
+import math
+import os
+
+import prefilter
+from deep_translator_script import find_markdown_files, mask_text
+from segment_table import SegmentTable
+
+# Tamanho máximo de um pedaço enviado ao backend (ver safe_translate)
+MAX_CHARS = 4000
+
+
+def plan_texts(texts, memory=None):
+    """
+    Conta quantos segmentos seriam enviados ao backend.
+
+    Args:
+        texts: Textos dos segmentos (sem máscara)
+        memory: Memória de tradução consultada (opcional)
+
+    Returns:
+        Dicionário com segments, skipped, cached, to_translate, chars e requests
+    """
+    stats = {'segments': 0, 'skipped': 0, 'cached': 0, 'to_translate': 0, 'chars': 0, 'requests': 0}
+    for text in texts:
+        if not text.strip():
+            continue
+        stats['segments'] += 1
+
+        masked, _ = mask_text(text)
+        if not ''.join(masked.split()).strip() or prefilter.skip_reason(masked) is not None:
+            stats['skipped'] += 1
+        elif memory is not None and memory.lookup(masked) is not None:
+            stats['cached'] += 1
+        else:
+            stats['to_translate'] += 1
+            stats['chars'] += len(masked)
+            stats['requests'] += math.ceil(len(masked) / MAX_CHARS)
+    return stats
+
+
+def plan_file(input_file, memory=None):
+    """
+    Conta os segmentos de um arquivo Markdown.
+
+    Args:
+        input_file: Caminho do arquivo de entrada
+        memory: Memória de tradução consultada (opcional)
+
+    Returns:
+        Dicionário com segments, skipped, cached, to_translate, chars e requests
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    _, table = SegmentTable.from_content(content)
+    return plan_texts(table.texts(), memory)
+
+
+def plan_paths(input_path, memory=None):
+    """
+    Planeja a tradução de um arquivo ou de um diretório.
+
+    Returns:
+        Lista de tuplas (caminho relativo, estatísticas de plan_file)
+    """
+    if os.path.isdir(input_path):
+        files = [(rel_path, input_file)
+                 for rel_path, input_file, _ in find_markdown_files(input_path, input_path)]
+    else:
+        files = [(os.path.basename(input_path), input_path)]
+    return [(rel_path, plan_file(input_file, memory)) for rel_path, input_file in files]
+
+
+def print_plan(plan):
+    """
+    Imprime o plano por arquivo e os totais.
+    """
+    totals = {}
+    for rel_path, stats in plan:
+        print(f"{rel_path}: {stats['segments']} segmentos, {stats['cached']} na memória, "
+              f"{stats['skipped']} sem tradução necessária, {stats['to_translate']} a traduzir "
+              f"({stats['chars']} caracteres)")
+        for key, value in stats.items():
+            totals[key] = totals.get(key, 0) + value
+
+    if totals:
+        print(f"\nTotal: {len(plan)} arquivos, {totals['segments']} segmentos, "
+              f"{totals['to_translate']} a traduzir em ~{totals['requests']} requisições "
+              f"({totals['chars']} caracteres)")
+    else:
+        print("Nenhum arquivo Markdown encontrado.")
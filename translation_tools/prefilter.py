@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pré-filtro local que evita chamadas remotas para segmentos sem nada a traduzir.
+
+Roda sobre o segmento já mascarado, em poucos microssegundos, e descarta:
+
+- segmentos sem letras (separadores de tabela, números, placeholders e pontuação);
+- segmentos formados só por identificadores, versões, comandos ou caminhos;
+- linhas de terminal fora de blocos de código (npm install, git push origin
+  main, $ pip install -r requirements.txt);
+- segmentos que já estão no idioma de destino (detecção por diacríticos e
+  palavras funcionais).
+"""
+
+import re
+
+import run_report
+
+# Permite desligar o filtro pela linha de comando (--no-prefilter)
+enabled = True
+
+_PLACEHOLDER_RE = re.compile(r'<<<[A-Z]+_\d+>>>')
+_LETTER_RE = re.compile(r'[^\W\d_]')
+_WORD_RE = re.compile(r"[^\W\d_]+")
+# Tokens com cara de identificador: versões, flags de linha de comando,
+# @menções, #refs, snake_case, caminhos, nomes com pontos (arquivos, pacotes),
+# nomes com sufixo numérico (GPL-3.0), chaves YAML (allow-licenses:),
+# camelCase e siglas
+_IDENTIFIER_RE = re.compile(
+    r'(?:v?\d+(?:\.\d+)+\S*'
+    r'|--?[\w-]+(?:=\S*)?'
+    r'|[@#$]\w[\w./-]*'
+    r'|\S*[_/\\]\S*'
+    r'|\w+(?:\.\w+)+'
+    r'|\w+(?:-\w+)*-\d[\w.-]*'
+    r'|\w+(?:-\w+)+:'
+    r'|[a-z]+[A-Z]\w*'
+    r'|[A-Z0-9]{2,}'
+    r')[.,;:]?'
+)
+
+# Programas que iniciam linhas de terminal escritas no meio do texto
+COMMANDS = frozenset('''
+    apt apt-get brew cargo cd conda cp curl docker gh git go kubectl ls make
+    mkdir mkdocs mv npm npx pip pip3 pipx pnpm poetry python python3 rm sudo
+    uv wget yarn
+'''.split())
+# Prompt do terminal antes do comando
+_PROMPT_RE = re.compile(r'^[$>#]\s+')
+
+# Palavras funcionais frequentes de cada idioma (sem as ambíguas, como "a" e "do")
+STOPWORDS = {
+    'pt': frozenset('''
+        o os um uma uns umas da das dos no na nos nas ao aos pelo pela pelos pelas
+        de em para por com sem que se não é são está estão ser foi será pode podem
+        seu sua seus suas este esta estes estas esse essa isso isto aqui também
+        mais muito como quando onde ou mas já você vocês nosso nossa ele ela eles
+        elas entre sobre após até cada ao depois antes então
+    '''.split()),
+    'en': frozenset('''
+        the an of in to for with without that this these those is are was were
+        be been will can could should would from by on at it its you your we our
+        they their there here also more very when where or but and if not into
+        after before each then which what how all any
+    '''.split()),
+}
+
+_DIACRITICS = {
+    'pt': frozenset('ãõçáéíóúâêôà'),
+}
+
+
+def detect_language(text):
+    """
+    Detecta o idioma pelas palavras funcionais e diacríticos.
+
+    Args:
+        text: Segmento (mascarado ou não)
+
+    Returns:
+        Código do idioma ('pt', 'en') ou None se não for possível decidir
+    """
+    scores = dict.fromkeys(STOPWORDS, 0)
+    for word in _WORD_RE.findall(text.lower()):
+        for lang, words in STOPWORDS.items():
+            if word in words:
+                scores[lang] += 1
+    for lang, marks in _DIACRITICS.items():
+        if any(char in marks for char in text):
+            scores[lang] += 1
+
+    best = max(scores, key=scores.get)
+    ranked = sorted(scores.values(), reverse=True)
+    if ranked[0] < 2 or ranked[0] == ranked[1]:
+        return None
+    return best
+
+
+def is_command(text):
+    """
+    Indica se o segmento é uma linha de terminal: começa por um programa de
+    COMMANDS (com ou sem prompt) e não tem palavras funcionais, que indicariam
+    uma frase como "make sure the build passes".
+
+    Args:
+        text: Segmento sem placeholders
+    """
+    tokens = _PROMPT_RE.sub('', text.strip()).split()
+    if not tokens or tokens[0] not in COMMANDS:
+        return False
+    words = {word for token in tokens[1:] for word in _WORD_RE.findall(token.lower())}
+    return not any(words & stopwords for stopwords in STOPWORDS.values())
+
+
+def skip_reason(text, target_lang='pt'):
+    """
+    Indica por que um segmento mascarado não precisa ser traduzido.
+
+    Args:
+        text: Segmento mascarado
+        target_lang: Idioma de destino da tradução
+
+    Returns:
+        'no_letters', 'identifier', 'command', 'target_language' ou None se
+        o segmento deve ser traduzido
+    """
+    if not enabled:
+        return None
+
+    bare = _PLACEHOLDER_RE.sub(' ', text)
+    if not _LETTER_RE.search(bare):
+        return 'no_letters'
+
+    tokens = bare.split()
+    if all(_IDENTIFIER_RE.fullmatch(token) or not _LETTER_RE.search(token) for token in tokens):
+        return 'identifier'
+
+    if is_command(bare):
+        return 'command'
+
+    if detect_language(bare) == target_lang:
+        return 'target_language'
+
+    return None
+
+
+def should_skip(text, target_lang='pt'):
+    """
+    Versão de skip_reason que registra o resultado no relatório de execução.
+
+    Returns:
+        True se o segmento deve ser mantido sem chamada remota
+    """
+    reason = skip_reason(text, target_lang)
+    if reason is None:
+        return False
+    run_report.increment(f'prefilter.{reason}')
+    run_report.increment('prefilter.saved_calls')
+    return True
+
+
+def add_prefilter_arguments(parser):
+    """
+    Adiciona ao parser o argumento que desliga o pré-filtro.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--no-prefilter', dest='prefilter', action='store_false',
+                        help='Enviar ao backend também segmentos que o pré-filtro local descartaria')
+
+
+def configure(args):
+    """
+    Aplica o argumento de add_prefilter_arguments.
+    """
+    global enabled
+    enabled = getattr(args, 'prefilter', True)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Perfil opcional (--profile) da tradução, por arquivo e por etapa.
+
+Com o perfil ligado, cada arquivo de entrada é executado sob cProfile e
+tracemalloc, e as etapas marcadas com stage() (extração, tradução remota,
+restauração, gravação) registram tempo e pico de memória. Ao final são
+gravados, no diretório informado:
+
+- <arquivo>.collapsed: pilhas no formato "a;b;c microssegundos", prontas para
+  flamegraph.pl, speedscope ou inferno;
+- summary.txt: tempo e pico de memória por etapa, funções mais custosas e
+  maiores alocações de cada arquivo.
+
+Desligado, stage() e profile_file() devolvem um contexto vazio compartilhado,
+e o custo é o de uma verificação de None por chamada.
+"""
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+# Perfil em andamento (None quando --profile não foi informado)
+active = None
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+# Quantidade de funções e de linhas de alocação listadas no resumo
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+
+
+class Profiler:
+    """
+    Coleta os perfis de uma execução.
+
+    Args:
+        output_dir: Diretório onde os perfis são gravados
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.files = []
+        self._current = None
+        self._stack = []
+        self._file_peak = 0
+
+    @contextlib.contextmanager
+    def profile_file(self, label):
+        """
+        Executa o bloco sob cProfile e tracemalloc, atribuindo o resultado a label.
+        """
+        record = {'label': label, 'stages': {}}
+        self._current = record
+        self._file_peak = 0
+        tracemalloc.start()
+        start_snapshot = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            record['seconds'] = time.perf_counter() - started
+            self._propagate_peak()
+            record['peak_kb'] = self._file_peak / 1024
+            record['allocations'] = tracemalloc.take_snapshot().compare_to(
+                start_snapshot, 'lineno')[:TOP_ALLOCATIONS]
+            tracemalloc.stop()
+            self._current = None
+            self._stack = []
+            self._save(record, profile)
+            self.files.append(record)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Mede tempo e pico de memória de uma etapa do arquivo em perfil.
+        """
+        record = self._current
+        if record is None:
+            yield
+            return
+        # O pico é reiniciado a cada etapa; o pico parcial é repassado às
+        # etapas externas antes de cada reinício para não se perder
+        self._propagate_peak()
+        tracemalloc.reset_peak()
+        self._stack.append([name, 0])
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._propagate_peak()
+            tracemalloc.reset_peak()
+            _, peak = self._stack.pop()
+            stats = record['stages'].setdefault(name, {'calls': 0, 'seconds': 0.0, 'peak_kb': 0.0})
+            stats['calls'] += 1
+            stats['seconds'] += elapsed
+            stats['peak_kb'] = max(stats['peak_kb'], peak / 1024)
+
+    def _propagate_peak(self):
+        if not tracemalloc.is_tracing():
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        self._file_peak = max(self._file_peak, peak)
+        for entry in self._stack:
+            entry[1] = max(entry[1], peak)
+
+    def _save(self, record, profile):
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = record['label'].replace(os.sep, '__').replace('/', '__').lstrip('._') or 'profile'
+        stats = pstats.Stats(profile)
+        record['collapsed'] = os.path.join(self.output_dir, f'{name}.collapsed')
+        with open(record['collapsed'], 'w', encoding='utf-8') as f:
+            for stack, microseconds in collapsed_stacks(stats):
+                f.write(f"{stack} {microseconds}\n")
+
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats('tottime').print_stats(TOP_FUNCTIONS)
+        record['hot_functions'] = text.getvalue()
+
+    def write_summary(self):
+        """
+        Grava summary.txt com os dados de todos os arquivos e retorna o caminho.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, 'summary.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in sorted(self.files, key=lambda r: r['seconds'], reverse=True):
+                f.write(f"=== {record['label']}: {record['seconds']:.3f}s, "
+                        f"pico {record['peak_kb']:.0f} KiB ({record['collapsed']})\n")
+                for name, stats in sorted(record['stages'].items(), key=lambda i: i[1]['seconds'], reverse=True):
+                    f.write(f"  {name}: {stats['seconds']:.3f}s em {stats['calls']} chamadas, "
+                            f"pico {stats['peak_kb']:.0f} KiB\n")
+                f.write("  Maiores alocações:\n")
+                for stat in record['allocations']:
+                    f.write(f"    {stat}\n")
+                f.write(record['hot_functions'])
+                f.write('\n')
+        return path
+
+
+def collapsed_stacks(stats, min_microseconds=1):
+    """
+    Converte as estatísticas do cProfile em pilhas colapsadas.
+
+    O cProfile só guarda arestas chamador -> chamado; cada pilha é obtida
+    descendo a partir das funções sem chamador, e o tempo de uma função
+    chamada de vários lugares é repartido na proporção do tempo acumulado de
+    cada aresta.
+
+    Args:
+        stats: Instância de pstats.Stats
+        min_microseconds: Pilhas com menos tempo próprio são omitidas
+
+    Returns:
+        Lista de tuplas ("f1;f2;f3", microssegundos de tempo próprio)
+    """
+    raw = stats.stats
+    children = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller in callers:
+            children.setdefault(caller, []).append(func)
+
+    def label(func):
+        filename, line, name = func
+        if filename == '~':
+            return name
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    result = []
+
+    def walk(func, path, on_path, factor):
+        tottime = raw[func][2]
+        frames = path + [label(func)]
+        own = round(tottime * factor * 1_000_000)
+        if own >= min_microseconds:
+            result.append((';'.join(frames), own))
+        for child in children.get(func, ()):
+            if child in on_path:
+                continue
+            child_cumtime = raw[child][3]
+            edge_cumtime = raw[child][4][func][3]
+            child_factor = factor * edge_cumtime / child_cumtime if child_cumtime else 0.0
+            if child_cumtime * child_factor * 1_000_000 < min_microseconds:
+                continue
+            on_path.add(child)
+            walk(child, frames, on_path, child_factor)
+            on_path.discard(child)
+
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            walk(func, [], {func}, 1.0)
+    return result
+
+
+def start(output_dir):
+    """
+    Liga o perfil, gravando os resultados em output_dir.
+    """
+    global active
+    active = Profiler(output_dir)
+    return active
+
+
+def finish():
+    """
+    Grava o resumo do perfil ligado por start() e o desliga.
+    """
+    global active
+    if active is None:
+        return
+    path = active.write_summary()
+    print(f"🔬 Perfil de {len(active.files)} arquivos gravado em {active.output_dir} (resumo: {path})")
+    active = None
+
+
+def profile_file(label):
+    """
+    Contexto que perfila um arquivo de entrada; vazio com o perfil desligado.
+    """
+    if active is None:
+        return _NULL_CONTEXT
+    return active.profile_file(label)
+
+
+def stage(name):
+    """
+    Contexto que mede uma etapa do arquivo em perfil; vazio com o perfil desligado.
+    """
+    if active is None:
+        return _NULL_CONTEXT
+    return active.stage(name)
+
+
+def add_profile_arguments(parser):
+    """
+    Adiciona ao parser o argumento que liga o perfil.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--profile', metavar='DIRETÓRIO',
+                        help='Gravar perfis (cProfile e tracemalloc) por arquivo e etapa neste diretório')
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Relatório de execução compartilhado pelas ferramentas de tradução.
+
+Os módulos registram contadores (ex.: requisições duplicadas enviadas) e
+valores pontuais (ex.: latência observada) durante a execução, e o script
+principal imprime o resumo ao final.
+"""
+
+import threading
+from collections import Counter
+
+counters = Counter()
+values = {}
+
+_lock = threading.Lock()
+
+# Descrições legíveis das chaves conhecidas
+LABELS = {
+    'hedge.sent': 'Requisições duplicadas (hedge) enviadas',
+    'hedge.won': 'Requisições duplicadas que responderam primeiro',
+    'hedge.skipped': 'Requisições duplicadas não enviadas por falta de orçamento',
+    'breaker.opened': 'Disjuntor aberto (backend em falha)',
+    'breaker.rejected': 'Chamadas bloqueadas pelo disjuntor',
+    'breaker.probes': 'Sondagens do backend com disjuntor semiaberto',
+    'breaker.probe_timeouts': 'Sondagens sem resposta no prazo (disjuntor reaberto)',
+    'breaker.closed': 'Disjuntor fechado após sondagem bem-sucedida',
+    'balancer.failover': 'Segmentos repassados a outro backend',
+    'prefilter.saved_calls': 'Chamadas evitadas pelo pré-filtro local',
+    'prefilter.no_letters': 'Segmentos sem letras',
+    'prefilter.identifier': 'Segmentos só com identificadores, versões ou comandos',
+    'prefilter.command': 'Linhas de terminal fora de blocos de código',
+    'prefilter.target_language': 'Segmentos já no idioma de destino',
+    'queue.completed': 'Jobs da fila concluídos',
+    'queue.partial': 'Jobs da fila concluídos com trechos sem tradução',
+    'queue.failed': 'Jobs da fila com erro',
+    'queue.expired_leases': 'Jobs reassumidos após lease expirado',
+    'queue.lost_leases': 'Resultados descartados por lease perdido',
+    'remote.calls': 'Chamadas ao backend remoto',
+    'startup.ms': 'Tempo de inicialização (ms)',
+    'chunking.errors': 'Reduções do tamanho dos pedaços por erro',
+    'chunking.rejected': 'Reduções do tamanho dos pedaços por payload recusado',
+    'chunking.slowdowns': 'Reduções do tamanho dos pedaços por lentidão',
+    'memory.exact_hits': 'Segmentos encontrados na memória (exatos)',
+    'memory.fuzzy_hits': 'Segmentos encontrados na memória (aproximados)',
+    'memory.misses': 'Segmentos ausentes da memória',
+    'alignment.files': 'Pares de arquivos alinhados',
+    'alignment.missing_files': 'Arquivos sem tradução correspondente',
+    'alignment.stored': 'Pares gravados na memória',
+    'alignment.unmatched': 'Linhas sem correspondência estrutural',
+    'alignment.rejected.placeholders': 'Pares rejeitados por placeholders diferentes',
+    'alignment.rejected.untranslated': 'Pares rejeitados por tradução ausente',
+    'alignment.rejected.sentences': 'Pares rejeitados por quantidade de frases diferente',
+    'alignment.rejected.not_translatable': 'Pares sem texto a traduzir',
+    'catalog.batches': 'Lotes de mensagens enviados',
+    'catalog.fallbacks': 'Lotes refeitos mensagem a mensagem',
+    'catalog.translated': 'Mensagens de catálogo traduzidas',
+    'payload.bytes_before': 'Bytes mascarados antes da codificação compacta',
+    'payload.bytes_saved': 'Bytes economizados pela codificação compacta',
+    'payload.fallbacks': 'Reenvios sem codificação (token perdido pelo backend)',
+    'batch.calls': 'Lotes enviados ao backend local',
+    'batch.segments': 'Segmentos traduzidos em lote',
+    'batch.failed': 'Lotes com erro (segmentos enviados um a um)',
+    'exchange.exported': 'Segmentos exportados (TMX/XLIFF)',
+    'exchange.added': 'Segmentos importados novos',
+    'exchange.replaced': 'Traduções substituídas pela importação',
+    'exchange.kept': 'Traduções mantidas em conflitos da importação',
+    'exchange.unchanged': 'Segmentos importados já presentes na memória',
+    'exchange.skipped': 'Unidades importadas ignoradas (outro idioma ou vazias)',
+    'cassette.recorded': 'Chamadas gravadas no cassete',
+    'cassette.replayed': 'Chamadas respondidas pelo cassete',
+    'cassette.unmatched': 'Chamadas sem correspondência no cassete',
+    'failures.segment': 'Trechos mantidos em inglês por erro',
+    'failures.file': 'Arquivos com erro',
+    'failures.recovered': 'Falhas recuperadas nas novas tentativas',
+}
+
+
+def increment(key, amount=1):
+    """
+    Incrementa um contador do relatório.
+
+    Args:
+        key: Nome do contador (ex.: 'hedge.sent')
+        amount: Valor a somar
+    """
+    with _lock:
+        counters[key] += amount
+
+
+def set_value(key, value):
+    """
+    Registra um valor pontual no relatório, substituindo o anterior.
+
+    Args:
+        key: Nome do valor
+        value: Valor a registrar
+    """
+    with _lock:
+        values[key] = value
+
+
+def reset():
+    """
+    Limpa todos os contadores e valores registrados.
+    """
+    with _lock:
+        counters.clear()
+        values.clear()
+
+
+def print_report():
+    """
+    Imprime o relatório de execução agrupado pelo prefixo de cada chave.
+    """
+    with _lock:
+        entries = list(counters.items()) + list(values.items())
+
+    if not entries:
+        return
+
+    print("\n📊 Relatório da execução:")
+    current_group = None
+    for key, value in sorted(entries):
+        group = key.split('.', 1)[0]
+        if group != current_group:
+            print(f"  [{group}]")
+            current_group = group
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        print(f"    {LABELS.get(key, key)}: {value}")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Varreduras em tempo linear para extrair trechos que não devem ser traduzidos.
+
+Substituem as expressões regulares preguiçosas ([\\s\\S]*?, .*?) usadas antes
+para comentários HTML, blocos de código, elementos HTML e admonitions. Essas
+expressões recomeçam a busca a cada abertura sem fechamento e podem levar
+tempo quadrático (ou pior) em páginas com tags desbalanceadas. Aqui cada
+caractere é examinado um número constante de vezes.
+
+Todas as funções retornam listas de intervalos (início, fim) em ordem, sem
+sobreposição, para uso com replace_spans.
+"""
+
+import re
+import sys
+from collections import Counter
+
+# Elementos HTML sem fechamento, que nunca iniciam um trecho extraído
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+})
+
+# Uma tag de abertura ou fechamento. [^<>]* para no próximo "<", então
+# tentativas que falham não reexaminam o texto; o lookbehind ignora os
+# placeholders <<<NOME_n>>> das extrações anteriores
+_TAG_RE = re.compile(r'(?<!<)<(/?)([a-zA-Z][a-zA-Z0-9-]*)(?=[\s/>])[^<>]*>')
+_FENCE_INFO_RE = re.compile(r'[a-zA-Z0-9_]*\n')
+
+
+def comment_spans(content):
+    """
+    Localiza comentários HTML (<!-- ... -->).
+    """
+    spans = []
+    pos = 0
+    while True:
+        start = content.find('<!--', pos)
+        if start == -1:
+            return spans
+        end = content.find('-->', start + 4)
+        if end == -1:
+            # Sem fechamento depois daqui, nenhuma abertura posterior fecha
+            return spans
+        spans.append((start, end + 3))
+        pos = end + 3
+
+
+def fence_spans(content):
+    """
+    Localiza blocos de código cercados por ``` (com linguagem opcional).
+    """
+    spans = []
+    pos = 0
+    while True:
+        start = content.find('```', pos)
+        if start == -1:
+            return spans
+        info = _FENCE_INFO_RE.match(content, start + 3)
+        if info is None:
+            pos = start + 1
+            continue
+        end = content.find('```', info.end())
+        if end == -1:
+            return spans
+        spans.append((start, end + 3))
+        pos = end + 3
+
+
+def html_spans(content, names=None, void_elements=VOID_ELEMENTS):
+    """
+    Localiza elementos HTML completos, balanceando aberturas e fechamentos.
+
+    Fechamentos sem abertura são ignorados; aberturas sem fechamento não
+    formam trecho, mas os elementos completos dentro delas sim.
+
+    Args:
+        content: Texto a examinar
+        names: Se informado, apenas elementos com esses nomes são extraídos
+            (os demais são atravessados em busca de elementos internos)
+        void_elements: Elementos que não têm fechamento
+
+    Returns:
+        Lista de intervalos dos elementos mais externos
+    """
+    # Elementos completos encontrados até aqui, em ordem. Tudo o que entrou
+    # depois de uma abertura está dentro dela, então cada abertura guarda só
+    # a posição nessa lista em que seus elementos internos começam
+    spans = []
+    # Cada item: (nome, início, índice do primeiro elemento interno em spans)
+    stack = []
+    open_counts = Counter()
+
+    for match in _TAG_RE.finditer(content):
+        closing, name = match.group(1), match.group(2).lower()
+        if not closing:
+            if name not in void_elements and not match.group(0).endswith('/>'):
+                stack.append((name, match.start(), len(spans)))
+                open_counts[name] += 1
+            continue
+
+        if not open_counts[name]:
+            continue
+        # Aberturas sem fechamento entre esta tag e a abertura correspondente
+        # ficam dentro do elemento, junto com os elementos completos delas
+        while True:
+            open_name, start, first = stack.pop()
+            open_counts[open_name] -= 1
+            if open_name == name:
+                break
+
+        if names is None or name in names:
+            # O elemento substitui os internos; cada um é removido uma vez só
+            del spans[first:]
+            spans.append((start, match.end()))
+
+    return spans
+
+
+def admonition_spans(content, marker='!!!'):
+    """
+    Localiza admonitions pelo recuo: a linha com o marcador e as linhas
+    seguintes recuadas em quatro espaços (linhas vazias entre elas incluídas),
+    mais uma linha vazia final, se houver.
+
+    Args:
+        content: Conteúdo Markdown
+        marker: Marcador que inicia a admonition
+
+    Returns:
+        Lista de intervalos, do marcador até o fim do bloco
+    """
+    spans = []
+    start = body_end = None
+    pos = 0
+
+    def close():
+        end = body_end + 1 if content.startswith('\n', body_end) else body_end
+        spans.append((start, end))
+
+    while True:
+        newline = content.find('\n', pos)
+        if newline == -1:
+            break
+        line = content[pos:newline]
+        next_pos = newline + 1
+
+        if start is not None:
+            if len(line) >= 4 and line[:4].isspace():
+                body_end = next_pos
+                pos = next_pos
+                continue
+            if not line.strip():
+                pos = next_pos
+                continue
+            if body_end is not None:
+                close()
+            start = body_end = None
+
+        index = line.find(marker)
+        if index != -1:
+            start = pos + index
+        pos = next_pos
+
+    if start is not None and body_end is not None:
+        close()
+    return spans
+
+
+def replace_spans(content, spans, template, first=0):
+    """
+    Substitui os intervalos por placeholders.
+
+    Args:
+        content: Texto original
+        spans: Intervalos ordenados e sem sobreposição
+        template: Formato do placeholder, com {} para o número
+        first: Número do primeiro placeholder
+
+    Returns:
+        Tupla (texto com placeholders, dicionário placeholder -> trecho original)
+    """
+    pieces = []
+    extracted = {}
+    last = 0
+    for number, (start, end) in enumerate(spans, first):
+        # Os mesmos placeholders se repetem em todos os arquivos
+        placeholder = sys.intern(template.format(number))
+        extracted[placeholder] = content[start:end]
+        pieces.append(content[last:start])
+        pieces.append(placeholder)
+        last = end
+    pieces.append(content[last:])
+    return ''.join(pieces), extracted
+
+
+def restore_spans(content, extracted):
+    """
+    Desfaz replace_spans em uma única passagem pelo texto, em vez de uma
+    cópia do texto inteiro por placeholder.
+
+    Args:
+        content: Texto com placeholders
+        extracted: Dicionário placeholder -> trecho original
+
+    Returns:
+        Texto com os trechos originais
+    """
+    if not extracted:
+        return content
+    pattern = re.compile('|'.join(re.escape(placeholder)
+                                  for placeholder in sorted(extracted, key=len, reverse=True)))
+    return pattern.sub(lambda match: extracted[match.group(0)], content)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Ordem de tradução dos arquivos de um diretório.
+
+As páginas que aparecem no nav do mkdocs.yml são traduzidas primeiro, na
+ordem do menu, para que uma execução parcial ou com tempo limitado cubra o
+que o leitor vê. O restante segue a regra do maior trabalho primeiro (LPT),
+usando a quantidade de segmentos como estimativa de tamanho, o que reduz o
+tempo total (makespan) quando vários workers traduzem em paralelo.
+"""
+
+import os
+
+
+def _ignore_python_tags(loader, suffix, node):
+    # Tags como !!python/name:material.extensions.emoji.twemoji não importam aqui
+    return None
+
+
+def read_nav_order(mkdocs_config):
+    """
+    Lê a ordem das páginas do nav de um mkdocs.yml.
+
+    Args:
+        mkdocs_config: Caminho do mkdocs.yml
+
+    Returns:
+        Lista de caminhos (relativos a docs_dir) na ordem do nav; vazia se o
+        arquivo não existir ou o PyYAML não estiver instalado
+    """
+    if not mkdocs_config or not os.path.exists(mkdocs_config):
+        return []
+
+    try:
+        import yaml
+    except ImportError:
+        print("⚠️ PyYAML não instalado; a ordem do nav do mkdocs.yml será ignorada.")
+        return []
+
+    class NavLoader(yaml.SafeLoader):
+        pass
+
+    NavLoader.add_multi_constructor('tag:yaml.org,2002:python/', _ignore_python_tags)
+
+    with open(mkdocs_config, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=NavLoader) or {}
+
+    order = []
+
+    def walk(item):
+        if isinstance(item, str):
+            order.append(item)
+        elif isinstance(item, list):
+            for child in item:
+                walk(child)
+        elif isinstance(item, dict):
+            for child in item.values():
+                walk(child)
+
+    walk(config.get('nav', []))
+    return [os.path.normpath(path) for path in order if path.endswith('.md')]
+
+
+def schedule_files(files, nav_order=None, estimate=None):
+    """
+    Ordena os arquivos a traduzir.
+
+    Args:
+        files: Lista de tuplas (caminho relativo, entrada, saída)
+        nav_order: Caminhos relativos na ordem do nav (prioritários)
+        estimate: Função que recebe o arquivo de entrada e retorna seu tamanho
+            estimado (ex.: quantidade de segmentos)
+
+    Returns:
+        Lista de tuplas na ordem de tradução
+    """
+    position = {path: i for i, path in enumerate(nav_order or [])}
+
+    in_nav = [item for item in files if os.path.normpath(item[0]) in position]
+    in_nav.sort(key=lambda item: position[os.path.normpath(item[0])])
+
+    rest = [item for item in files if os.path.normpath(item[0]) not in position]
+    if estimate is not None:
+        sizes = {item[1]: estimate(item[1]) for item in rest}
+        # Maior trabalho primeiro; empate resolvido pelo caminho para ordem estável
+        rest.sort(key=lambda item: (-sizes[item[1]], item[0]))
+    else:
+        rest.sort(key=lambda item: item[0])
+
+    return in_nav + rest
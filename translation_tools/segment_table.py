@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Representação compacta dos segmentos traduzíveis de um arquivo.
+
+line_segment devolve cada segmento como uma tupla com duas strings novas
+(prefixo e texto), copiadas da linha, que por sua vez já é uma cópia feita
+por split('\\n'). Ao planejar ou guardar em cache uma árvore grande com
+vários idiomas, isso soma milhões de objetos pequenos.
+
+SegmentTable guarda apenas deslocamentos no conteúdo processado, em arrays
+de inteiros, e um índice para o prefixo (cabeçalhos '# ', '## ', ...),
+que é internado e compartilhado entre todos os arquivos. O texto de um
+segmento só é copiado quando pedido, e Segment (com __slots__) é apenas uma
+visão sobre a tabela.
+"""
+
+import re
+import sys
+from array import array
+
+# Placeholders criados por process_file_content
+_PLACEHOLDER_RE = re.compile(r'<<<[A-Z]+(?:_\d+)?>>>')
+# Mesmo critério de line_segment, aplicado com pos/endpos sem copiar a linha
+_HEADER_RE = re.compile(r'(#+)\s+(.+)$')
+_TEXT_RE = re.compile(r'\S')
+
+# Prefixos conhecidos, compartilhados por todas as tabelas; o índice 0 é a
+# linha normal, sem prefixo
+_PREFIXES = ['']
+_PREFIX_IDS = {'': 0}
+
+
+def _prefix_id(prefix):
+    prefix_id = _PREFIX_IDS.get(prefix)
+    if prefix_id is None:
+        prefix_id = _PREFIX_IDS[prefix] = len(_PREFIXES)
+        _PREFIXES.append(sys.intern(prefix))
+    return prefix_id
+
+
+class Segment:
+    """
+    Visão de um segmento da tabela: deslocamentos no conteúdo processado.
+
+    Attributes:
+        buffer: Conteúdo processado (compartilhado, não copiado)
+        line_start: Início da linha do segmento
+        start: Início do texto traduzível
+        end: Fim da linha e do texto
+        prefix: Prefixo recolocado antes da tradução (ex.: '## '), internado
+    """
+
+    __slots__ = ('buffer', 'line_start', 'start', 'end', 'prefix')
+
+    def __init__(self, buffer, line_start, start, end, prefix):
+        self.buffer = buffer
+        self.line_start = line_start
+        self.start = start
+        self.end = end
+        self.prefix = prefix
+
+    @property
+    def text(self):
+        return self.buffer[self.start:self.end]
+
+    def __repr__(self):
+        return f"Segment({self.prefix!r}, {self.text!r})"
+
+
+class SegmentTable:
+    """
+    Segmentos traduzíveis de um conteúdo processado, com o mesmo critério de
+    line_segment: linhas sem placeholders extraídos, com o marcador dos
+    cabeçalhos separado como prefixo. Linhas sem texto ficam de fora.
+
+    Args:
+        buffer: Conteúdo retornado por process_file_content
+        placeholders: Placeholders extraídos (ver extracted_placeholders)
+    """
+
+    __slots__ = ('buffer', 'line_starts', 'starts', 'ends', 'prefix_ids')
+
+    def __init__(self, buffer, placeholders=()):
+        self.buffer = buffer
+        typecode = 'I' if len(buffer) < 2 ** 32 else 'Q'
+        self.line_starts = array(typecode)
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.prefix_ids = array('H')
+
+        skipped_lines = self._placeholder_lines(buffer, set(placeholders))
+        line_start = 0
+        for line_number, end in enumerate(self._line_ends(buffer)):
+            if line_number not in skipped_lines:
+                self._add_line(line_start, end)
+            line_start = end + 1
+
+    @staticmethod
+    def _placeholder_lines(buffer, placeholders):
+        lines = set()
+        line_number = pos = 0
+        for match in _PLACEHOLDER_RE.finditer(buffer):
+            if match.group(0) in placeholders:
+                line_number += buffer.count('\n', pos, match.start())
+                pos = match.start()
+                lines.add(line_number)
+        return lines
+
+    @staticmethod
+    def _line_ends(buffer):
+        pos = buffer.find('\n')
+        while pos != -1:
+            yield pos
+            pos = buffer.find('\n', pos + 1)
+        yield len(buffer)
+
+    def _add_line(self, line_start, end):
+        buffer = self.buffer
+        header = _HEADER_RE.match(buffer, line_start, end)
+        if header is not None:
+            start, prefix_id = header.start(2), _prefix_id(f"{header.group(1)} ")
+        else:
+            start, prefix_id = line_start, 0
+            if _TEXT_RE.search(buffer, start, end) is None:
+                return
+        self.line_starts.append(line_start)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.prefix_ids.append(prefix_id)
+
+    @classmethod
+    def from_content(cls, content):
+        """
+        Extrai as partes que não devem ser traduzidas e monta a tabela.
+
+        Returns:
+            Tupla (padrões extraídos, tabela)
+        """
+        from deep_translator_script import extracted_placeholders, process_file_content
+
+        patterns, processed_content = process_file_content(content)
+        return patterns, cls(processed_content, extracted_placeholders(patterns))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        return Segment(self.buffer, self.line_starts[index], self.starts[index],
+                       self.ends[index], _PREFIXES[self.prefix_ids[index]])
+
+    def __iter__(self):
+        for index in range(len(self.starts)):
+            yield self[index]
+
+    def texts(self):
+        """
+        Textos dos segmentos, copiados um de cada vez.
+        """
+        buffer = self.buffer
+        for start, end in zip(self.starts, self.ends):
+            yield buffer[start:end]
+
+    def rebuild(self, translations):
+        """
+        Remonta o conteúdo com os segmentos substituídos.
+
+        Args:
+            translations: Tradução de cada segmento, na ordem da tabela
+
+        Returns:
+            Conteúdo com as linhas dos segmentos trocadas por prefixo + tradução
+        """
+        buffer = self.buffer
+        pieces = []
+        last = 0
+        for line_start, end, prefix_id, translated in zip(self.line_starts, self.ends, self.prefix_ids,
+                                                          translations):
+            pieces.append(buffer[last:line_start])
+            pieces.append(_PREFIXES[prefix_id])
+            pieces.append(translated)
+            last = end
+        pieces.append(buffer[last:])
+        return ''.join(pieces)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Verificação, sem chamadas remotas, de traduções desatualizadas.
+
+Ao fim de cada tradução, os arquivos traduzidos sem falhas são registrados
+em um manifesto no diretório de saída: hash do arquivo de origem, versão das
+regras de mascaramento e segmentação (ver pattern_set_id) e uma impressão
+digital de cada segmento. O modo check compara docs/ com esse registro e lista os arquivos e
+segmentos que mudaram desde então, com uma estimativa do custo para
+atualizá-los, sem importar nenhum backend.
+
+Formato do manifesto (JSON):
+
+    {"version": 1,
+     "files": {"caminho/relativo.md": {"sha256": "...", "pattern_set": "...",
+                                       "segments": ["impressão digital", ...]}}}
+"""
+
+import ast
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import textwrap
+
+import deep_translator_script
+import scanners
+import segment_table
+from deep_translator_script import PATTERN_SET_VERSION, PRESERVE_PATTERNS, find_markdown_files
+from planning import plan_texts
+from segment_table import SegmentTable
+
+MANIFEST_NAME = '.translation-manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+# Estimativa de tempo por requisição: pausa de 0,5 s de translate_chunks
+# mais a latência típica do backend
+SECONDS_PER_REQUEST = 1.0
+
+
+# Código que decide como o texto é dividido em segmentos e mascarado
+SEGMENTATION_CODE = (
+    deep_translator_script.mask_text,
+    deep_translator_script.process_file_content,
+    deep_translator_script.line_segment,
+    deep_translator_script.extracted_placeholders,
+    scanners,
+    segment_table,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def pattern_set_id():
+    """
+    Identificador das regras de mascaramento e segmentação: a versão
+    declarada mais um hash de PRESERVE_PATTERNS e da árvore sintática do
+    código em SEGMENTATION_CODE, para detectar mudanças sem incremento da
+    versão.
+    """
+    digest = hashlib.sha256('\n'.join(PRESERVE_PATTERNS).encode('utf-8'))
+    for code in SEGMENTATION_CODE:
+        digest.update(code_fingerprint(code).encode('utf-8'))
+    return f"{PATTERN_SET_VERSION}:{digest.hexdigest()[:12]}"
+
+
+def code_fingerprint(code):
+    """
+    Representação normalizada de uma função ou módulo: a árvore sintática
+    sem docstrings nem posições. Comentários, docstrings e formatação não
+    alteram o resultado, para que não invalidem as traduções já gravadas.
+    """
+    tree = ast.parse(textwrap.dedent(inspect.getsource(code)))
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) \
+                and node.body and isinstance(node.body[0], ast.Expr) \
+                and isinstance(node.body[0].value, ast.Constant) and isinstance(node.body[0].value.value, str):
+            node.body = node.body[1:] or [ast.Pass()]
+    return ast.dump(tree)
+
+
+def segment_fingerprint(segment):
+    """
+    Impressão digital curta de um segmento (prefixo e texto, sem máscara).
+    """
+    return hashlib.blake2b(f"{segment.prefix}{segment.text}".encode('utf-8'), digest_size=8).hexdigest()
+
+
+def default_manifest_path(output_path):
+    """
+    Manifesto padrão: no diretório de saída (ou no diretório do arquivo de saída).
+    """
+    directory = output_path if os.path.isdir(output_path) or not output_path.endswith('.md') \
+        else os.path.dirname(output_path)
+    return os.path.join(directory, MANIFEST_NAME)
+
+
+def _source_files(input_path, output_path):
+    if os.path.isdir(input_path):
+        return find_markdown_files(input_path, output_path)
+    return [(os.path.basename(input_path), input_path, output_path)]
+
+
+def _read(input_file):
+    with open(input_file, 'rb') as f:
+        data = f.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def file_record(input_file):
+    """
+    Registro de um arquivo de origem para o manifesto.
+
+    Returns:
+        Dicionário com sha256, pattern_set e segments
+    """
+    data, digest = _read(input_file)
+    _, table = SegmentTable.from_content(data.decode('utf-8'))
+    return {
+        'sha256': digest,
+        'pattern_set': pattern_set_id(),
+        'segments': [segment_fingerprint(segment) for segment in table if segment.text.strip()],
+    }
+
+
+def load_manifest(path):
+    """
+    Lê o manifesto.
+
+    Returns:
+        Dicionário caminho relativo -> registro (vazio se o arquivo não existir)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != MANIFEST_FORMAT_VERSION:
+        print(f"⚠️ Manifesto {path} em formato desconhecido; ignorando.")
+        return {}
+    return data.get('files', {})
+
+
+def record_manifest(path, input_path, output_path, failed_files=()):
+    """
+    Registra no manifesto os arquivos traduzidos com sucesso.
+
+    Arquivos com falha ou sem saída mantêm o registro anterior (se houver),
+    para que continuem aparecendo como desatualizados; registros de arquivos
+    de origem removidos são descartados.
+
+    Args:
+        path: Arquivo do manifesto
+        input_path: Arquivo ou diretório de origem da tradução
+        output_path: Arquivo ou diretório de saída
+        failed_files: Arquivos de entrada com falhas restantes
+
+    Returns:
+        Quantidade de arquivos registrados
+    """
+    files = load_manifest(path)
+    failed_files = set(failed_files)
+    sources = _source_files(input_path, output_path)
+    if os.path.isdir(input_path):
+        # Remover registros de arquivos de origem que não existem mais
+        current = {rel_path.replace(os.sep, '/') for rel_path, _, _ in sources}
+        files = {key: record for key, record in files.items() if key in current}
+
+    recorded = 0
+    for rel_path, input_file, output_file in sources:
+        if input_file in failed_files or not os.path.exists(output_file):
+            continue
+        files[rel_path.replace(os.sep, '/')] = file_record(input_file)
+        recorded += 1
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as tmp:
+        json.dump({'version': MANIFEST_FORMAT_VERSION, 'files': files}, tmp, ensure_ascii=False, indent=1,
+                  sort_keys=True)
+    os.replace(tmp.name, path)
+    return recorded
+
+
+def check_paths(input_path, output_path, manifest, memory=None):
+    """
+    Compara os arquivos de origem com o manifesto.
+
+    Args:
+        input_path: Arquivo ou diretório de origem
+        output_path: Arquivo ou diretório de saída
+        manifest: Registros de load_manifest
+        memory: Memória de tradução usada na estimativa de custo (opcional)
+
+    Returns:
+        Tupla (arquivos desatualizados, registros órfãos). Cada arquivo é um
+        dicionário com path, reason, segments (textos dos segmentos novos ou
+        alterados) e stats (estimativa de plan_texts)
+    """
+    pattern_set = pattern_set_id()
+    stale = []
+    seen = set()
+    for rel_path, input_file, output_file in _source_files(input_path, output_path):
+        key = rel_path.replace(os.sep, '/')
+        seen.add(key)
+        record = manifest.get(key)
+        data, digest = _read(input_file)
+
+        if record is not None and record['sha256'] == digest and record['pattern_set'] == pattern_set \
+                and os.path.exists(output_file):
+            continue
+
+        _, table = SegmentTable.from_content(data.decode('utf-8'))
+        texts = [segment.text for segment in table if segment.text.strip()]
+        if record is None:
+            reason, changed = 'sem registro de tradução', texts
+        elif not os.path.exists(output_file):
+            reason, changed = 'saída ausente', texts
+        elif record['pattern_set'] != pattern_set:
+            reason, changed = 'regras de mascaramento alteradas', texts
+        else:
+            known = set(record['segments'])
+            changed = [segment.text for segment in table
+                       if segment.text.strip() and segment_fingerprint(segment) not in known]
+            reason = 'origem alterada' if changed else 'origem alterada fora dos segmentos traduzíveis'
+
+        # A tradução refaz o arquivo inteiro: sem memória, todos os segmentos
+        # voltam ao backend; com memória, apenas os ausentes dela
+        stale.append({'path': key, 'reason': reason, 'segments': changed, 'stats': plan_texts(texts, memory)})
+
+    orphans = sorted(path for path in manifest if path not in seen) if os.path.isdir(input_path) else []
+    return stale, orphans
+
+
+def print_check(stale, orphans, max_segments=5):
+    """
+    Imprime os arquivos desatualizados e a estimativa de custo total.
+    """
+    totals = {'to_translate': 0, 'chars': 0, 'requests': 0}
+    for entry in stale:
+        stats = entry['stats']
+        print(f"❌ {entry['path']}: {entry['reason']} ({len(entry['segments'])} segmentos afetados, "
+              f"{stats['to_translate']} a traduzir)")
+        for text in entry['segments'][:max_segments]:
+            print(f"     - {text[:80]!r}")
+        if len(entry['segments']) > max_segments:
+            print(f"     ... e mais {len(entry['segments']) - max_segments}")
+        for key in totals:
+            totals[key] += stats[key]
+    for path in orphans:
+        print(f"❌ {path}: registrado no manifesto, mas a origem não existe mais")
+
+    if stale:
+        minutes = totals['requests'] * SECONDS_PER_REQUEST / 60
+        print(f"\nCusto estimado para atualizar: {totals['to_translate']} segmentos em "
+              f"~{totals['requests']} requisições ({totals['chars']} caracteres, ~{minutes:.1f} min)")
+
+
+def add_check_arguments(parser):
+    """
+    Adiciona ao parser os argumentos do modo check.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('input', help='Arquivo ou diretório de origem (ex.: docs)')
+    parser.add_argument('output', help='Arquivo ou diretório traduzido (ex.: docs-pt)')
+    parser.add_argument('--manifest', default=None,
+                        help=f"Manifesto da última tradução (padrão: {MANIFEST_NAME} na saída)")
+    parser.add_argument('--max-segments', type=int, default=5,
+                        help='Segmentos alterados listados por arquivo')
+
+
+def run_check(args, memory=None):
+    """
+    Executa o modo check.
+
+    Returns:
+        0 se tudo estiver atualizado, 1 caso contrário
+    """
+    if not os.path.exists(args.input):
+        print(f"Erro: {args.input} não existe.")
+        return 1
+    manifest_path = args.manifest or default_manifest_path(args.output)
+    stale, orphans = check_paths(args.input, args.output, load_manifest(manifest_path), memory)
+    if not stale and not orphans:
+        print(f"✅ {args.output} está atualizado em relação a {args.input}")
+        return 0
+    print_check(stale, orphans, args.max_segments)
+    return 1
@@ -0,0 +1,15 @@
+"""
+Configuração comum dos testes das ferramentas de tradução.
+
+Os módulos de translation_tools importam uns aos outros pelo nome (como em
+__main__.py), então o diretório entra no sys.path antes dos testes.
+"""
+
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
@@ -0,0 +1,35 @@
+"""
+Modelo mínimo para os testes do backend local.
+
+Troca palavra por palavra as entradas de um glossário fixo e mantém o resto
+(placeholders, tokens {n}, pontuação), de forma determinística.
+"""
+
+import re
+
+GLOSSARY = {
+    'hello': 'olá',
+    'world': 'mundo',
+    'this': 'isto',
+    'is': 'é',
+    'a': 'um',
+    'test': 'teste',
+    'the': 'o',
+    'file': 'arquivo',
+    'line': 'linha',
+}
+
+_WORD_RE = re.compile(r"[A-Za-z]+")
+
+
+def translate_text(text):
+    def replace(match):
+        word = match.group(0)
+        translated = GLOSSARY.get(word.lower(), word)
+        return translated.capitalize() if word[0].isupper() else translated
+
+    return _WORD_RE.sub(replace, text)
+
+
+def load(model_dir, source, target):
+    return lambda texts: [translate_text(text) for text in texts]
@@ -0,0 +1,51 @@
+"""
+Testes do alinhamento de documentos traduzidos (alignment).
+"""
+
+from alignment import ALIGNMENT_SOURCE, align_contents, align_file
+from deep_translator_script import mask_text
+from translation_memory import TranslationMemory
+
+SOURCE = """# Install
+
+Install the package with [pip](https://pip.pypa.io).
+
+This step needs network access.
+
+## Usage
+
+Run the command shown in `mkdocs serve`.
+"""
+
+# Os dois primeiros parágrafos foram unidos na tradução
+TARGET = """# Instalação
+
+Instale o pacote com [pip](https://pip.pypa.io). Esta etapa precisa de acesso à rede.
+
+## Uso
+
+Execute o comando mostrado em `mkdocs serve`.
+"""
+
+
+def test_mismatched_paragraph_counts_keep_structure():
+    pairs, unmatched = align_contents(SOURCE, TARGET)
+
+    assert unmatched == 1
+    assert ('Install', 'Instalação') in pairs
+    assert ('Usage', 'Uso') in pairs
+    assert ('Run the command shown in `mkdocs serve`.', 'Execute o comando mostrado em `mkdocs serve`.') in pairs
+
+
+def test_merged_paragraph_is_not_stored(tmp_path):
+    source, target = tmp_path / 'en.md', tmp_path / 'pt.md'
+    source.write_text(SOURCE, encoding='utf-8')
+    target.write_text(TARGET, encoding='utf-8')
+    memory = TranslationMemory()
+
+    assert align_file(str(source), str(target), memory) == 3
+
+    assert memory.lookup('Usage') == 'Uso'
+    assert memory.entries['Usage'][1] == ALIGNMENT_SOURCE
+    assert mask_text('Install the package with [pip](https://pip.pypa.io).')[0] not in memory
+    assert 'This step needs network access.' not in memory
@@ -0,0 +1,60 @@
+"""
+Testes da gravação e reprodução de cassetes (cassette) pelo build_translator.
+"""
+
+import argparse
+
+import pytest
+
+from backends import add_backend_arguments, build_translator
+from cassette import CassetteWriter
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    add_backend_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_recording_requires_fixed_chunks(tmp_path):
+    with pytest.raises(ValueError, match='--no-adaptive-chunks'):
+        build_translator(_args('--record-cassette', str(tmp_path / 'cassete.jsonl.gz')))
+
+
+def test_replay_always_uses_fixed_chunks(tmp_path):
+    path = str(tmp_path / 'cassete.jsonl.gz')
+    writer = CassetteWriter(path, ['deep_translator'])
+    writer.record('deep_translator', 'Hello', 0.2, response='Olá')
+    writer.close()
+
+    # Sem --no-adaptive-chunks: a reprodução ignora o ajuste AIMD
+    translator = build_translator(_args('--replay-cassette', path))
+    try:
+        assert translator.chunk_size is None
+        assert translator.translate('Hello') == 'Olá'
+    finally:
+        translator.close()
+
+
+def test_replay_rejects_missing_or_corrupt_cassette(tmp_path):
+    corrupt = tmp_path / 'corrompido.jsonl.gz'
+    corrupt.write_bytes(b'not gzip')
+
+    with pytest.raises(ValueError, match='não encontrado'):
+        build_translator(_args('--replay-cassette', str(tmp_path / 'ausente.jsonl.gz')))
+    with pytest.raises(ValueError, match='ilegível'):
+        build_translator(_args('--replay-cassette', str(corrupt)))
+
+
+def test_cli_reports_unreadable_cassette(tmp_path, capsys):
+    import deep_translator_script
+
+    parser = argparse.ArgumentParser()
+    deep_translator_script.add_translate_arguments(parser)
+    source = tmp_path / 'guide.md'
+    source.write_text('# Guide\n', encoding='utf-8')
+    args = parser.parse_args([str(source), str(tmp_path / 'out.md'),
+                              '--replay-cassette', str(tmp_path / 'ausente.jsonl.gz')])
+
+    assert deep_translator_script.run_translation(args) == 1
+    assert 'Erro: Cassete' in capsys.readouterr().out
@@ -0,0 +1,79 @@
+"""
+Testes da extração de mensagens do pipeline de catálogos (catalogs).
+"""
+
+import argparse
+
+import catalogs
+
+EN_PACK = '''{% macro t(key) %}{{ {
+  "language": "en",
+  "direction": "ltr",
+  "action.edit": "Edit this page",
+  "search.placeholder": "Search",
+  "toc": "Table of contents"
+}[key] }}{% endmacro %}
+'''
+
+PT_BR_PACK = '''{% macro t(key) %}{{ {
+  "language": "pt-BR",
+  "action.edit": "Editar esta página",
+  "search.placeholder": "Pesquisar"
+}[key] }}{% endmacro %}
+'''
+
+
+def _packs(tmp_path):
+    languages = tmp_path / 'material' / 'partials' / 'languages'
+    languages.mkdir(parents=True)
+    (languages / 'en.html').write_text(EN_PACK, encoding='utf-8')
+    (languages / 'pt-BR.html').write_text(PT_BR_PACK, encoding='utf-8')
+    return [str(languages)]
+
+
+def _args(tmp_path, **overrides):
+    parser = argparse.ArgumentParser()
+    catalogs.add_catalog_arguments(parser)
+    args = parser.parse_args(['--locales', 'pt_BR', 'es', '--dry-run',
+                              '--templates', str(tmp_path / 'templates'),
+                              '--locales-dir', str(tmp_path / 'locales'),
+                              '--json-dir', str(tmp_path / 'json')])
+    vars(args).update(overrides)
+    return args
+
+
+def test_language_pack_messages_are_extracted(tmp_path):
+    pack_dirs = _packs(tmp_path)
+
+    assert catalogs.collect_msgids([], [], pack_dirs) == ['Edit this page', 'Search', 'Table of contents']
+    assert catalogs.pack_translations(pack_dirs, 'pt_BR') == {
+        'Edit this page': 'Editar esta página',
+        'Search': 'Pesquisar',
+    }
+
+
+def test_existing_catalogs_are_default_sources(tmp_path):
+    po = tmp_path / 'locales' / 'pt_BR' / 'LC_MESSAGES' / 'messages.po'
+    po.parent.mkdir(parents=True)
+    po.write_text('msgid "Next"\nmsgstr "Próximo"\n', encoding='utf-8')
+
+    sources = catalogs.default_source_catalogs(str(tmp_path / 'locales'))
+
+    assert sources == [str(po)]
+    assert catalogs.collect_msgids([], sources) == ['Next']
+
+
+def test_run_without_messages_fails(tmp_path, capsys):
+    assert catalogs.run_catalogs(_args(tmp_path, language_packs=[])) == 1
+    assert 'nenhuma mensagem' in capsys.readouterr().out
+    assert not (tmp_path / 'locales').exists()
+    assert not (tmp_path / 'json').exists()
+
+
+def test_dry_run_counts_missing_messages(tmp_path, capsys):
+    assert catalogs.run_catalogs(_args(tmp_path, language_packs=_packs(tmp_path))) == 0
+
+    output = capsys.readouterr().out
+    # pt_BR também conta o dicionário TRANSLATIONS de translator.py
+    assert any(line.startswith('pt_BR: ') and line.endswith(', 1 sem tradução') for line in output.splitlines())
+    assert 'es: 3 mensagens, 3 sem tradução' in output
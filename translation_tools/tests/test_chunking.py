@@ -0,0 +1,68 @@
+"""
+Testes do controlador AIMD do tamanho dos pedaços (chunking).
+"""
+
+from chunking import AIMDChunkSizer, split_sentences
+
+
+def _sizer():
+    return AIMDChunkSizer('teste', min_chars=500, max_chars=4000, increase=250)
+
+
+def test_constant_latency_with_short_lines_keeps_size():
+    sizer = _sizer()
+    for chars in [40, 3500, 12, 900, 60, 2500] * 20:
+        sizer.record_success(chars, 0.3)
+
+    assert sizer.size == 4000
+
+
+def test_slowdown_halves_size():
+    sizer = _sizer()
+    for _ in range(5):
+        sizer.record_success(3000, 0.3)
+
+    sizer.record_success(3000, 3.0)
+
+    assert sizer.size == 2000
+
+
+def test_success_grows_size_back_after_slowdown():
+    sizer = _sizer()
+    sizer.record_success(3000, 0.3)
+    sizer.record_success(3000, 3.0)
+
+    for _ in range(4):
+        sizer.record_success(200, 0.3)
+
+    assert sizer.size == 3000
+    for _ in range(10):
+        sizer.record_success(200, 0.3)
+    assert sizer.size == 4000
+
+
+def test_size_is_clamped_to_limits():
+    sizer = _sizer()
+    for _ in range(10):
+        sizer.record_failure(RuntimeError('timeout'), 1000)
+    assert sizer.size == 500
+
+    sizer.record_failure(ValueError('text too long'), 3000)
+    for _ in range(20):
+        sizer.record_success(1000, 0.3)
+    assert sizer.ceiling == 2999
+    assert sizer.size == 2999
+
+
+def test_deep_translator_ceiling_is_below_its_limit():
+    assert AIMDChunkSizer.for_backend('deep_translator').max_chars < 5000
+
+
+def test_split_sentences_prefers_sentence_ends():
+    text = 'First sentence here. Second one, with a clause. Third.'
+
+    chunks = split_sentences(text, 30)
+
+    assert ''.join(chunks) == text
+    assert chunks[0] == 'First sentence here.'
+    assert all(len(chunk) <= 30 for chunk in chunks)
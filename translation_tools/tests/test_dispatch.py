@@ -0,0 +1,121 @@
+"""
+Testes do balanceador e das requisições duplicadas (dispatch).
+"""
+
+import time
+
+import pytest
+
+import dispatch
+from dispatch import BackendSlot, CircuitBreaker, HedgedTranslator, LoadBalancer, RateLimiter
+
+
+class _Backend:
+    """
+    Tradutor de teste com suporte a lote; falha em todas as chamadas se failing.
+    """
+
+    batched = True
+
+    def __init__(self, failing=False):
+        self.failing = failing
+        self.calls = 0
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        self.calls += 1
+        if self.failing:
+            raise RuntimeError('backend indisponível')
+        return [text.upper() for text in texts]
+
+
+def test_failover_reaches_every_slot_with_the_same_name():
+    backends = [_Backend(failing=True) for _ in range(3)]
+    balancer = LoadBalancer([BackendSlot('googletrans', backend) for backend in backends])
+
+    with pytest.raises(RuntimeError):
+        balancer.translate('ok')
+    assert [backend.calls for backend in backends] == [1, 1, 1]
+
+
+def test_batches_pass_through_when_every_slot_supports_them():
+    backends = [_Backend(failing=True), _Backend()]
+    balancer = LoadBalancer([BackendSlot('local', backend) for backend in backends])
+
+    assert balancer.batched
+    assert balancer.translate_batch(['a', 'b']) == ['A', 'B']
+    assert backends[1].calls == 1
+
+
+def test_batches_disabled_when_any_slot_lacks_them():
+    class _Single:
+        def translate(self, text):
+            return text
+
+    balancer = LoadBalancer([BackendSlot('local', _Backend()), BackendSlot('googletrans', _Single())])
+
+    assert not balancer.batched
+
+
+class _SlowFirst:
+    """
+    Tradutor de teste cuja primeira chamada demora.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        if self.calls == 1:
+            time.sleep(0.2)
+        return text
+
+
+def test_losing_primary_latency_is_recorded():
+    translator = HedgedTranslator(_SlowFirst(), hedge_percentile=50, min_samples=1)
+    translator.latencies.add(0.01)
+    try:
+        assert translator.translate('ok') == 'ok'
+    finally:
+        translator.close()
+
+    # Amostra inicial, duplicata vencedora e tempo decorrido da primária
+    assert len(translator.latencies) == 3
+    assert max(translator.latencies.samples) > 0.01
+
+
+def test_hedge_is_skipped_without_rate_budget():
+    limiter = RateLimiter(rate=0.001)
+    assert limiter.try_acquire()
+    backend = _SlowFirst()
+    translator = HedgedTranslator(backend, hedge_percentile=50, min_samples=1, limiter=limiter)
+    translator.latencies.add(0.01)
+    try:
+        assert translator.translate('ok') == 'ok'
+    finally:
+        translator.close()
+
+    assert backend.calls == 1
+
+
+def test_probe_without_answer_reopens_breaker(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(dispatch.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, probe_timeout=10.0)
+    breaker.record_failure()
+
+    now[0] += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10.0
+
+    # A sondagem nunca respondeu: o disjuntor reabre e aceita outra depois
+    now[0] += 10
+    assert breaker.is_open()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == 30.0
+    now[0] += 30
+    assert breaker.allow()
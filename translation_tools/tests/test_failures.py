@@ -0,0 +1,94 @@
+"""
+Testes do registro e da nova tentativa de falhas (failures).
+"""
+
+import deep_translator_script
+import failures
+from dispatch import CircuitBreaker, HedgedTranslator
+
+PAGE = """# Guide
+
+!!! note
+    Install the package first.
+
+Install the package first.
+
+<!-- Install the package first. -->
+"""
+
+
+class _Translator:
+    """
+    Tradutor de teste: responde com as funções da fila, uma por chamada.
+    """
+
+    paced = True
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        return response(text)
+
+
+def _fail(text):
+    raise RuntimeError('backend indisponível')
+
+
+def test_resend_records_only_final_failure():
+    # Primeiro envio perde o token {0}; o reenvio sem codificação falha
+    translator = _Translator(lambda text: 'sem tokens', _fail)
+    errors = []
+
+    result = deep_translator_script.safe_translate('Run `make` now', translator,
+                                                   on_error=lambda text, error: errors.append(text))
+
+    assert len(translator.calls) == 2
+    assert errors == ['Run `make` now']
+    assert result == 'Run `make` now'
+
+
+def test_failure_is_patched_only_in_its_segment(tmp_path):
+    source = tmp_path / 'guide.md'
+    output = tmp_path / 'out' / 'guide.md'
+    source.write_text(PAGE, encoding='utf-8')
+    queue = failures.FailureQueue()
+    translator = _Translator(lambda text: text.replace('Guide', 'Guia'), _fail, lambda text: 'Instale o pacote antes.')
+
+    deep_translator_script.translate_markdown_file(str(source), str(output), translator, delay=0, failures=queue)
+
+    assert [(entry['text'], entry['segment']) for entry in queue.entries] == [('Install the package first.', 1)]
+    queue.retry(translator, rounds=1, backoff=0)
+
+    assert not queue.entries
+    assert output.read_text(encoding='utf-8') == PAGE.replace('# Guide', '# Guia').replace(
+        '\nInstall the package first.\n', '\nInstale o pacote antes.\n')
+
+
+def test_patch_rejects_segment_without_original(tmp_path):
+    output = tmp_path / 'guide.md'
+    output.write_text(PAGE, encoding='utf-8')
+
+    assert not failures.patch_output(str(output), 'Install the package first.', 'Instale.', 0)
+    assert not failures.patch_output(str(output), 'Install the package first.', 'Instale.', 5)
+    assert output.read_text(encoding='utf-8') == PAGE
+
+
+def test_retry_waits_for_open_breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    translator = HedgedTranslator(_Translator(_fail), hedge_percentile=0, breaker=breaker)
+    breaker.record_failure()
+    queue = failures.FailureQueue()
+    queue.record(failures.SEGMENT, 'a.md', 'b.md', RuntimeError('x'), 'text', 0)
+    waits = []
+    monkeypatch.setattr(failures.time, 'sleep', waits.append)
+
+    try:
+        queue.retry(translator, rounds=1, backoff=5.0)
+    finally:
+        translator.close()
+
+    assert 29 < waits[0] <= 30
@@ -0,0 +1,96 @@
+"""
+Testes do backend local (local_backend) com o modelo mínimo de stub_model.
+"""
+
+import os
+
+import pytest
+
+import deep_translator_script
+from local_backend import LocalBackend, load_model
+
+STUB_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stub_model')
+
+TEXTS = [
+    'Hello world',
+    'This is a test',
+    'The file',
+    'Hello',
+    'A line',
+    'World',
+    'This is the line',
+]
+
+
+@pytest.fixture
+def backend():
+    backend = LocalBackend(STUB_MODEL, workers=1, batch_size=2)
+    yield backend
+    backend.close()
+
+
+class _Batched:
+    """
+    Tradutor em lote que registra os textos recebidos.
+    """
+
+    batched = True
+    paced = True
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.batches = []
+
+    def translate(self, text):
+        raise AssertionError(f"chamada individual inesperada: {text!r}")
+
+    def translate_batch(self, texts):
+        self.batches.append(list(texts))
+        return self.backend.translate_batch(texts)
+
+
+def test_load_model_uses_loader_file():
+    translate = load_model(STUB_MODEL)
+
+    assert translate(['Hello world']) == ['Olá mundo']
+
+
+def test_missing_model_dir_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LocalBackend(str(tmp_path / 'ausente'))
+
+
+def test_translate_batch_keeps_input_order(backend):
+    expected = [load_model(STUB_MODEL)([text])[0] for text in TEXTS]
+
+    assert backend.translate_batch(TEXTS) == expected
+    assert backend.translate('This is a test') == 'Isto é um teste'
+
+
+def test_multiple_workers_match_single_worker(backend):
+    texts = [f"{text} {i}" for i in range(20) for text in TEXTS]
+    pool = LocalBackend(STUB_MODEL, workers=3, batch_size=4)
+    try:
+        assert pool.workers == 3
+        assert pool.translate_batch(texts) == backend.translate_batch(texts)
+    finally:
+        pool.close()
+
+
+def test_prefetch_translations_fills_cache(backend):
+    translator = _Batched(backend)
+    texts = ['Hello **world**', 'This is a test', '', 'Hello **world**', '`code`']
+
+    prefetched = deep_translator_script.prefetch_translations(texts, translator)
+
+    # Um único lote, sem repetidos nem segmentos sem texto traduzível
+    assert len(translator.batches) == 1
+    assert len(translator.batches[0]) == 2
+    masked, _ = deep_translator_script.mask_text('Hello **world**')
+    assert set(prefetched) == {masked, 'This is a test'}
+    assert prefetched['This is a test'] == 'Isto é um teste'
+
+    # safe_translate usa o cache sem chamar o tradutor de novo
+    assert deep_translator_script.safe_translate('Hello **world**', translator,
+                                                 prefetched=prefetched) == 'Olá **world**'
+    assert len(translator.batches) == 1
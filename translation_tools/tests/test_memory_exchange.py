@@ -0,0 +1,54 @@
+"""
+Testes da importação e exportação da memória em TMX e XLIFF (memory_exchange).
+"""
+
+import pytest
+
+from memory_exchange import export_memory, import_memory
+from translation_memory import TranslationMemory
+
+ENTRIES = [
+    ("Install <<<CODE_1>>> & restart.", "Instale <<<CODE_1>>> & reinicie.", 'deep_translator'),
+    ("Use <em>bold</em> text < 5 \"quoted\" items.", "Use texto <em>negrito</em> < 5 itens \"citados\".", None),
+    ("Plain sentence.", "Frase simples.", 'alignment'),
+]
+
+
+def _memory():
+    memory = TranslationMemory()
+    for source, target, backend in ENTRIES:
+        memory.store(source, target, backend)
+    return memory
+
+
+@pytest.mark.parametrize('name', ['memoria.tmx', 'memoria.xlf', 'memoria.tmx.gz', 'memoria.xliff.gz'])
+def test_export_then_import_gives_same_memory(tmp_path, name):
+    memory = _memory()
+    path = str(tmp_path / name)
+
+    assert export_memory(memory, path) == len(ENTRIES)
+    restored = TranslationMemory()
+    counts = import_memory(restored, path)
+
+    assert counts['added'] == len(ENTRIES)
+    assert restored.entries == memory.entries
+
+
+def test_escaped_inline_markup_is_imported_as_text(tmp_path):
+    path = tmp_path / 'externa.tmx'
+    path.write_text("""<?xml version="1.0" encoding="utf-8"?>
+<tmx version="1.4">
+  <header srclang="en-US" segtype="sentence" datatype="html" adminlang="en" o-tmf="x" creationtool="x"
+          creationtoolversion="1"/>
+  <body>
+    <tu>
+      <tuv xml:lang="en-US"><seg>Click <bpt i="1">&lt;b&gt;</bpt>Save<ept i="1">&lt;/b&gt;</ept> &amp; exit.</seg></tuv>
+      <tuv xml:lang="pt-BR"><seg>Clique em <bpt i="1">&lt;b&gt;</bpt>Salvar<ept i="1">&lt;/b&gt;</ept> &amp; saia.</seg></tuv>
+    </tu>
+  </body>
+</tmx>
+""", encoding='utf-8')
+    memory = TranslationMemory()
+
+    assert import_memory(memory, str(path))['added'] == 1
+    assert memory.lookup("Click <b>Save</b> & exit.") == "Clique em <b>Salvar</b> & saia."
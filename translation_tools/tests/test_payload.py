@@ -0,0 +1,24 @@
+"""
+Testes da codificação compacta do texto enviado ao backend (payload).
+"""
+
+import payload
+
+
+def test_internal_spaces_are_sent_unchanged():
+    text = '  | Name    | Value   |\t'
+
+    encoded, encoding = payload.encode(text)
+
+    assert encoded == '| Name    | Value   |'
+    assert payload.decode(encoded, encoding) == text
+
+
+def test_placeholder_runs_become_one_token():
+    text = 'Use <<<CODE_1>>>  <<<LINK_2>>> to   start'
+
+    encoded, encoding = payload.encode(text)
+
+    assert encoded == 'Use {0} to   start'
+    assert payload.decode('Use {0} para   começar', encoding) == 'Use <<<CODE_1>>>  <<<LINK_2>>> para   começar'
+    assert payload.decode('Use para começar', encoding) is None
@@ -0,0 +1,39 @@
+"""
+Testes do pré-filtro local (prefilter).
+"""
+
+import pytest
+
+import prefilter
+
+CASES = [
+    # (segmento mascarado, motivo esperado)
+    ('<<<CODE_1>>>', 'no_letters'),
+    ('<<<CODE_1>>> <<<CODE_2>>>', 'no_letters'),
+    ('| --- | --- |', 'no_letters'),
+    ('42', 'no_letters'),
+    ('3.14 %', 'no_letters'),
+    ('https://squidfunk.github.io/mkdocs-material/', 'identifier'),
+    ('requirements.txt v1.2.3', 'identifier'),
+    ('npm install', 'command'),
+    ('git push origin main', 'command'),
+    ('$ pip install -r requirements.txt', 'command'),
+    ('Instale o pacote antes de começar.', 'target_language'),
+    ('Este guia mostra como publicar o site.', 'target_language'),
+    # Frases que precisam de tradução
+    ('Install the package first.', None),
+    ('Run npm install before the build.', None),
+    ('make sure the build passes', None),
+    ('See <<<LINK_1>>> for more details.', None),
+]
+
+
+@pytest.mark.parametrize('text, reason', CASES)
+def test_skip_reason(text, reason):
+    assert prefilter.skip_reason(text) == reason
+
+
+def test_disabled_filter_sends_everything(monkeypatch):
+    monkeypatch.setattr(prefilter, 'enabled', False)
+
+    assert prefilter.skip_reason('npm install') is None
@@ -0,0 +1,33 @@
+"""
+Testes do perfil por arquivo e por etapa (profiling).
+"""
+
+import argparse
+import os
+
+import deep_translator_script
+import profiling
+
+
+def test_profile_writes_per_file_stats(tmp_path):
+    source = tmp_path / 'guide.md'
+    # Sem texto a traduzir: o pré-filtro dispensa chamadas remotas
+    source.write_text('npm install\n\n42\n', encoding='utf-8')
+    profile_dir = tmp_path / 'perfil'
+    parser = argparse.ArgumentParser()
+    deep_translator_script.add_translate_arguments(parser)
+    args = parser.parse_args([str(source), str(tmp_path / 'out.md'), '--delay', '0', '--profile', str(profile_dir)])
+
+    assert deep_translator_script.run_translation(args) == 0
+
+    assert profiling.active is None
+    summary = (profile_dir / 'summary.txt').read_text(encoding='utf-8')
+    assert f"=== {source}:" in summary
+    for stage in ('read', 'extract', 'restore', 'write'):
+        assert f"  {stage}: " in summary
+    [collapsed] = [name for name in os.listdir(profile_dir) if name.endswith('.collapsed')]
+    assert 'translate_markdown_content' in (profile_dir / collapsed).read_text(encoding='utf-8')
+
+
+def test_stage_without_profile_is_shared_null_context():
+    assert profiling.stage('extract') is profiling.stage('write')
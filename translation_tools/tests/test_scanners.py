@@ -0,0 +1,31 @@
+"""
+Testes das varreduras lineares de extração (scanners).
+"""
+
+import pytest
+
+from scanners import html_spans
+
+CASES = [
+    # (conteúdo, nomes, trechos esperados)
+    ('<div>a</div> b <p>c</p>', None, ['<div>a</div>', '<p>c</p>']),
+    ('<div><span>a</span></div>', ('span',), ['<span>a</span>']),
+    ('<div class="x">texto <em>b</em>', None, ['<em>b</em>']),
+    ('</i> <em>b</em>', None, ['<em>b</em>']),
+    ('<br><img src="a.png"/> <em>b</em>', None, ['<em>b</em>']),
+    # Elemento completo dentro de uma abertura sem fechamento, fechada junto
+    # com o elemento de fora
+    ('<div><span><figure>x</figure></div> tail', ('figure',), ['<figure>x</figure>']),
+    ('<div><span><figure>x</figure></div> tail', None, ['<div><span><figure>x</figure></div>']),
+    ('<section><div><p><figure>a</figure><figure>b</figure></section>', ('figure',),
+     ['<figure>a</figure>', '<figure>b</figure>']),
+    # Aberturas sem fechamento aninhadas, cada uma com um elemento completo
+    ('<section>' + '<div><figure>x</figure>' * 3 + '</section>', ('figure',), ['<figure>x</figure>'] * 3),
+    ('<div><span>' * 3 + '<figure>x</figure>', ('figure',), ['<figure>x</figure>']),
+    ('<p>a</p><div><em>b</em><p>c</p>', None, ['<p>a</p>', '<em>b</em>', '<p>c</p>']),
+]
+
+
+@pytest.mark.parametrize('content, names, expected', CASES)
+def test_html_spans(content, names, expected):
+    assert [content[start:end] for start, end in html_spans(content, names=names)] == expected
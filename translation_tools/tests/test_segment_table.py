@@ -0,0 +1,63 @@
+"""
+Testes da tabela de deslocamentos dos segmentos (segment_table).
+"""
+
+import glob
+import os
+
+import pytest
+
+from deep_translator_script import extracted_placeholders, line_segment, process_file_content
+from segment_table import SegmentTable
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'docs')
+
+CONTENTS = [
+    '# Title\n\nParagraph one.\n\n## Section\nText with `code` and **bold**.\n',
+    '---\ntitle: x\n---\n\n```python\nprint(1)\n```\n\nAfter the code.\n',
+    '<!-- note -->\n#No space header\n###   Spaced header\n   \n\t\nIndented text\n',
+    '!!! note\n    Inside the admonition.\n\nOutside <div>html</div> line.\n',
+    '| a | b |\n| --- | --- |\n| 1 | 2 |',
+    '',
+    '\n\n# Only a header',
+]
+
+
+def _expected(processed_content, placeholders):
+    segments = (line_segment(line, placeholders) for line in processed_content.split('\n'))
+    return [segment for segment in segments if segment is not None and segment[1].strip()]
+
+
+def _rebuilt(processed_content, placeholders):
+    # Remontagem linha a linha, como antes da tabela: prefixo + texto
+    lines = []
+    for line in processed_content.split('\n'):
+        segment = line_segment(line, placeholders)
+        lines.append(''.join(segment) if segment is not None and segment[1].strip() else line)
+    return '\n'.join(lines)
+
+
+def _docs():
+    return sorted(glob.glob(os.path.join(DOCS_DIR, '**', '*.md'), recursive=True))
+
+
+@pytest.mark.parametrize('content', CONTENTS + [pytest.param(path, id=os.path.basename(path)) for path in _docs()])
+def test_offsets_match_line_segment(content):
+    if content.endswith('.md'):
+        with open(content, 'r', encoding='utf-8') as f:
+            content = f.read()
+    patterns, processed_content = process_file_content(content)
+    placeholders = extracted_placeholders(patterns)
+
+    table = SegmentTable(processed_content, placeholders)
+
+    assert [(segment.prefix, segment.text) for segment in table] == _expected(processed_content, placeholders)
+    assert list(table.texts()) == [segment.text for segment in table]
+    assert table.rebuild(list(table.texts())) == _rebuilt(processed_content, placeholders)
+
+
+def test_rebuild_replaces_only_segment_text():
+    _, table = SegmentTable.from_content('# Title\n\n```\ncode\n```\n\nText.\n')
+
+    assert table.rebuild(['Título', 'Texto.']).split('\n')[0] == '# Título'
+    assert table[1].prefix == '' and table[0].prefix == '# '
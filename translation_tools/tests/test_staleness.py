@@ -0,0 +1,67 @@
+"""
+Testes da verificação de traduções desatualizadas (staleness).
+"""
+
+import pytest
+
+import staleness
+
+
+@pytest.fixture
+def translated(tmp_path):
+    docs, out = tmp_path / 'docs', tmp_path / 'out'
+    docs.mkdir()
+    out.mkdir()
+    (docs / 'guide.md').write_text('# Guide\n\nInstall the package first.\n', encoding='utf-8')
+    (out / 'guide.md').write_text('# Guia\n\nInstale o pacote antes.\n', encoding='utf-8')
+    manifest = str(out / staleness.MANIFEST_NAME)
+    staleness.record_manifest(manifest, str(docs), str(out))
+    return str(docs), str(out), manifest
+
+
+def test_unchanged_sources_are_fresh(translated):
+    docs, out, manifest = translated
+
+    assert staleness.check_paths(docs, out, staleness.load_manifest(manifest)) == ([], [])
+
+
+def test_segmentation_code_change_makes_output_stale(translated, monkeypatch):
+    docs, out, manifest = translated
+
+    def process_file_content(content):
+        return {}, content
+
+    # Mudança no código de segmentação sem incremento de PATTERN_SET_VERSION
+    monkeypatch.setattr(staleness, 'SEGMENTATION_CODE', staleness.SEGMENTATION_CODE + (process_file_content,))
+    staleness.pattern_set_id.cache_clear()
+    try:
+        stale, _ = staleness.check_paths(docs, out, staleness.load_manifest(manifest))
+    finally:
+        monkeypatch.undo()
+        staleness.pattern_set_id.cache_clear()
+
+    assert [(entry['path'], entry['reason']) for entry in stale] == [('guide.md', 'regras de mascaramento alteradas')]
+
+
+def _split(text):
+    """Divide em linhas."""
+    return text.split('\n')
+
+
+def _split_commented(text):
+    # Mesmo comportamento, outra documentação
+    return text.split('\n')  # linhas
+
+
+def _split_changed(text):
+    return text.split('\n\n')
+
+
+def _fingerprint(function):
+    # Sem o nome da função, que difere entre os exemplos
+    return staleness.code_fingerprint(function).replace(function.__name__, '')
+
+
+def test_code_fingerprint_ignores_comments_and_docstrings():
+    assert _fingerprint(_split) == _fingerprint(_split_commented)
+    assert _fingerprint(_split) != _fingerprint(_split_changed)
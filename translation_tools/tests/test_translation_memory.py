@@ -0,0 +1,100 @@
+"""
+Testes da busca aproximada da memória de tradução (translation_memory).
+"""
+
+import random
+import string
+
+from translation_memory import TranslationMemory
+
+STEP = "Run the command shown in step 3 to finish."
+STEP_PT = "Execute o comando mostrado no passo 3 para terminar."
+
+
+def test_number_difference_is_transferred_by_default():
+    memory = TranslationMemory()
+    memory.store(STEP, STEP_PT)
+
+    assert memory.lookup("Run the command shown in step 4 to finish.") == \
+        "Execute o comando mostrado no passo 4 para terminar."
+
+
+def test_placeholders_only_rejects_token_differences():
+    memory = TranslationMemory(placeholders_only=True)
+    memory.store(STEP, STEP_PT)
+
+    assert memory.lookup("Run the command shown in step 4 to finish.") is None
+
+
+def test_token_of_another_kind_is_rejected():
+    memory = TranslationMemory()
+    memory.store(STEP, STEP_PT)
+
+    assert memory.lookup("Run the command shown in step three to finish.") is None
+
+
+def test_too_many_token_edits_are_rejected():
+    memory = TranslationMemory(fuzzy_threshold=0.8)
+    memory.store("Set ports 1, 2 and 3 before the build starts in the main project directory of the site.",
+                 "Defina as portas 1, 2 e 3 antes do build começar no diretório principal do projeto do site.")
+
+    assert memory.lookup("Set ports 4, 5 and 6 before the build starts in the main project directory "
+                         "of the site.") is None
+    assert memory.lookup("Set ports 4, 5 and 3 before the build starts in the main project directory "
+                         "of the site.") == \
+        "Defina as portas 4, 5 e 3 antes do build começar no diretório principal do projeto do site."
+
+
+def test_repeated_placeholder_replaces_only_mismatched_occurrence():
+    memory = TranslationMemory()
+    memory.store("Use <<<CODE_1>>> and then <<<CODE_1>>> again for the build output here.",
+                 "Use <<<CODE_1>>> e depois <<<CODE_1>>> de novo para a saída do build aqui.")
+
+    assert memory.lookup("Use <<<CODE_1>>> and then <<<CODE_2>>> again for the build output here.") == \
+        "Use <<<CODE_1>>> e depois <<<CODE_2>>> de novo para a saída do build aqui."
+
+
+class _Echo:
+    """
+    Tradutor de teste que devolve o texto marcado.
+    """
+
+    paced = True
+
+    def translate(self, text):
+        return f"pt: {text}"
+
+
+def test_parallel_workers_share_memory(tmp_path):
+    from deep_translator_script import translate_directory
+    from failures import FailureQueue
+
+    docs, out = tmp_path / 'docs', tmp_path / 'out'
+    docs.mkdir()
+    words = random.Random(0)
+    for page in range(8):
+        # Parágrafos sem semelhança entre si, para que nenhum venha da busca aproximada
+        paragraphs = '\n\n'.join(' '.join(''.join(words.choices(string.ascii_lowercase, k=7)) for _ in range(8))
+                                 for _ in range(60))
+        (docs / f'page{page}.md').write_text(f"# Page {page}\n\n{paragraphs}\n", encoding='utf-8')
+    memory = TranslationMemory()
+    for i in range(3000):
+        memory.store(f"Stored sentence {i} about a completely different topic.", f"Frase {i}.")
+    queue = FailureQueue()
+
+    translate_directory(str(docs), str(out), _Echo(), delay=0, memory=memory, workers=4, failures=queue)
+
+    assert not queue.entries
+    assert len(memory) == 3000 + 8 * 61
+
+
+def test_hot_buckets_are_capped():
+    memory = TranslationMemory()
+    for i in range(2000):
+        memory.store(f"| Option {i} | Enables the feature for the build |", f"| Opção {i} | Ativa o recurso para o build |")
+
+    assert memory.lookup("| Option 9999 | Enables the feature for the build |") == \
+        "| Opção 9999 | Ativa o recurso para o build |"
+    index = memory.index
+    assert max(len(bucket) for bucket in index.buckets.values()) == index.bucket_size
+    assert len(index.candidates("| Option 9999 | Enables the feature for the build |")) == 10
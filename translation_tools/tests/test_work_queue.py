@@ -0,0 +1,62 @@
+"""
+Testes da fila de trabalho (work_queue) e da gravação concorrente da memória.
+"""
+
+import multiprocessing
+
+import work_queue
+from translation_memory import TranslationMemory
+
+
+class _FailingParagraphs:
+    """
+    Tradutor de teste que traduz cabeçalhos e falha nos parágrafos.
+    """
+
+    paced = True
+
+    def translate(self, text):
+        if text.startswith('Guide'):
+            return 'Guia'
+        raise RuntimeError('backend indisponível')
+
+
+def _queue(tmp_path):
+    source = tmp_path / 'guide.md'
+    source.write_text('# Guide\n\nInstall the package first.\n', encoding='utf-8')
+    queue = work_queue.WorkQueue(str(tmp_path / 'fila.db'))
+    queue.enqueue([('guide.md', str(source), str(tmp_path / 'out' / 'guide.md'))])
+    return queue
+
+
+def test_segment_failures_make_job_partial(tmp_path, capsys):
+    queue = _queue(tmp_path)
+
+    assert work_queue.run_worker(queue, _FailingParagraphs(), delay=0) == (0, 1)
+
+    assert queue.counts()[work_queue.PARTIAL] == 1
+    [(rel_path, entries)] = queue.partial()
+    assert rel_path == 'guide.md'
+    assert [entry['text'] for entry in entries] == ['Install the package first.']
+    assert not work_queue.assemble(queue)
+    assert (tmp_path / 'out' / 'guide.md').read_text(encoding='utf-8') == '# Guia\n\nInstall the package first.\n'
+    assert 'trechos mantidos sem tradução' in capsys.readouterr().out
+
+
+def _store_and_save(path, worker, count):
+    for i in range(count):
+        memory = TranslationMemory(path)
+        memory.store(f"Segment {worker}-{i}", f"Segmento {worker}-{i}")
+        memory.save()
+
+
+def test_concurrent_saves_keep_all_entries(tmp_path):
+    path = str(tmp_path / 'memoria.json')
+    processes = [multiprocessing.Process(target=_store_and_save, args=(path, worker, 20)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert len(TranslationMemory(path)) == 80
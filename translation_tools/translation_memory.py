@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Memória de tradução com correspondência exata e aproximada (fuzzy).
+
+Guarda pares de segmentos mascarados (texto com placeholders) e suas
+traduções. Antes de consultar ou gravar, os placeholders são renumerados na
+ordem em que aparecem, de modo que segmentos que diferem apenas no conteúdo
+mascarado (links, código inline, números de passo dentro de código etc.)
+compartilham a mesma entrada.
+
+Quando não há correspondência exata, um índice MinHash LSH sobre n-gramas de
+caracteres encontra segmentos parecidos, e a tradução guardada é reaproveitada
+se as diferenças puderem ser transpostas com segurança para a tradução.
+"""
+
+import contextlib
+import heapq
+import json
+import os
+import re
+import tempfile
+import threading
+from difflib import SequenceMatcher
+
+import run_report
+
+PLACEHOLDER_RE = re.compile(r'<<<[A-Z]+_\d+>>>')
+TOKEN_RE = re.compile(r'<<<[A-Z]+_\d+>>>|\w+|[^\w\s]')
+MEMORY_FORMAT_VERSION = 1
+
+# Tokens que não são placeholders (números, nomes de passo) que a busca
+# aproximada pode trocar em uma tradução guardada
+FUZZY_MAX_TOKEN_EDITS = 2
+
+# Políticas de merge() para segmentos que já têm outra tradução
+MERGE_POLICIES = ('reviewed', 'keep', 'replace')
+# Origens de traduções revisadas por pessoas: páginas alinhadas (ver
+# alignment.ALIGNMENT_SOURCE) e entradas importadas sem backend informado
+REVIEWED_SOURCES = ('alignment', None)
+
+
+def canonicalize(text):
+    """
+    Renumera os placeholders do texto na ordem em que aparecem.
+
+    Args:
+        text: Segmento mascarado
+
+    Returns:
+        Tupla (texto canônico, mapa placeholder canônico -> placeholder original)
+    """
+    mapping = {}
+    reverse = {}
+
+    def renumber(match):
+        token = match.group(0)
+        if token not in mapping:
+            canonical = f"<<<PLACEHOLDER_{len(mapping)}>>>"
+            mapping[token] = canonical
+            reverse[canonical] = token
+        return mapping[token]
+
+    return PLACEHOLDER_RE.sub(renumber, text), reverse
+
+
+def decanonicalize(text, reverse):
+    """
+    Desfaz canonicalize em uma tradução guardada.
+
+    Returns:
+        Texto com os placeholders originais, ou None se a tradução citar um
+        placeholder que o segmento atual não tem
+    """
+    missing = False
+
+    def restore(match):
+        nonlocal missing
+        token = match.group(0)
+        if token not in reverse:
+            missing = True
+            return token
+        return reverse[token]
+
+    restored = PLACEHOLDER_RE.sub(restore, text)
+    return None if missing else restored
+
+
+class MinHashIndex:
+    """
+    Índice MinHash LSH de n-gramas de caracteres.
+
+    Usa one-permutation hashing: cada n-grama é distribuído em um dos
+    num_perm compartimentos e apenas o menor hash de cada compartimento é
+    mantido, o que custa uma operação de hash por n-grama. Os hashes usam
+    hash() do Python, então o índice é reconstruído a cada processo.
+
+    Args:
+        ngram: Tamanho dos n-gramas de caracteres
+        bands: Quantidade de faixas LSH
+        rows: Linhas por faixa (num_perm = bands * rows)
+        bucket_size: Máximo de chaves guardadas por compartimento LSH; em
+            memórias com muitos segmentos quase iguais (tabelas, admonitions
+            repetidas) os compartimentos cheios não crescem mais, e as
+            chaves já guardadas bastam como candidatas
+    """
+
+    def __init__(self, ngram=3, bands=8, rows=4, bucket_size=64):
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+        self.bucket_size = bucket_size
+        self.num_perm = bands * rows
+        self.buckets = {}
+
+    def shingles(self, text):
+        # Placeholders contam como um único caractere para não dominar a similaridade
+        text = PLACEHOLDER_RE.sub('\x00', text.lower())
+        n = self.ngram
+        if len(text) <= n:
+            return {text}
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def signature(self, text):
+        """
+        Calcula a assinatura MinHash do texto.
+        """
+        num_perm = self.num_perm
+        bins = [None] * num_perm
+        for shingle in self.shingles(text):
+            value = hash(shingle) & 0xFFFFFFFFFFFFFFFF
+            slot = value % num_perm
+            value //= num_perm
+            current = bins[slot]
+            if current is None or value < current:
+                bins[slot] = value
+        # Compartimentos vazios copiam o próximo preenchido (densificação por rotação)
+        filled = [value for value in bins if value is not None]
+        if not filled:
+            return tuple(bins)
+        for i in range(num_perm):
+            if bins[i] is None:
+                j = i
+                while bins[j % num_perm] is None:
+                    j += 1
+                bins[i] = bins[j % num_perm] + (j - i)
+        return tuple(bins)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, key, text):
+        for band_key in self._band_keys(self.signature(text)):
+            bucket = self.buckets.setdefault(band_key, [])
+            if len(bucket) < self.bucket_size:
+                bucket.append(key)
+
+    def candidates(self, text, limit=10):
+        """
+        Retorna as chaves que compartilham faixas com o texto, das mais
+        prováveis para as menos prováveis.
+        """
+        hits = {}
+        for band_key in self._band_keys(self.signature(text)):
+            for key in self.buckets.get(band_key, ()):
+                hits[key] = hits.get(key, 0) + 1
+        return heapq.nlargest(limit, hits, key=hits.get)
+
+
+class TranslationMemory:
+    """
+    Memória de tradução persistida em JSON.
+
+    Pode ser compartilhada entre threads (ex.: translate_directory com
+    vários workers): consultas, gravações e o salvamento são serializados
+    por uma trava da instância.
+
+    Args:
+        path: Arquivo da memória (None mantém apenas em memória)
+        source_lang: Idioma de origem dos segmentos
+        target_lang: Idioma de destino das traduções
+        fuzzy_threshold: Similaridade mínima (0 a 1) para reaproveitar uma
+            tradução parecida; 0 desativa a busca aproximada
+        placeholders_only: Se True, a busca aproximada só aceita diferenças
+            em placeholders; se False (padrão), aceita também até
+            FUZZY_MAX_TOKEN_EDITS tokens (números, identificadores) que
+            aparecem literalmente na tradução guardada
+    """
+
+    def __init__(self, path=None, source_lang='en', target_lang='pt',
+                 fuzzy_threshold=0.85, placeholders_only=False):
+        self.path = path
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.fuzzy_threshold = fuzzy_threshold
+        self.placeholders_only = placeholders_only
+        self.entries = {}
+        self.index = None
+        self.dirty = False
+        self.loaded_stat = None
+        self._lock = threading.RLock()
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, text):
+        # Apenas correspondência exata, sem registrar no relatório
+        return canonicalize(text)[0] in self.entries
+
+    def load(self):
+        """
+        Carrega as entradas do arquivo da memória.
+        """
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+            # Do arquivo lido, mesmo que outro processo o substitua em seguida
+            stat = _file_stat(f.fileno())
+        if data.get('source_lang', self.source_lang) != self.source_lang or \
+                data.get('target_lang', self.target_lang) != self.target_lang:
+            print(f"⚠️ Memória {self.path} é de outro par de idiomas; ignorando.")
+            return
+        self.entries.update(data.get('entries', {}))
+        self.index = None
+        self.loaded_stat = stat
+
+    def save(self):
+        """
+        Grava a memória no arquivo, de forma atômica, se houver alterações.
+
+        A leitura das entradas gravadas por outros processos e a gravação
+        acontecem sob uma trava exclusiva (ARQUIVO.lock), para que workers
+        da fila salvando ao mesmo tempo não percam entradas uns dos outros.
+        """
+        if not self.path or not self.dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, _file_lock(self.path):
+            self._save_locked(directory)
+
+    def _save_locked(self, directory):
+        # Outro processo (ex.: um worker da fila) pode ter gravado o arquivo
+        # desde a leitura: incorporar as entradas dele antes de sobrescrever
+        if os.path.exists(self.path) and _file_stat(self.path) != self.loaded_stat:
+            own_entries = self.entries
+            self.entries = {}
+            self.load()
+            self.entries.update(own_entries)
+        data = {
+            'version': MEMORY_FORMAT_VERSION,
+            'source_lang': self.source_lang,
+            'target_lang': self.target_lang,
+            'entries': self.entries,
+        }
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False) as tmp:
+            json.dump(data, tmp, ensure_ascii=False)
+            tmp_path = tmp.name
+        os.replace(tmp_path, self.path)
+        self.loaded_stat = _file_stat(self.path)
+        self.dirty = False
+
+    def store(self, text, translation, backend=None):
+        """
+        Grava a tradução de um segmento mascarado.
+
+        Args:
+            text: Segmento mascarado de origem
+            translation: Tradução do segmento, ainda mascarada
+            backend: Nome do backend que produziu a tradução
+        """
+        key, reverse = canonicalize(text)
+        mapping = {original: canonical for canonical, original in reverse.items()}
+        target = PLACEHOLDER_RE.sub(lambda m: mapping.get(m.group(0), m.group(0)), translation)
+        with self._lock:
+            if key not in self.entries:
+                if self.index is not None:
+                    self.index.add(key, key)
+            self.entries[key] = [target, backend]
+            self.dirty = True
+
+    def merge(self, text, translation, backend=None, policy='reviewed'):
+        """
+        Grava uma tradução vinda de fora (ex.: importação TMX/XLIFF),
+        resolvendo conflitos com a tradução já guardada para o segmento.
+
+        Políticas:
+            reviewed: a tradução revisada (ver REVIEWED_SOURCES) prevalece
+                sobre a de um backend; entre duas do mesmo tipo, fica a atual
+            keep: a tradução atual sempre prevalece
+            replace: a tradução importada sempre prevalece
+
+        Args:
+            text: Segmento mascarado de origem
+            translation: Tradução mascarada
+            backend: Nome do backend que produziu a tradução
+            policy: Uma das MERGE_POLICIES
+
+        Returns:
+            'added', 'unchanged', 'replaced' ou 'kept'
+        """
+        key, reverse = canonicalize(text)
+        with self._lock:
+            current = self.entries.get(key)
+            if current is None:
+                self.store(text, translation, backend)
+                return 'added'
+            if decanonicalize(current[0], reverse) == translation:
+                return 'unchanged'
+
+            if policy == 'replace' or (policy == 'reviewed' and backend in REVIEWED_SOURCES
+                                       and current[1] not in REVIEWED_SOURCES):
+                self.store(text, translation, backend)
+                return 'replaced'
+            return 'kept'
+
+    def lookup(self, text):
+        """
+        Procura a tradução de um segmento mascarado.
+
+        Args:
+            text: Segmento mascarado
+
+        Returns:
+            Tradução mascarada com os placeholders do segmento, ou None
+        """
+        key, reverse = canonicalize(text)
+
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is not None:
+            translation = decanonicalize(entry[0], reverse)
+            if translation is not None:
+                run_report.increment('memory.exact_hits')
+                return translation
+
+        if self.fuzzy_threshold:
+            # O índice e as entradas são percorridos enquanto outras threads gravam
+            with self._lock:
+                translation = self._fuzzy_lookup(key)
+            if translation is not None:
+                translation = decanonicalize(translation, reverse)
+            if translation is not None:
+                run_report.increment('memory.fuzzy_hits')
+                return translation
+
+        run_report.increment('memory.misses')
+        return None
+
+    def _ensure_index(self):
+        if self.index is None:
+            self.index = MinHashIndex()
+            for key in self.entries:
+                self.index.add(key, key)
+        return self.index
+
+    def _fuzzy_lookup(self, key):
+        tokens = TOKEN_RE.findall(key)
+        # O segmento consultado fica como seq2, cujo índice interno é calculado uma vez só
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(tokens)
+        threshold = self.fuzzy_threshold
+        for candidate in self._ensure_index().candidates(key):
+            candidate_tokens = TOKEN_RE.findall(candidate)
+            matcher.set_seq1(candidate_tokens)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold \
+                    or matcher.ratio() < threshold:
+                continue
+            translation = self._transfer(matcher, candidate_tokens, tokens, self.entries[candidate][0])
+            if translation is not None:
+                return translation
+        return None
+
+    def _transfer(self, matcher, old_tokens, new_tokens, translation):
+        """
+        Transpõe para a tradução guardada as diferenças entre os segmentos.
+
+        Só aceita substituições token a token. Cada token trocado precisa
+        aparecer na tradução tantas vezes quanto no segmento guardado, para
+        que a ocorrência correspondente seja inequívoca, e apenas essa
+        ocorrência é trocada. Fora os placeholders, no máximo
+        FUZZY_MAX_TOKEN_EDITS tokens do mesmo tipo (número por número,
+        palavra por palavra) podem mudar.
+        """
+        # Ordem de cada token entre as ocorrências iguais no segmento guardado
+        occurrences = []
+        counts = {}
+        for token in old_tokens:
+            occurrences.append(counts.get(token, 0))
+            counts[token] = counts.get(token, 0) + 1
+
+        edits = []
+        token_edits = 0
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            if tag != 'replace' or i2 - i1 != j2 - j1:
+                return None
+            for i, new in zip(range(i1, i2), new_tokens[j1:j2]):
+                old = old_tokens[i]
+                if not (PLACEHOLDER_RE.fullmatch(old) and PLACEHOLDER_RE.fullmatch(new)):
+                    token_edits += 1
+                    if self.placeholders_only or token_edits > FUZZY_MAX_TOKEN_EDITS \
+                            or _token_kind(old) != _token_kind(new):
+                        return None
+                edits.append((old, occurrences[i], new))
+
+        if not edits:
+            return translation
+
+        matches = {}
+        for old in {old for old, _, _ in edits}:
+            matches[old] = list(re.finditer(_token_pattern(old), translation))
+            if len(matches[old]) != counts[old]:
+                return None
+
+        spans = sorted((matches[old][occurrence].span(), new) for old, occurrence, new in edits)
+        pieces = []
+        last = 0
+        for (start, end), new in spans:
+            if start < last:
+                # Ocorrências sobrepostas (ex.: pontuação dentro de um placeholder)
+                return None
+            pieces.append(translation[last:start])
+            pieces.append(new)
+            last = end
+        pieces.append(translation[last:])
+        return ''.join(pieces)
+
+
+def _file_stat(path):
+    # os.replace cria um novo inode a cada gravação, então o inode detecta
+    # gravações de outros processos mesmo com a mesma data de modificação;
+    # path pode ser um descritor de arquivo aberto
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    try:
+        import fcntl
+    except ImportError:
+        # Sem fcntl (Windows): sem trava entre processos
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _token_kind(token):
+    if token.isdigit():
+        return 'number'
+    if token[0].isalnum() or token[0] == '_':
+        return 'word'
+    return 'punctuation'
+
+
+def _token_pattern(token):
+    # Palavras só casam inteiras; pontuação e placeholders casam literalmente
+    if token[0].isalnum() or token[0] == '_':
+        return rf'\b{re.escape(token)}\b'
+    return re.escape(token)
+
+
+def add_memory_arguments(parser):
+    """
+    Adiciona ao parser os argumentos da memória de tradução.
+
+    Args:
+        parser: Instância de argparse.ArgumentParser
+    """
+    parser.add_argument('--memory', metavar='ARQUIVO',
+                        help='Arquivo JSON da memória de tradução (reaproveita traduções entre execuções)')
+    parser.add_argument('--fuzzy-threshold', type=float, default=0.85,
+                        help='Similaridade mínima para reaproveitar traduções parecidas (0 desativa)')
+    parser.add_argument('--fuzzy-placeholders-only', action='store_true',
+                        help='Na busca aproximada, aceitar apenas diferenças em placeholders, '
+                             'sem trocar números ou identificadores')
+    parser.add_argument('--import-memory', metavar='ARQUIVO', action='append', default=[],
+                        help='Arquivo TMX ou XLIFF (opcionalmente .gz) a incorporar à memória antes de começar')
+    parser.add_argument('--merge', choices=MERGE_POLICIES, default='reviewed',
+                        help='Como resolver traduções importadas diferentes das já guardadas')
+
+
+def open_memory(args, source_lang='en', target_lang='pt'):
+    """
+    Abre a memória de tradução configurada nos argumentos e incorpora os
+    arquivos de --import-memory. Sem --memory, as entradas importadas ficam
+    apenas em memória durante a execução.
+
+    Returns:
+        Instância de TranslationMemory, ou None se nem --memory nem
+        --import-memory foram informados
+    """
+    imports = getattr(args, 'import_memory', [])
+    if not args.memory and not imports:
+        return None
+    memory = TranslationMemory(
+        args.memory,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        fuzzy_threshold=args.fuzzy_threshold,
+        placeholders_only=args.fuzzy_placeholders_only,
+    )
+    if args.memory:
+        print(f"Memória de tradução: {len(memory)} segmentos em {args.memory}")
+    if imports:
+        from memory_exchange import import_memory
+
+        for path in imports:
+            counts = import_memory(memory, path, policy=args.merge)
+            print(f"Importados de {path}: {counts['added']} novos, {counts['replaced']} substituídos, "
+                  f"{counts['kept']} mantidos")
+    return memory
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Fila de trabalho em SQLite para dividir a tradução entre processos e runners.
+
+Cada arquivo Markdown vira um job. Workers (processos locais ou jobs de CI
+que compartilham o arquivo da fila) reservam jobs com um lease, renovam o
+lease com heartbeats enquanto traduzem e gravam o conteúdo traduzido na
+própria fila. Jobs cujo lease expira (worker morto) voltam a ficar
+disponíveis. Jobs com trechos que ficaram sem tradução terminam como
+parciais, com as falhas registradas no job, e fazem o worker e o assemble
+terminarem com código 1. O coordenador grava os arquivos de saída quando
+todos os jobs terminam.
+
+Uso (a partir da raiz do repositório):
+
+    python -m translation_tools queue init docs docs-pt --queue fila.db
+    python -m translation_tools queue work --queue fila.db --processes 4
+    python -m translation_tools queue assemble --queue fila.db --wait
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+import run_report
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    rel_path TEXT NOT NULL UNIQUE,
+    input_file TEXT NOT NULL,
+    output_file TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    failures TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority);
+'''
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+# Concluído com trechos mantidos no idioma original (falhas em jobs.failures)
+PARTIAL = 'partial'
+FAILED = 'failed'
+
+
+def new_worker_id():
+    """
+    Identificador único de um worker (host, processo e sufixo aleatório).
+    """
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """
+    Fila de jobs de tradução persistida em um arquivo SQLite.
+
+    Args:
+        path: Arquivo da fila
+        lease_seconds: Duração do lease de um job reservado
+        max_attempts: Tentativas antes de o job ser marcado como falho
+    """
+
+    def __init__(self, path, lease_seconds=120.0, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            # Filas criadas antes da coluna failures
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            if 'failures' not in columns:
+                conn.execute('ALTER TABLE jobs ADD COLUMN failures TEXT')
+
+    def _connect(self):
+        # Uma conexão por operação: a fila é usada por várias threads e processos
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Connection(conn)
+
+    def enqueue(self, files):
+        """
+        Adiciona jobs à fila, na ordem informada; arquivos já presentes são ignorados.
+
+        Args:
+            files: Lista de tuplas (caminho relativo, entrada, saída)
+
+        Returns:
+            Quantidade de jobs adicionados
+        """
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            start = conn.execute('SELECT COALESCE(MAX(priority), -1) + 1 FROM jobs').fetchone()[0]
+            added = 0
+            for offset, (rel_path, input_file, output_file) in enumerate(files):
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO jobs (priority, rel_path, input_file, output_file, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (start + offset, rel_path, os.path.abspath(input_file),
+                     os.path.abspath(output_file), time.time()),
+                )
+                added += cursor.rowcount
+            conn.execute('COMMIT')
+        return added
+
+    def claim(self, worker_id):
+        """
+        Reserva o próximo job disponível (pendente ou com lease expirado).
+
+        Args:
+            worker_id: Identificador do worker
+
+        Returns:
+            sqlite3.Row do job reservado, ou None se não houver jobs disponíveis
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            # Jobs cujo worker morreu tentativas demais não voltam para a fila
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = COALESCE(error, ?), updated_at = ? '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (FAILED, 'lease expirado', now, LEASED, now, self.max_attempts),
+            )
+            job = conn.execute(
+                'SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                'ORDER BY priority LIMIT 1',
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if job is None:
+                conn.execute('COMMIT')
+                return None
+            if job['status'] == LEASED:
+                print(f"♻️ Lease de {job['rel_path']} (worker {job['worker']}) expirou; job reassumido.")
+                run_report.increment('queue.expired_leases')
+            conn.execute(
+                'UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, '
+                'updated_at = ? WHERE id = ?',
+                (LEASED, worker_id, now + self.lease_seconds, now, job['id']),
+            )
+            conn.execute('COMMIT')
+        return job
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Renova o lease de um job.
+
+        Returns:
+            False se o job não pertence mais a este worker
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET lease_expires = ?, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND status = ?',
+                (now + self.lease_seconds, now, job_id, worker_id, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result, failures=()):
+        """
+        Grava o conteúdo traduzido de um job reservado por este worker.
+
+        Args:
+            job_id: Job reservado
+            worker_id: Identificador do worker
+            result: Conteúdo traduzido
+            failures: Falhas de trechos mantidos no idioma original (entradas
+                de FailureQueue); com falhas, o job termina como PARTIAL
+
+        Returns:
+            False se o lease foi perdido e outro worker assumiu o job
+        """
+        status = PARTIAL if failures else DONE
+        failures = json.dumps(list(failures), ensure_ascii=False) if failures else None
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = NULL, failures = ?, lease_expires = NULL, '
+                'updated_at = ? WHERE id = ? AND worker = ? AND status = ?',
+                (status, result, failures, time.time(), job_id, worker_id, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Devolve um job à fila após erro, ou o marca como falho após max_attempts.
+
+        Returns:
+            True se o job foi marcado como falho
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                'error = ?, lease_expires = NULL, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND status = ?',
+                (self.max_attempts, FAILED, PENDING, str(error), time.time(), job_id, worker_id, LEASED),
+            )
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            return row is not None and row['status'] == FAILED
+
+    def counts(self):
+        """
+        Quantidade de jobs por status.
+        """
+        with self._connect() as conn:
+            rows = conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, PARTIAL: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def finished(self):
+        """
+        Indica se nenhum job está pendente ou em andamento.
+        """
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def results(self):
+        """
+        Itera sobre os jobs concluídos (inclusive os parciais), na ordem da fila.
+        """
+        with self._connect() as conn:
+            for row in conn.execute('SELECT rel_path, output_file, result FROM jobs WHERE status IN (?, ?) '
+                                    'ORDER BY priority', (DONE, PARTIAL)):
+                yield row
+
+    def partial(self):
+        """
+        Lista os jobs concluídos com trechos sem tradução.
+
+        Returns:
+            Lista de tuplas (caminho relativo, lista de falhas)
+        """
+        with self._connect() as conn:
+            rows = conn.execute('SELECT rel_path, failures FROM jobs WHERE status = ? ORDER BY priority',
+                                (PARTIAL,)).fetchall()
+        return [(row['rel_path'], json.loads(row['failures'] or '[]')) for row in rows]
+
+    def failures(self):
+        """
+        Lista os jobs marcados como falhos.
+        """
+        with self._connect() as conn:
+            return conn.execute('SELECT rel_path, attempts, error FROM jobs WHERE status = ? '
+                                'ORDER BY priority', (FAILED,)).fetchall()
+
+
+class _Connection:
+    # Fecha a conexão ao sair do bloco with (sqlite3.Connection só encerra a transação)
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.conn.in_transaction:
+            self.conn.execute('ROLLBACK')
+        self.conn.close()
+
+
+class _Heartbeat:
+    """
+    Renova o lease de um job em segundo plano enquanto o worker traduz.
+    """
+
+    def __init__(self, queue, job_id, worker_id):
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            if not self.queue.heartbeat(self.job_id, self.worker_id):
+                self.lost = True
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(queue, translator, delay=1.0, memory=None, worker_id=None):
+    """
+    Processa jobs da fila até que não haja mais jobs disponíveis.
+
+    Args:
+        queue: Instância de WorkQueue
+        translator: Instância do tradutor
+        delay: Tempo de espera entre traduções (segundos)
+        memory: Memória de tradução (opcional)
+        worker_id: Identificador do worker (gerado se não informado)
+
+    Returns:
+        Tupla (jobs concluídos, jobs com falhas) deste worker; jobs com falhas
+        são os parciais e os marcados como falhos após max_attempts
+    """
+    from deep_translator_script import translate_markdown_content
+    from failures import FailureQueue
+
+    worker_id = worker_id or new_worker_id()
+    completed = failed = 0
+    while True:
+        job = queue.claim(worker_id)
+        if job is None:
+            return completed, failed
+
+        print(f"[{worker_id}] Traduzindo {job['rel_path']}...")
+        failures = FailureQueue()
+        try:
+            with open(job['input_file'], 'r', encoding='utf-8') as f:
+                content = f.read()
+            with _Heartbeat(queue, job['id'], worker_id) as heartbeat:
+                result = translate_markdown_content(content, translator, delay, memory,
+                                                    failures.recorder(job['input_file'], job['output_file']))
+        except Exception as e:
+            print(f"❌ [{worker_id}] Erro ao traduzir {job['rel_path']}: {e}")
+            if queue.fail(job['id'], worker_id, e):
+                failed += 1
+            run_report.increment('queue.failed')
+            continue
+
+        if heartbeat.lost or not queue.complete(job['id'], worker_id, result, failures.entries):
+            print(f"⚠️ [{worker_id}] Lease de {job['rel_path']} expirou; resultado descartado.")
+            run_report.increment('queue.lost_leases')
+            continue
+
+        if memory is not None:
+            memory.save()
+        if failures:
+            print(f"⚠️ [{worker_id}] {job['rel_path']}: {len(failures)} trechos mantidos sem tradução")
+            run_report.increment('queue.partial')
+            failed += 1
+        else:
+            completed += 1
+            run_report.increment('queue.completed')
+
+
+def assemble(queue, wait=False, poll_interval=5.0):
+    """
+    Grava os arquivos de saída a partir dos jobs concluídos.
+
+    Args:
+        queue: Instância de WorkQueue
+        wait: Se True, aguarda até que todos os jobs terminem
+        poll_interval: Intervalo (segundos) entre verificações durante a espera
+
+    Returns:
+        True se todos os jobs terminaram com sucesso, sem trechos sem
+        tradução, e as saídas foram gravadas
+    """
+    from deep_translator_script import write_output
+
+    while not queue.finished():
+        counts = queue.counts()
+        if not wait:
+            print(f"Ainda há jobs em andamento: {counts[PENDING]} pendentes, {counts[LEASED]} reservados.")
+            return False
+        time.sleep(poll_interval)
+
+    written = 0
+    for row in queue.results():
+        write_output(row['output_file'], row['result'])
+        written += 1
+    print(f"✅ {written} arquivos gravados a partir da fila {queue.path}")
+
+    partial = queue.partial()
+    for rel_path, entries in partial:
+        print(f"⚠️ {rel_path}: {len(entries)} trechos mantidos sem tradução")
+        for entry in entries:
+            print(f"   - {entry['text'][:60]!r} ({entry['error_class']}: {entry['error']})")
+    failures = queue.failures()
+    for row in failures:
+        print(f"❌ {row['rel_path']}: falhou após {row['attempts']} tentativas ({row['error']})")
+    return not failures and not partial